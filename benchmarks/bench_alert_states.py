@@ -0,0 +1,63 @@
+"""آلة حالات التنبيهات: زمن دفعة قراءات، والذاكرة، وعدد مرات الفتح مع التذبذب
+
+1. زمن دفعة من مليون قراءة بترتيب وصولها، لأساطيل بأحجام مختلفة (كلما صغر الأسطول زاد
+   تكرار المولد داخل الدفعة)، والذاكرة لكل مولد.
+2. مولدات تحوم حول حدي الوقود والحرارة لمدة ساعتين بقراءة كل 10 ثوانٍ: كم مرة يُفتح
+   تنبيه جديد بتقييم اللقطة الواحدة (كل انتقال من "لا تنبيه" إلى "تنبيه") مقابل آلة الحالات.
+
+التشغيل من جذر المستودع:
+    python -m benchmarks.bench_alert_states
+"""
+import time
+
+import numpy as np
+
+from fleet.alert_states import AlertStates
+from fleet.generator import generate_fleet
+
+SIZES = [50_000, 1_000_000]
+BATCH = 1_000_000
+HOVER_FLEET = 10_000
+HOVER_SECONDS = 2 * 3600
+HOVER_STEP = 10
+
+
+def timed(fn, repeat=3):
+    """أفضل زمن من عدة تكرارات بالمللي ثانية"""
+    best = float('inf')
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return best * 1000
+
+
+def hovering(states, rng):
+    """(فتح اللقطة، فتح الآلة) لقراءات تحوم حول الحدود: وقود 12-18 وحرارة 102-108"""
+    now = states.epoch
+    previous = np.zeros((states.n, 2), dtype=bool)
+    snapshot_opens = 0
+    for step in range(HOVER_SECONDS // HOVER_STEP):
+        fuel = rng.integers(12, 19, states.n)
+        temp = rng.integers(102, 109, states.n)
+        current = np.column_stack([fuel < 15, temp > 105])
+        snapshot_opens += int(np.count_nonzero(current & ~previous))
+        previous = current
+        states.update(np.arange(states.n), {'fuel': fuel, 'temp': temp}, now + step * HOVER_STEP)
+    return snapshot_opens, int(states.opened.sum())
+
+
+if __name__ == '__main__':
+    rng = np.random.default_rng(0)
+    print(f"{'الأسطول':>10} {'القراءات':>10} {'دفعة مللي ث':>12} {'قراءة/ث':>14} {'بايت/مولد':>10}")
+    for n in SIZES:
+        states = AlertStates(generate_fleet(n, seed=42))
+        rows = rng.integers(0, n, BATCH)
+        values = {'fuel': rng.integers(5, 100, BATCH), 'temp': rng.integers(65, 115, BATCH)}
+        ms = timed(lambda: states.update(rows, values))
+        print(f"{n:>10,} {BATCH:>10,} {ms:>12.0f} {BATCH / ms * 1000:>14,.0f} {states.nbytes / n:>10.0f}")
+
+    states = AlertStates(generate_fleet(HOVER_FLEET, seed=42))
+    snapshot_opens, machine_opens = hovering(states, rng)
+    print(f"\n{HOVER_FLEET:,} مولد تحوم حول الحدود لساعتين: فتح تنبيه باللقطة {snapshot_opens:,} مرة، "
+          f"بآلة الحالات {machine_opens:,} مرة")
@@ -0,0 +1,27 @@
+"""قياس زمن تقييم جدول قواعد التنبيهات
+
+التشغيل من جذر المستودع:
+    python -m benchmarks.bench_alerts
+"""
+import time
+
+from fleet.alerts import evaluate_alerts
+from fleet.generator import generate_fleet
+
+SIZES = [10_000, 100_000, 1_000_000]
+
+
+def bench(df, repeat=5):
+    best = float('inf')
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        evaluate_alerts(df, thresholds={'fuel_watch': 20})
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+if __name__ == '__main__':
+    print(f"{'الحجم':>12} {'الزمن (مللي ث)':>16}")
+    for n in SIZES:
+        df = generate_fleet(n, seed=42)
+        print(f"{n:>12,} {bench(df) * 1000:>16.2f}")
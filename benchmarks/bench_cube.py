@@ -0,0 +1,64 @@
+"""مقارنة تجميعات الرسوم والتقارير (groupby على الصفوف المرشحة) مع شريحة مكعب التجميع
+
+التشغيل من جذر المستودع:
+    python -m benchmarks.bench_cube
+"""
+import time
+
+import numpy as np
+
+from fleet.cube import FleetCube
+from fleet.filters import FleetFilterIndex
+from fleet.generator import generate_fleet
+
+SIZES = [100_000, 1_000_000, 5_000_000]
+GOVERNORATES = ['القاهرة', 'الجيزة', 'أسوان', 'قنا']
+STATUSES = ['نشط', 'صيانة', 'معطل']
+CAPACITY_RANGE = (20, 125)
+
+
+def legacy_views(df):
+    """نفس تجميعات التبويبات قبل المكعب"""
+    df['المحافظة'].value_counts()
+    df.groupby('الموقع', observed=True)['الإيراد الشهري'].sum().sort_values(ascending=False).head(10)
+    df.groupby('الموديل', observed=True)['السعة'].count()
+    df.groupby('الموقع', observed=True)['الإيراد الشهري'].sum().idxmax()
+    df.groupby('المحافظة', observed=True)['الإيراد الشهري'].agg(['sum', 'mean', 'count'])
+    df.groupby('الموديل', observed=True).agg({
+        'الحالة': lambda x: (x == 'نشط').sum() / len(x) * 100,
+        'الإيراد الشهري': 'mean',
+        'ساعات العمل': 'mean'
+    })
+
+
+def cube_views(cube):
+    view = cube.slice(CAPACITY_RANGE, **{'المحافظة': GOVERNORATES, 'الحالة': STATUSES})
+    view.rollup('المحافظة')
+    view.rollup('الموقع')['revenue'].sort_values(ascending=False).head(10)
+    by_model = view.rollup('الموديل')
+    view.rollup('الموقع')['revenue'].idxmax()
+    view.slice(**{'الحالة': ['نشط']}).rollup('الموديل')['count'].reindex(by_model.index, fill_value=0)
+
+
+def timed(fn, repeat=3):
+    best = float('inf')
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return best * 1000
+
+
+if __name__ == '__main__':
+    print(f"{'الحجم':>12} {'بناء المكعب':>12} {'groupby':>10} {'المكعب':>8}  (مللي ث)")
+    for n in SIZES:
+        df = generate_fleet(n, seed=42)
+        filtered = FleetFilterIndex(df).filtered([GOVERNORATES, STATUSES], CAPACITY_RANGE, frame=df)
+        build = timed(lambda: FleetCube.build(df), repeat=1)
+        cube = FleetCube.build(df)
+        view = cube.slice(CAPACITY_RANGE, **{'المحافظة': GOVERNORATES, 'الحالة': STATUSES})
+        expected = filtered.groupby('المحافظة', observed=True)['الإيراد الشهري'].sum()
+        assert list(view.rollup('المحافظة').index) == list(expected.index)
+        assert np.allclose(view.rollup('المحافظة')['revenue'].to_numpy(), expected.to_numpy())
+        print(f"{n:>12,} {build:>12.0f} {timed(lambda: legacy_views(filtered)):>10.1f} "
+              f"{timed(lambda: cube_views(cube)):>8.1f}")
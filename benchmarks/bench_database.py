@@ -0,0 +1,67 @@
+"""قاعدة الأسطول الدائمة: التحميل المجمع، والاستعلام المرشح داخل SQLite مقابل تحميل الأسطول كاملاً
+
+لكل حجم: زمن التحميل المجمع وحجم الملف، ثم لكل مرشح من مرشحات الشريط الجانبي:
+- تحميل كامل: قراءة كل الصفوف من الملف إلى إطار ثم التصفية في الذاكرة (ما يحدث دون دفع الشرط)
+- دفع الشرط: شرط WHERE داخل الاستعلام فلا يُقرأ من الملف إلا الصفوف المطابقة
+وللمقارنة مع البدء البارد السابق: زمن توليد الأسطول بالمحاكاة.
+
+التشغيل من جذر المستودع:
+    python -m benchmarks.bench_database
+"""
+import os
+import tempfile
+import time
+
+import numpy as np
+
+from fleet.database import FleetDatabase
+from fleet.filters import FleetFilterIndex
+from fleet.generator import generate_fleet
+from fleet.schema import GOVERNORATES, STATUSES
+
+SIZES = [100_000, 1_000_000]
+ALL_GOVS = list(GOVERNORATES)
+# اسم المرشح ← (المحافظات، الحالات، نطاق السعة)
+FILTERS = {
+    'محافظة + حالة': (['القاهرة'], ['معطل'], (15, 350)),
+    'محافظة واحدة': (['أسوان'], STATUSES, (15, 350)),
+    'سعة صغيرة': (ALL_GOVS, STATUSES, (15, 20)),
+    'محافظتان نشط': (['القاهرة', 'الجيزة'], ['نشط'], (15, 350)),
+    'الكل': (ALL_GOVS, STATUSES, (15, 350)),
+}
+
+
+def timed(fn, repeat=3):
+    """أفضل زمن من عدة تكرارات بالمللي ثانية مع آخر نتيجة"""
+    best = float('inf')
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - t0)
+    return best * 1000, result
+
+
+def full_then_filter(db, govs, statuses, value_range):
+    frame = db.load()
+    mask = (frame['المحافظة'].isin(govs) & frame['الحالة'].isin(statuses)
+            & frame['السعة'].between(*value_range)).to_numpy()
+    return frame[mask]
+
+
+if __name__ == '__main__':
+    for n in SIZES:
+        df = generate_fleet(n, seed=42)
+        generate_ms, _ = timed(lambda: generate_fleet(n, seed=42))
+        with tempfile.TemporaryDirectory() as tmp:
+            db = FleetDatabase(os.path.join(tmp, 'fleet.sqlite'))
+            bulk_ms, _ = timed(lambda: db.bulk_load(df), repeat=1)
+            print(f"\nالحجم {n:,}: تحميل مجمع {bulk_ms:,.0f} مللي ث ({n / bulk_ms * 1000:,.0f} صف/ث)، "
+                  f"الملف {db.nbytes / 1e6:,.1f} MB، توليد بالمحاكاة {generate_ms:,.0f} مللي ث")
+            print(f"{'المرشح':<16} {'الصفوف':>10} {'تحميل كامل مللي ث':>18} {'دفع الشرط مللي ث':>17} {'التسريع':>8}")
+            index = FleetFilterIndex(df)
+            for name, (govs, statuses, value_range) in FILTERS.items():
+                full_ms, full = timed(lambda: full_then_filter(db, govs, statuses, value_range))
+                push_ms, pushed = timed(lambda: db.query([govs, statuses], value_range))
+                expected = index.filtered([govs, statuses], value_range)
+                assert np.array_equal(pushed.index, expected.index) and np.array_equal(full.index, expected.index)
+                print(f"{name:<16} {len(pushed):>10,} {full_ms:>18,.0f} {push_ms:>17,.0f} {full_ms / push_ms:>7.1f}x")
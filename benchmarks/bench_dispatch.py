@@ -0,0 +1,57 @@
+"""زمن تخطيط الإرسال: بناء الفهرس الشبكي، أقرب K مولد حرج لكل فرع، وجولات الوقود
+
+أقرب K عبر الفهرس يُقارن بحساب المسافة لكل المولدات المرشحة ثم argpartition (بحث شامل).
+
+التشغيل من جذر المستودع:
+    python -m benchmarks.bench_dispatch
+"""
+import time
+
+import numpy as np
+
+from fleet.dispatch import DEPOTS, GridIndex, haversine_km, refuel_runs
+from fleet.generator import generate_fleet
+
+SIZES = [100_000, 1_000_000]
+K = 25
+# نسب المولدات الحرجة في القناع (1.0 = أقرب المولدات أياً كانت حالتها)
+CRITICAL_SHARES = [0.02, 1.0]
+
+
+def timed(fn, repeat=5):
+    best = float('inf')
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - t0)
+    return best * 1000, result
+
+
+def brute_force(lat, lon, mask, depot):
+    rows = np.flatnonzero(mask)
+    dist = haversine_km(*depot, lat[rows], lon[rows])
+    top = np.argpartition(dist, K - 1)[:K]
+    return rows[top[np.argsort(dist[top])]]
+
+
+if __name__ == '__main__':
+    print(f"{'الحجم':>10} {'النسبة':>7} {'فهرس مللي ث':>11} {'أقرب K مللي ث':>13} {'شامل مللي ث':>11} "
+          f"{'جولات مللي ث':>12} {'جولات':>7}")
+    rng = np.random.default_rng(0)
+    for n in SIZES:
+        df = generate_fleet(n, seed=42)
+        lat, lon = df['lat'].to_numpy(), df['lon'].to_numpy()
+        build, index = timed(lambda: GridIndex(lat, lon), repeat=3)
+        low_fuel = np.flatnonzero(df['الوقود %'].to_numpy() < 15)
+        runs_ms, plan = timed(lambda: refuel_runs(lat, lon, low_fuel), repeat=3)
+        for share in CRITICAL_SHARES:
+            mask = rng.random(n) < share
+            query = brute = 0.0
+            for depot in DEPOTS.values():
+                ms, (rows, _) = timed(lambda: index.nearest(*depot, K, mask=mask))
+                query += ms
+                ms, expected = timed(lambda: brute_force(index.lat, index.lon, mask, depot))
+                brute += ms
+                assert np.array_equal(np.sort(rows), np.sort(expected))
+            print(f"{n:>10,} {share:>7.0%} {build:>11.1f} {query / len(DEPOTS):>13.2f} "
+                  f"{brute / len(DEPOTS):>11.2f} {runs_ms:>12.1f} {len(plan.runs):>7,}")
@@ -0,0 +1,60 @@
+"""مقارنة التصدير القديم (نص CSV كامل في الذاكرة) مع الكتابة على دفعات لكل صيغة
+
+الجدول الأول: زمن البناء وحجم الملف وزمن الطلب الثاني من الذاكرة.
+الجدول الثاني: ذروة ذاكرة CSV (tracemalloc) عند حجم واحد، لأن التتبع يبطئ to_csv كثيراً.
+
+التشغيل من جذر المستودع:
+    python -m benchmarks.bench_export
+"""
+import os
+import time
+import tracemalloc
+
+from fleet.export import CHUNK_ROWS, EXPORT_FORMATS, ExportCache, available_formats
+from fleet.generator import generate_fleet
+
+SIZES = [100_000, 1_000_000]
+MEMORY_ROWS = 300_000
+
+
+def legacy_csv(df):
+    """نفس تصدير اللوحة قبل نظام التصدير"""
+    return df.to_csv(index=False, encoding='utf-8-sig').encode('utf-8')
+
+
+def timed(fn):
+    t0 = time.perf_counter()
+    result = fn()
+    return time.perf_counter() - t0, result
+
+
+def peak_mb(fn):
+    tracemalloc.start()
+    fn()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return peak / 1e6
+
+
+if __name__ == '__main__':
+    print(f"{'الحجم':>10} {'الصيغة':<12} {'الزمن ث':>8} {'الملف MB':>9} {'من الذاكرة مللي ث':>18}")
+    for n in SIZES:
+        df = generate_fleet(n, seed=42)
+        t, data = timed(lambda: legacy_csv(df))
+        print(f"{n:>10,} {'CSV (قديم)':<12} {t:>8.2f} {len(data) / 1e6:>9.1f} {'—':>18}")
+        del data
+        cache = ExportCache()
+        for fmt in available_formats():
+            t, path = timed(lambda: cache.path(('bench', n), fmt, lambda: df))
+            hit, _ = timed(lambda: cache.path(('bench', n), fmt, lambda: df))
+            print(f"{n:>10,} {EXPORT_FORMATS[fmt][0]:<12} {t:>8.2f} "
+                  f"{os.path.getsize(path) / 1e6:>9.1f} {hit * 1000:>18.2f}")
+        cache.clear()
+
+    print(f"\nذروة الذاكرة عند {MEMORY_ROWS:,} صف (دفعات من {CHUNK_ROWS:,} صف):")
+    df = generate_fleet(MEMORY_ROWS, seed=42)
+    print(f"  {'CSV (قديم)':<12} {peak_mb(lambda: legacy_csv(df)):>8.0f} MB")
+    # مخازن pyarrow تُحجز خارج مخصص بايثون فلا يراها tracemalloc - نقارن CSV فقط
+    cache = ExportCache()
+    print(f"  {'CSV':<12} {peak_mb(lambda: cache.path('bench', 'csv', lambda: df)):>8.0f} MB")
+    cache.clear()
@@ -0,0 +1,52 @@
+"""مقارنة المرشحات المفهرسة مع isin/between الكاملة
+
+التشغيل من جذر المستودع:
+    python -m benchmarks.bench_filters
+"""
+import time
+
+from fleet.filters import FleetFilterIndex
+from fleet.generator import generate_fleet
+from fleet.schema import GOVERNORATES, STATUSES
+
+N = 1_000_000
+
+CASES = {
+    'كل المحافظات والحالات': (list(GOVERNORATES), STATUSES, (15, 350)),
+    'محافظتان': (['القاهرة', 'أسوان'], STATUSES, (15, 350)),
+    'محافظة + صيانة': (['السويس'], ['صيانة'], (15, 350)),
+    'سعة كبيرة + في الطريق': (list(GOVERNORATES), ['في الطريق'], (300, 350)),
+}
+
+
+def timed(fn, repeat=5):
+    best = float('inf')
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - t0)
+    return best, result
+
+
+def full_scan(df, govs, statuses, cap):
+    return df[
+        (df['المحافظة'].isin(govs)) &
+        (df['الحالة'].isin(statuses)) &
+        (df['السعة'].between(cap[0], cap[1]))
+    ]
+
+
+if __name__ == '__main__':
+    df = generate_fleet(N, seed=42)
+    t0 = time.perf_counter()
+    index = FleetFilterIndex(df)
+    print(f"بناء الفهرس لـ {N:,} مولد: {(time.perf_counter() - t0) * 1000:.0f} مللي ث\n")
+
+    print(f"{'الحالة':<24} {'الصفوف':>10} {'مسح كامل':>10} {'فهرس':>10} {'ذاكرة':>10}  (مللي ث)")
+    for name, (govs, statuses, cap) in CASES.items():
+        scan_t, expected = timed(lambda: full_scan(df, govs, statuses, cap))
+        index_t, rows = timed(lambda: index.rows([govs, statuses], cap))
+        index.positions([govs, statuses], cap)
+        hit_t, _ = timed(lambda: index.positions([govs, statuses], cap))
+        assert (rows == df.index.get_indexer(expected.index)).all()
+        print(f"{name:<24} {len(rows):>10,} {scan_t * 1000:>10.2f} {index_t * 1000:>10.2f} {hit_t * 1000:>10.3f}")
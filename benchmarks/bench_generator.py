@@ -0,0 +1,36 @@
+"""قياس سرعة توليد الأسطول (صف/ثانية)
+
+التشغيل من جذر المستودع:
+    python -m benchmarks.bench_generator
+"""
+import time
+
+from fleet.generator import generate_fleet
+
+SIZES = [1_000, 100_000, 1_000_000]
+
+
+def bench(n, repeat=3):
+    """أفضل زمن من عدة تكرارات لتوليد n مولد"""
+    best = float('inf')
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        generate_fleet(n, seed=42)
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def check_determinism(n=10_000):
+    """نفس البذرة يجب أن تعطي نفس الإطار بالضبط"""
+    a = generate_fleet(n, seed=7)
+    b = generate_fleet(n, seed=7)
+    c = generate_fleet(n, seed=8)
+    return a.equals(b) and not a.equals(c)
+
+
+if __name__ == '__main__':
+    print(f"الحتمية لكل بذرة: {'✅' if check_determinism() else '❌'}")
+    print(f"{'الحجم':>12} {'الزمن (ث)':>12} {'صف/ثانية':>16}")
+    for n in SIZES:
+        elapsed = bench(n)
+        print(f"{n:>12,} {elapsed:>12.4f} {n / elapsed:>16,.0f}")
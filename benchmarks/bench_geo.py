@@ -0,0 +1,44 @@
+"""مقارنة إرسال كل نقطة للخريطة مع الخلايا المجمعة حسب مستوى التكبير
+
+الحجم تقريبي: JSON للطبقة كما يرسلها st.map (سجلات بمفاتيح الأعمدة).
+
+التشغيل من جذر المستودع:
+    python -m benchmarks.bench_geo
+"""
+import time
+
+from fleet.geo import GeoIndex, ZOOM_LEVELS
+from fleet.generator import generate_fleet
+
+SIZES = [100_000, 1_000_000]
+
+
+def payload_kb(layer):
+    return len(layer.to_json(orient='records')) / 1024
+
+
+def legacy_points(df):
+    """نفس نقاط الخريطة قبل التجميع"""
+    return df[['lat', 'lon']].astype('float64').rename(columns={'lat': 'latitude', 'lon': 'longitude'})
+
+
+def timed(fn):
+    t0 = time.perf_counter()
+    result = fn()
+    return (time.perf_counter() - t0) * 1000, result
+
+
+if __name__ == '__main__':
+    print(f"{'الحجم':>10} {'التكبير':>7} {'خلايا':>7} {'تجميع مللي ث':>13} {'محفوظ مللي ث':>13} {'KB':>8} {'النقاط KB':>10}")
+    for n in SIZES:
+        df = generate_fleet(n, seed=42)
+        govs = list(df['المحافظة'].cat.categories)
+        points_kb = payload_kb(legacy_points(df))
+        index = GeoIndex(df)
+        for zoom in ZOOM_LEVELS:
+            # المسار المباشر (مرشحات بالحالة أو السعة) ثم دمج خلايا المحافظات المحفوظة
+            direct, _ = timed(lambda: index.layer(None, zoom, frame=df))
+            index.precompute([zoom])
+            merged, (layer, _, _) = timed(lambda: index.layer(govs, zoom))
+            print(f"{n:>10,} {zoom:>7} {len(layer):>7,} {direct:>13.1f} {merged:>13.1f} "
+                  f"{payload_kb(layer):>8.0f} {points_kb:>10,.0f}")
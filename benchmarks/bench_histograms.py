@@ -0,0 +1,51 @@
+"""مقارنة مخططي الحرارة والوقود بالقيم الخام (Plotly يحسب الفئات في المتصفح) مع الفئات المحسوبة مسبقاً
+
+حجم JSON للمخطط كما يُرسل، وزمن بناء الفئات لحالة مرشحات، وزمن تحديث العدادات لدفعة قراءات.
+
+التشغيل من جذر المستودع:
+    python -m benchmarks.bench_histograms
+"""
+import time
+
+import numpy as np
+import plotly.graph_objects as go
+
+from fleet.generator import generate_fleet
+from fleet.histograms import BinnedHistograms
+from fleet.ingest import decode_messages, simulate_messages
+
+SIZES = [10_000, 100_000, 1_000_000]
+SELECTIONS = {'المحافظة': ['القاهرة', 'الجيزة', 'أسوان'], 'الحالة': ['نشط', 'معطل']}
+CAPACITY_RANGE = (20, 350)
+BATCH = 20_000
+
+
+def legacy_figure(df):
+    return go.Figure(data=[go.Histogram(x=df['الحرارة °C'], nbinsx=15)])
+
+
+def binned_figure(histograms):
+    starts, width, counts = histograms.binned('temp', value_range=CAPACITY_RANGE, **SELECTIONS)
+    return go.Figure(data=[go.Bar(x=starts + (width - 1) / 2, y=counts, width=width)])
+
+
+def timed(fn, repeat=5):
+    best = float('inf')
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - t0)
+    return best * 1000, result
+
+
+if __name__ == '__main__':
+    print(f"{'الحجم':>10} {'خام KB':>8} {'فئات KB':>8} {'فئات مللي ث':>12} {'تحديث دفعة مللي ث':>18}")
+    rng = np.random.default_rng(0)
+    for n in SIZES:
+        df = generate_fleet(n, seed=42)
+        histograms = BinnedHistograms(df)
+        raw_kb = len(legacy_figure(df).to_json()) / 1024
+        ms, fig = timed(lambda: binned_figure(histograms))
+        messages = decode_messages(simulate_messages(rng, n, BATCH))
+        update, _ = timed(lambda: histograms.apply_messages(messages))
+        print(f"{n:>10,} {raw_kb:>8,.0f} {len(fig.to_json()) / 1024:>8.1f} {ms:>12.2f} {update:>18.2f}")
@@ -0,0 +1,51 @@
+"""قياس خط الاستقبال على نواة واحدة: رسائل/ثانية والضغط العكسي وقراءة اللقطة
+
+التشغيل من جذر المستودع:
+    python -m benchmarks.bench_ingest
+"""
+import asyncio
+import itertools
+import time
+
+import numpy as np
+
+from fleet.generator import generate_fleet
+from fleet.ingest import IngestPipeline, simulate_messages, simulated_source
+
+N = 100_000
+SECONDS = 3
+TARGET = 50_000
+
+
+async def replay_source(chunks):
+    """إعادة كتل مرمزة مسبقاً - تقيس الاستقبال وحده دون كلفة توليد الرسائل"""
+    for chunk in itertools.cycle(chunks):
+        yield chunk
+        await asyncio.sleep(0)
+
+
+def run(name, df, source):
+    pipeline = IngestPipeline(df, source).start()
+    reads, read_time = 0, 0.0
+    deadline = time.perf_counter() + SECONDS
+    while time.perf_counter() < deadline:
+        t0 = time.perf_counter()
+        pipeline.snapshot()
+        read_time += time.perf_counter() - t0
+        reads += 1
+        time.sleep(0.001)
+    pipeline.stop()
+    stats = pipeline.stats
+    rate = stats['applied'] / SECONDS
+    print(f"{name:<28} {rate:>12,.0f} {stats['batches']:>8} {stats['max_depth']:>8} "
+          f"{stats['blocked_seconds']:>8.2f} {read_time / reads * 1e6:>10.2f}  {'✅' if rate >= TARGET else '❌'}")
+
+
+if __name__ == '__main__':
+    df = generate_fleet(N, seed=42)
+    rng = np.random.default_rng(0)
+    chunks = [simulate_messages(rng, N, 5_000) for _ in range(20)]
+    print(f"{'المصدر':<28} {'رسالة/ث':>12} {'دفعات':>8} {'أقصى عمق':>8} {'انتظار ث':>8} {'قراءة µs':>10}")
+    run('إعادة كتل جاهزة', df, replay_source(chunks))
+    run('محاكي داخل العملية', df, simulated_source(N, batch=5_000, seed=0))
+    run('محاكي بمعدل 50k/ث', df, simulated_source(N, rate=TARGET, batch=5_000, seed=0))
@@ -0,0 +1,56 @@
+"""مقارنة حساب المقاييس القديم (نسخة مرشحة لكل مقياس) مع تمريرة التجميع الواحدة
+
+التشغيل من جذر المستودع:
+    python -m benchmarks.bench_kpis
+"""
+import time
+
+from fleet.alerts import evaluate_alerts
+from fleet.generator import generate_fleet
+from fleet.kpis import compute_kpis
+
+SIZES = [100_000, 1_000_000, 5_000_000]
+FUEL_THRESHOLD = 20
+
+
+def legacy_kpis(df):
+    """نفس حسابات رأس الصفحة والتقارير قبل نواة التجميع"""
+    total_revenue = df['الإيراد الشهري'].sum()
+    active_count = len(df[df['الحالة'] == 'نشط'])
+    critical_alerts = len(df[df['التنبيه'] != 'لا يوجد'])
+    avg_fuel = df['الوقود %'].mean()
+    avg_temp = df['الحرارة °C'].mean()
+    low_fuel_count = len(df[df['الوقود %'] < FUEL_THRESHOLD])
+    total_capacity = df['السعة'].sum()
+    maintenance = len(df[df['الحالة'] == 'صيانة'])
+    down = len(df[df['الحالة'].isin(['معطل', 'في الطريق'])])
+    high_temp = len(df[df['الحرارة °C'] > 105])
+    overhaul = len(df[df['ساعات العمل'] > 4500])
+    avg_hours = df['ساعات العمل'].mean()
+    return (total_revenue, active_count, critical_alerts, avg_fuel, avg_temp, low_fuel_count,
+            total_capacity, maintenance, down, high_temp, overhaul, avg_hours)
+
+
+def kernel_kpis(df):
+    alerts = evaluate_alerts(df, thresholds={'fuel_watch': FUEL_THRESHOLD})
+    return compute_kpis(df, alerts)
+
+
+def timed(fn, repeat=3):
+    best = float('inf')
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+if __name__ == '__main__':
+    print(f"{'الحجم':>12} {'القديم':>10} {'النواة':>10} {'التسريع':>8}  (مللي ث)")
+    for n in SIZES:
+        df = generate_fleet(n, seed=42)
+        k = kernel_kpis(df)
+        assert k.critical_alerts == legacy_kpis(df)[2]
+        old = timed(lambda: legacy_kpis(df))
+        new = timed(lambda: kernel_kpis(df))
+        print(f"{n:>12,} {old * 1000:>10.1f} {new * 1000:>10.1f} {old / new:>7.1f}x")
@@ -0,0 +1,135 @@
+"""اختبار حمل اللوحة: عدة جلسات متزامنة تنفذ تسلسل تفاعلات ثابتاً عبر AppTest
+
+كل جلسة تعمل في خيط خاص (كما يخدم خادم Streamlit كل جلسة في خيط داخل عملية واحدة)
+فتتشارك الذاكرة المؤقتة على مستوى العملية. مشغل الاختبار يبدّل حالة عامة للعملية أثناء
+كل تشغيل (Runtime الوهمي)، فالتشغيلات تمر بقفل واحد، والزمن المسجل لكل تفاعل يبدأ من
+"النقرة" فيشمل انتظار الجلسات الأخرى كما تنتظر على GIL في خادم مشغول. تُطبع النسب المئوية
+p50/p95/p99 لكل تفاعل، وأعلى RSS للعملية، والإنتاجية (تفاعلات في الثانية عبر كل الجلسات).
+
+قيم المرشحات تختلف بين الجلسات (بذرة لكل جلسة) حتى لا تُجاب كلها من ذاكرة الأقسام نفسها.
+للأساطيل الكبيرة يُفضّل تقليل سجل القراءات: TELEMETRY_CAPACITY=24.
+
+التشغيل من جذر المستودع:
+    python -m benchmarks.bench_load
+    python -m benchmarks.bench_load --sessions 20 --rounds 3 50 20000
+"""
+import argparse
+import logging
+import os
+import resource
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+from streamlit.runtime.scriptrunner.script_cache import ScriptCache
+from streamlit.testing.v1 import AppTest, local_script_runner
+
+from fleet.reports import REPORT_TYPES
+from fleet.schema import GOVERNORATES
+
+APP = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'streamlit_app.py')
+SIZES = [50, 20_000]
+# التبويبات التي لها تفاعلات خاصة - باقي التبويبات تُقرأ من اللوحة بعد التحميل الأول
+MAP_TAB = "📍 الخريطة"
+TABLE_TAB = "📋 الجدول"
+REPORTS_TAB = "📊 التقارير"
+SORT_COLUMNS = ['الإيراد الشهري', 'الوقود %', 'الحرارة °C', 'ساعات العمل']
+PERCENTILES = (50, 95, 99)
+
+# الخادم يترجم السكربت مرة واحدة لكل الجلسات، أما مشغل الاختبار فيترجمه في كل تشغيل -
+# نشارك ذاكرة ترجمة واحدة حتى لا يدخل زمن الترجمة في زمن التفاعلات
+_script_cache = ScriptCache()
+local_script_runner.ScriptCache = lambda: _script_cache
+_run_lock = threading.Lock()
+
+
+def _widget(widgets, label):
+    return next(w for w in widgets if w.label == label)
+
+
+def _run(at, tab):
+    with _run_lock:
+        # مشغل الاختبار لا يرسل حالة التبويبات مع باقي العناصر، فنثبت التبويب المحدد قبل كل تشغيل
+        at.session_state['active_tab'] = tab
+        at.run()
+
+
+def script(rng, tabs):
+    """تسلسل تفاعلات جلسة واحدة على كل تبويبات اللوحة وكل أنواع التقارير: (اسم التفاعل، التبويب بعده، دالة تعديل العناصر)"""
+    govs = sorted(rng.choice(list(GOVERNORATES), size=rng.integers(1, len(GOVERNORATES) + 1), replace=False))
+    low = int(rng.integers(15, 60))
+    steps = [
+        ('مرشح المحافظات', MAP_TAB, lambda at: at.sidebar.multiselect[0].set_value(govs)),
+        ('مرشح السعة', MAP_TAB, lambda at: at.sidebar.slider[0].set_value((low, at.sidebar.slider[0].max))),
+    ]
+    # عناصر التبويب لا توجد إلا بعد فتحه، فكل تبويب يُفتح قبل تفاعلاته (والجدول أخيراً قبل فرزه)
+    others = [tab for tab in tabs if tab not in (MAP_TAB, TABLE_TAB, REPORTS_TAB)]
+    steps += [(f"تبويب {tab}", tab, None) for tab in others + [TABLE_TAB]]
+    sort_by = SORT_COLUMNS[rng.integers(len(SORT_COLUMNS))]
+    steps += [
+        ('فرز الجدول', TABLE_TAB, lambda at: _widget(at.selectbox, "فرز حسب:").set_value(sort_by)),
+        ('صفحة الجدول', TABLE_TAB, lambda at: _widget(at.number_input, "الصفحة:").increment()),
+        (f"تبويب {REPORTS_TAB}", REPORTS_TAB, None),
+    ]
+    steps += [(f"تقرير {report}", REPORTS_TAB,
+               lambda at, report=report: _widget(at.selectbox, "نوع التقرير:").set_value(report))
+              for report in REPORT_TYPES]
+    return steps
+
+
+def session(seed, rounds, latencies, errors, lock):
+    """جلسة واحدة: تحميل أولي ثم تسلسل التفاعلات `rounds` مرة"""
+    rng = np.random.default_rng(seed)
+    at = AppTest.from_file(APP, default_timeout=600)
+    t0 = time.perf_counter()
+    _run(at, MAP_TAB)
+    timings = [('تحميل أولي', time.perf_counter() - t0, len(at.exception))]
+    tabs = [tab.label for tab in at.tabs]
+    for _ in range(rounds):
+        for name, tab, action in script(rng, tabs):
+            if action is not None:
+                action(at)
+            t0 = time.perf_counter()
+            _run(at, tab)
+            timings.append((name, time.perf_counter() - t0, len(at.exception)))
+    with lock:
+        for name, seconds, failed in timings:
+            latencies[name].append(seconds * 1000)
+            errors[name] += bool(failed)
+    return len(timings)
+
+
+def peak_rss_mb():
+    """أعلى ذاكرة مقيمة للعملية منذ بدايتها (ru_maxrss بالكيلوبايت على لينكس)"""
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def load_test(n, sessions, rounds):
+    os.environ['FLEET_SIZE'] = str(n)
+    latencies, errors, lock = defaultdict(list), defaultdict(int), threading.Lock()
+    t0 = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=sessions) as pool:
+        done = sum(pool.map(lambda s: session(s, rounds, latencies, errors, lock), range(sessions)))
+    elapsed = time.perf_counter() - t0
+    return latencies, errors, done / elapsed, peak_rss_mb()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="اختبار حمل لوحة الأسطول بجلسات متزامنة")
+    parser.add_argument('sizes', type=int, nargs='*', default=SIZES, help="أحجام الأسطول")
+    parser.add_argument('--sessions', type=int, default=8, help="عدد الجلسات المتزامنة")
+    parser.add_argument('--rounds', type=int, default=2, help="مرات تكرار تسلسل التفاعلات لكل جلسة")
+    args = parser.parse_args()
+    logging.disable(logging.WARNING)
+    for n in args.sizes:
+        latencies, errors, throughput, rss = load_test(n, args.sessions, args.rounds)
+        print(f"\nالحجم {n:,} - {args.sessions} جلسة × {args.rounds} جولة: "
+              f"{throughput:,.1f} تفاعل/ث، أعلى RSS {rss:,.0f} MB")
+        print(f"{'التفاعل':<32} {'العدد':>6} " + ' '.join(f"{f'p{p} مللي ث':>12}" for p in PERCENTILES)
+              + f" {'أخطاء':>6}")
+        for name, values in latencies.items():
+            stats = np.percentile(values, PERCENTILES)
+            print(f"{name:<32} {len(values):>6} " + ' '.join(f"{v:>12.0f}" for v in stats)
+                  + f" {errors[name]:>6}")
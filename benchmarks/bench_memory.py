@@ -0,0 +1,38 @@
+"""تقرير الذاكرة لكل مليون مولد: الأنواع الافتراضية مقابل مخطط الأسطول
+
+التشغيل من جذر المستودع:
+    python -m benchmarks.bench_memory
+"""
+import time
+
+from fleet.generator import generate_fleet
+from fleet.schema import LEGACY_SCHEMA, memory_report
+
+N = 1_000_000
+MB = 1024 ** 2
+
+
+def timed_isin(df):
+    t0 = time.perf_counter()
+    df['المحافظة'].isin(['القاهرة', 'أسوان'])
+    return time.perf_counter() - t0
+
+
+def timed_groupby(df):
+    t0 = time.perf_counter()
+    df.groupby('الموقع', observed=True)['الإيراد الشهري'].sum()
+    return time.perf_counter() - t0
+
+
+if __name__ == '__main__':
+    df = generate_fleet(N, seed=42)
+    report = memory_report(df) / MB
+    report['نسبة التوفير'] = (1 - report['بعد'] / report['قبل']).map('{:.0%}'.format)
+    print(f"الذاكرة لكل {N:,} مولد (ميجابايت):\n")
+    print(report.round(2).to_string())
+    before, after = report['قبل'].sum(), report['بعد'].sum()
+    print(f"\nالإجمالي: {before:.1f} → {after:.1f} ميجابايت ({before / after:.1f}x أصغر)")
+
+    legacy = df.astype(LEGACY_SCHEMA)
+    print(f"\nisin على المحافظة: {timed_isin(legacy) * 1000:.1f} → {timed_isin(df) * 1000:.1f} مللي ث")
+    print(f"groupby على الموقع: {timed_groupby(legacy) * 1000:.1f} → {timed_groupby(df) * 1000:.1f} مللي ث")
@@ -0,0 +1,39 @@
+"""توليد التقارير الليلي: قابلية التوسع من عملية واحدة إلى N عملية
+
+كل تشغيل يولّد التقارير الخمسة لكل محافظة ولكل الأسطول (45 تقريراً) في مجلد مؤقت جديد.
+الزمن يشمل بدء العمليات وتوليد الأسطول وبناء المكعب داخل كل عملية، فهو زمن التشغيل الليلي
+الفعلي. التسريع منسوب إلى عملية واحدة، والكفاءة = التسريع ÷ عدد العمليات.
+
+التشغيل من جذر المستودع:
+    python -m benchmarks.bench_reports
+    python -m benchmarks.bench_reports --size 1000000 --workers 1 2 4 8
+"""
+import argparse
+import os
+import tempfile
+
+from fleet.reports import generate_all
+
+
+def run(n, workers, formats):
+    with tempfile.TemporaryDirectory() as tmp:
+        paths, elapsed = generate_all(tmp, workers, n=n, formats=formats)
+    return len(paths), elapsed
+
+
+if __name__ == '__main__':
+    cores = os.cpu_count() or 1
+    parser = argparse.ArgumentParser(description="زمن توليد كل التقارير حسب عدد العمليات")
+    parser.add_argument('--size', type=int, default=100_000, help="حجم الأسطول")
+    parser.add_argument('--workers', type=int, nargs='+',
+                        default=sorted({1, 2, 4, cores} & set(range(1, cores + 1))), help="أعداد العمليات")
+    parser.add_argument('--formats', nargs='+', default=['md', 'csv', 'html'])
+    args = parser.parse_args()
+    print(f"الحجم {args.size:,} - {cores} نواة متاحة")
+    print(f"{'العمليات':>8} {'الملفات':>8} {'الزمن ث':>9} {'التسريع':>8} {'الكفاءة':>8}")
+    baseline = None
+    for workers in args.workers:
+        files, elapsed = run(args.size, workers, args.formats)
+        baseline = baseline or elapsed
+        speedup = baseline / elapsed
+        print(f"{workers:>8} {files:>8} {elapsed:>9.2f} {speedup:>7.2f}x {speedup / workers * 100:>7.0f}%")
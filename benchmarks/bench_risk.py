@@ -0,0 +1,49 @@
+"""زمن مؤشر خطر الأعطال: بناء الخصائص، تقييم الأسطول، أعلى K، وتحديث دفعة قراءات والأوزان
+
+أعلى K عبر argpartition يُقارن بفرز الأسطول كاملاً (argsort).
+
+التشغيل من جذر المستودع:
+    python -m benchmarks.bench_risk
+"""
+import time
+
+import numpy as np
+
+from fleet.generator import generate_fleet
+from fleet.ingest import decode_messages, simulate_messages
+from fleet.risk import RiskScores
+from fleet.telemetry import backfill_history
+
+SIZES = [10_000, 100_000, 1_000_000]
+TOP_K = 25
+BATCH = 20_000
+# نافذتا اتجاه الحرارة فقط - السجل الكامل غير لازم للقياس
+CAPACITY = 48
+
+
+def timed(fn, repeat=5):
+    best = float('inf')
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - t0)
+    return best * 1000, result
+
+
+if __name__ == '__main__':
+    print(f"{'الحجم':>10} {'بناء مللي ث':>11} {'تقييم مللي ث':>12} {'argsort مللي ث':>14} "
+          f"{'أعلى K مللي ث':>13} {'دفعة مللي ث':>11} {'أوزان مللي ث':>12}")
+    rng = np.random.default_rng(0)
+    for n in SIZES:
+        df = generate_fleet(n, seed=42)
+        telemetry = backfill_history(df, capacity=CAPACITY)
+        build, risk = timed(lambda: RiskScores(df, telemetry), repeat=3)
+        score, _ = timed(lambda: risk.model.predict(risk.features))
+        full, _ = timed(lambda: np.argsort(risk.scores)[::-1][:TOP_K])
+        top, _ = timed(lambda: risk.top_k(TOP_K))
+        messages = decode_messages(simulate_messages(rng, n, BATCH))
+        batch, _ = timed(lambda: risk.apply_messages(messages))
+        rows = rng.integers(0, n, BATCH)
+        outcomes = (df['الحالة'].to_numpy()[rows] == 'صيانة')
+        learn, _ = timed(lambda: risk.learn(rows, outcomes), repeat=3)
+        print(f"{n:>10,} {build:>11.1f} {score:>12.1f} {full:>14.1f} {top:>13.2f} {batch:>11.2f} {learn:>12.1f}")
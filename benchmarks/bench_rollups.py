@@ -0,0 +1,70 @@
+"""تجميعات الفترات: بناء أولي، ونبضة جديدة تدريجياً مقابل إعادة مسح السجل كاملاً، وحساب التغير
+
+- إعادة المسح: ساعات التشغيل لكل نبضة من فرق العداد على كامل السجل (زمن × مولد) ثم
+  جمعها لكل يوم/أسبوع/شهر - ما يلزم دون تجميعات محفوظة بعد كل نبضة.
+- تدريجياً: RevenueRollups.ingest يقرأ النبضة الجديدة فقط.
+- التغير الشهري لمولدات محافظة واحدة: ضرب نقطي على ساعات الفترتين المحفوظتين.
+
+التشغيل من جذر المستودع:
+    python -m benchmarks.bench_rollups
+"""
+import time
+
+import numpy as np
+
+from fleet.generator import generate_fleet
+from fleet.rollups import GRAINS, TZ_OFFSET, RevenueRollups, period_start
+from fleet.telemetry import backfill_history, simulate_tick
+
+SIZES = [10_000, 100_000]
+
+
+def timed(fn, repeat=3):
+    """أفضل زمن من عدة تكرارات بالمللي ثانية مع آخر نتيجة"""
+    best, result = float('inf'), None
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - t0)
+    return best * 1000, result
+
+
+def build(df, history):
+    rollups = RevenueRollups(df)
+    rollups.ingest(history)
+    return rollups
+
+
+def rescan(history, rate):
+    """الإيراد لكل فترة من كل نبضات السجل (المسار دون تجميعات محفوظة)"""
+    hours = history.window('hours').astype(np.int64)
+    running = np.clip(np.diff(hours, axis=0), 0, 1)
+    days = (history.times()[1:] + TZ_OFFSET) // 86400
+    revenue = running @ rate
+    return {grain: np.bincount(np.unique(np.array([period_start(grain, d) for d in days]), return_inverse=True)[1],
+                               weights=revenue)
+            for grain in GRAINS}
+
+
+if __name__ == '__main__':
+    print(f"{'الحجم':>8} {'بناء أولي مللي ث':>16} {'إعادة مسح مللي ث':>16} {'نبضة تدريجية مللي ث':>19} "
+          f"{'التغير الشهري مللي ث':>20} {'بايت/مولد':>10}")
+    for n in SIZES:
+        df = generate_fleet(n, seed=42)
+        history = backfill_history(df, seed=42)
+        build_ms, rollups = timed(lambda: build(df, history), repeat=1)
+        rescan_ms, _ = timed(lambda: rescan(history, rollups.rate))
+        active = (df['الحالة'] == 'نشط').to_numpy()
+        rng = np.random.default_rng(0)
+
+        # زمن القراءة التدريجية وحدها (تسجيل النبضة في السجل خارج القياس)
+        tick_ms = float('inf')
+        for _ in range(3):
+            history.record(int(history.times()[-1]) + 3600, simulate_tick(history, rng, active))
+            t0 = time.perf_counter()
+            rollups.ingest(history)
+            tick_ms = min(tick_ms, (time.perf_counter() - t0) * 1000)
+        rows = np.flatnonzero((df['المحافظة'] == 'القاهرة').to_numpy())
+        change_ms, _ = timed(lambda: rollups.change('month', rows))
+        print(f"{n:>8,} {build_ms:>16.0f} {rescan_ms:>16.0f} {tick_ms:>19.2f} {change_ms:>20.3f} "
+              f"{rollups.nbytes / n:>10.0f}")
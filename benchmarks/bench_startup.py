@@ -0,0 +1,91 @@
+"""زمن البدء البارد: استيراد الوحدات وأول عنصر يصل للمتصفح في عملية جديدة
+
+كل قياس في عملية Python جديدة (لا وحدات محملة ولا ذاكرة مؤقتة)، ويقارن:
+- قبل: plotly.express يُستورد مع بدء العملية (كما كان في أعلى السكربت) والستايل مضمّن في الصفحة
+- بعد: plotly.express يُستورد عند أول مخطط، والستايل رابط لملف ثابت (STATIC_ASSETS=1)
+
+Streamlit نفسه يستورد plotly.graph_objects عند `import streamlit`، فالمؤجل فعلاً هو plotly.express.
+الأعمدة: زمن الاستيراد، أول عنصر منذ بدء العملية، اكتمال أول تشغيل، حجم رسائل أول تشغيل،
+وهل حُمّل plotly.express. تبويب الجدول لا يرسم مخططات فلا يحتاجه أصلاً.
+
+التشغيل من جذر المستودع:
+    python -m benchmarks.bench_startup
+"""
+import json
+import os
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+APP = os.path.join(ROOT, 'streamlit_app.py')
+TABS = ["📍 الخريطة", "📋 الجدول"]
+REPEAT = 5
+# وحدات السكربت نفسها (plotly.express خارجها في الوضع الجديد)
+APP_IMPORTS = ['streamlit', 'pandas', 'numpy', 'fleet.generator', 'fleet.cube', 'fleet.geo', 'fleet.ingest']
+PLOTLY_IMPORTS = ['plotly.express', 'plotly.graph_objects']
+
+
+def child(tab, eager):
+    """قياس داخل العملية الجديدة - يطبع النتيجة JSON"""
+    import importlib
+    import logging
+
+    t0 = time.perf_counter()
+    for module in APP_IMPORTS + (PLOTLY_IMPORTS if eager else []):
+        importlib.import_module(module)
+    imported = time.perf_counter()
+
+    from streamlit.runtime.forward_msg_queue import ForwardMsgQueue
+    from streamlit.testing.v1 import AppTest
+
+    logging.disable(logging.WARNING)
+    first = {'bytes': 0}
+    enqueue = ForwardMsgQueue.enqueue
+
+    def timed_enqueue(self, msg):
+        if 'paint' not in first and msg.HasField('delta'):
+            first['paint'] = time.perf_counter()
+        first['bytes'] += msg.ByteSize()
+        enqueue(self, msg)
+
+    ForwardMsgQueue.enqueue = timed_enqueue
+    at = AppTest.from_file(APP, default_timeout=300)
+    at.session_state['active_tab'] = tab
+    at.run()
+    done = time.perf_counter()
+    print(json.dumps({
+        'import_ms': (imported - t0) * 1000,
+        'paint_ms': (first['paint'] - t0) * 1000,
+        'run_ms': (done - t0) * 1000,
+        'kb': first['bytes'] / 1024,
+        'plotly': 'plotly.express' in sys.modules,
+        'errors': len(at.exception),
+    }))
+
+
+def measure(tab, eager):
+    """أفضل زمن من REPEAT عملية جديدة (أقل تأثراً بضجيج النظام من المتوسط)"""
+    env = dict(os.environ, STATIC_ASSETS='0' if eager else '1')
+    results = []
+    for _ in range(REPEAT):
+        out = subprocess.run(
+            [sys.executable, '-m', 'benchmarks.bench_startup', '--child', tab, '1' if eager else '0'],
+            cwd=ROOT, env=env, capture_output=True, text=True, check=True
+        )
+        results.append(json.loads(out.stdout.strip().splitlines()[-1]))
+    return {key: (min(r[key] for r in results) if key.endswith('ms') else results[-1][key])
+            for key in results[0]}
+
+
+if __name__ == '__main__':
+    if sys.argv[1:2] == ['--child']:
+        child(sys.argv[2], sys.argv[3] == '1')
+        sys.exit()
+    print(f"{'التبويب':<14} {'الوضع':<6} {'استيراد مللي ث':>14} {'أول عنصر مللي ث':>15} "
+          f"{'أول تشغيل مللي ث':>16} {'KB':>6} {'px':>4}")
+    for tab in TABS:
+        for eager, label in ((True, 'قبل'), (False, 'بعد')):
+            r = measure(tab, eager)
+            print(f"{tab:<14} {label:<6} {r['import_ms']:>14.0f} {r['paint_ms']:>15.0f} "
+                  f"{r['run_ms']:>16.0f} {r['kb']:>6.0f} {'نعم' if r['plotly'] else 'لا':>4}")
@@ -0,0 +1,63 @@
+"""مقارنة ذاكرة وزمن وصول عدة جلسات متزامنة إلى إطار الأسطول
+
+st.cache_data يعيد لكل استدعاء نسخة مفكوكة من pickle، فكل جلسة تحمل إطارها الخاص طوال تشغيلها،
+أما مخزن النسخ (st.cache_resource + FleetStore) فيعيد مرجعاً واحداً مشتركاً لكل الجلسات.
+القياس: زيادة RSS للعملية وهي تحتفظ بإطارات SESSIONS جلسة، وزمن الاستدعاء الواحد.
+
+التشغيل من جذر المستودع:
+    python -m benchmarks.bench_store
+"""
+import gc
+import logging
+import resource
+import time
+
+import streamlit as st
+
+from fleet.generator import generate_fleet
+from fleet.store import FleetStore
+
+SIZES = [10_000, 100_000, 1_000_000]
+SESSIONS = 50
+
+# تحذيرات التشغيل خارج streamlit run لا تخص القياس
+logging.disable(logging.WARNING)
+
+
+def rss_mb():
+    """الذاكرة المقيمة الحالية للعملية"""
+    with open('/proc/self/statm') as f:
+        pages = int(f.read().split()[1])
+    return pages * resource.getpagesize() / 1024 ** 2
+
+
+def sessions(load):
+    """(زيادة الذاكرة ميجابايت، متوسط زمن الاستدعاء مللي ث) لجلسات تحتفظ بإطاراتها معاً"""
+    load()  # الاستدعاء الأول يملأ الذاكرة المؤقتة
+    gc.collect()
+    before = rss_mb()
+    t0 = time.perf_counter()
+    held = [load() for _ in range(SESSIONS)]
+    ms = (time.perf_counter() - t0) / SESSIONS * 1000
+    grown = rss_mb() - before
+    del held
+    gc.collect()
+    return grown, ms
+
+
+if __name__ == '__main__':
+    print(f"{'الحجم':>10} {'cache_data MB':>14} {'مللي ث':>8} {'المخزن MB':>10} {'مللي ث':>8}")
+    for n in SIZES:
+        @st.cache_data
+        def fleet_data(n=n):
+            return generate_fleet(n, seed=42)
+
+        @st.cache_resource
+        def fleet_store(n=n):
+            return FleetStore(generate_fleet(n, seed=42))
+
+        copied_mb, copied_ms = sessions(lambda: fleet_data(n))
+        shared_mb, shared_ms = sessions(lambda: fleet_store(n).current().frame)
+        print(f"{n:>10,} {copied_mb:>14,.1f} {copied_ms:>8.2f} {shared_mb:>10,.1f} {shared_ms:>8.3f}")
+        fleet_data.clear()
+        fleet_store.clear()
@@ -0,0 +1,42 @@
+"""مقارنة جدول التبويب الرابع القديم (فرز كامل وتنسيق كل الخلايا) مع الصفحات على الخادم
+
+التشغيل من جذر المستودع:
+    python -m benchmarks.bench_table
+"""
+import time
+
+from fleet.generator import generate_fleet
+from fleet.table import TablePager
+
+SIZES = [100_000, 1_000_000]
+SORT_COLUMNS = ['معرف المولد', 'الإيراد الشهري', 'الوقود %', 'الحرارة °C', 'ساعات العمل']
+SHOW_COLS = ['معرف المولد', 'الموديل', 'المحافظة', 'الحالة', 'الإيراد الشهري', 'التنبيه']
+FORMATS = {'الإيراد الشهري': '{:.2f}'}
+PAGE_SIZE = 100
+
+
+def legacy_table(df, sort_by):
+    """الفرز الكامل ثم Styler على كل الصفوف (يفشل فوق 262144 خلية عند العرض)"""
+    return df.sort_values(sort_by, ascending=False)[SHOW_COLS].style.format(FORMATS)
+
+
+def paged_table(pager, sort_by, page):
+    return pager.page(sort_by, False, page, PAGE_SIZE, SHOW_COLS).style.format(FORMATS).to_html()
+
+
+def timed(fn):
+    t0 = time.perf_counter()
+    fn()
+    return (time.perf_counter() - t0) * 1000
+
+
+if __name__ == '__main__':
+    print(f"{'الحجم':>10} {'الفرز حسب':<16} {'القديم':>8} {'أول فرز':>8} {'صفحة':>8}  (مللي ث)")
+    for n in SIZES:
+        df = generate_fleet(n, seed=42)
+        pager = TablePager(df)
+        for col in SORT_COLUMNS:
+            old = timed(lambda: legacy_table(df, col))
+            cold = timed(lambda: paged_table(pager, col, 1))
+            warm = min(timed(lambda: paged_table(pager, col, p)) for p in (2, 50, pager.page_count(PAGE_SIZE)))
+            print(f"{n:>10,} {col:<16} {old:>8.0f} {cold:>8.1f} {warm:>8.1f}")
@@ -0,0 +1,71 @@
+"""مقارنة التبويبات الكسولة (التبويب المحدد فقط) مع بناء التبويبات الستة في كل تشغيل
+
+كل قياس هو إعادة تشغيل بعد تغيير مرشح السعة (قيمة جديدة في كل مرة حتى لا تُؤخذ الأقسام
+من الذاكرة)، ويُسجل زمن المعالج في الخادم وحجم الرسائل المرسلة للمتصفح.
+
+التشغيل من جذر المستودع:
+    python -m benchmarks.bench_tabs
+    python -m benchmarks.bench_tabs 20000
+"""
+import logging
+import os
+import sys
+import time
+
+from streamlit.testing.v1 import AppTest
+from streamlit.testing.v1.local_script_runner import LocalScriptRunner
+
+APP = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'streamlit_app.py')
+SIZES = [50, 20_000]
+TABS = ["📍 الخريطة", "📈 التحليلات", "🤖 الذكاء الاصطناعي", "📋 الجدول", "📊 التقارير", "🧪 ماذا لو"]
+REPEAT = 3
+
+# حجم رسائل آخر تشغيل - نلتقطه من مشغل الاختبار المحلي دون تعديل اللوحة
+_payload = {'bytes': 0}
+_forward_msgs = LocalScriptRunner.forward_msgs
+
+
+def _counting_forward_msgs(self):
+    msgs = _forward_msgs(self)
+    _payload['bytes'] = sum(m.ByteSize() for m in msgs)
+    return msgs
+
+
+LocalScriptRunner.forward_msgs = _counting_forward_msgs
+
+
+def measure(n, lazy, tab, counter):
+    """متوسط (زمن المعالج بالمللي ث، البايتات) لإعادة التشغيل بعد تغيير المرشح"""
+    os.environ['FLEET_SIZE'] = str(n)
+    os.environ['LAZY_TABS'] = '1' if lazy else '0'
+    at = AppTest.from_file(APP, default_timeout=300)
+    # مشغل الاختبار لا يرسل حالة التبويبات مع باقي العناصر، فنثبت التبويب المحدد قبل كل تشغيل
+    if lazy:
+        at.session_state['active_tab'] = tab
+    at.run()
+    cpu, payload = 0.0, 0
+    for _ in range(REPEAT):
+        low = 15 + next(counter)
+        slider = at.sidebar.slider[0]
+        slider.set_value((low, slider.max))
+        if lazy:
+            at.session_state['active_tab'] = tab
+        t0 = time.process_time()
+        at.run()
+        cpu += time.process_time() - t0
+        payload += _payload['bytes']
+        assert not at.exception, [e.value for e in at.exception]
+    return cpu / REPEAT * 1000, payload / REPEAT
+
+
+if __name__ == '__main__':
+    logging.disable(logging.WARNING)
+    sizes = [int(a) for a in sys.argv[1:]] or SIZES
+    counter = iter(range(10_000))
+    print(f"{'الحجم':>8} {'التبويب':<22} {'كامل مللي ث':>12} {'كسول مللي ث':>12} {'كامل KB':>10} {'كسول KB':>10}")
+    for n in sizes:
+        eager_cpu, eager_bytes = measure(n, False, None, counter)
+        for tab in TABS:
+            lazy_cpu, lazy_bytes = measure(n, True, tab, counter)
+            print(f"{n:>8,} {tab:<22} {eager_cpu:>12.0f} {lazy_cpu:>12.0f} "
+                  f"{eager_bytes / 1024:>10.0f} {lazy_bytes / 1024:>10.0f}")
@@ -0,0 +1,49 @@
+"""قياس سجل القراءات: الذاكرة والكتابة والنوافذ المتحركة والقراءة المختصرة
+
+التشغيل من جذر المستودع:
+    python -m benchmarks.bench_telemetry
+"""
+import time
+
+import numpy as np
+
+from fleet.generator import generate_fleet
+from fleet.telemetry import backfill_history
+
+N = 100_000
+MB = 1024 ** 2
+
+
+def timed(fn, repeat=3):
+    best = float('inf')
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return best * 1000
+
+
+if __name__ == '__main__':
+    df = generate_fleet(N, seed=42)
+    t0 = time.perf_counter()
+    history = backfill_history(df)
+    print(f"ملء 30 يوماً لـ {N:,} مولد: {time.perf_counter() - t0:.2f} ث")
+    print(f"الذاكرة: {history.nbytes / MB:.0f} ميجابايت ({history.bytes_per_generator:,.0f} بايت لكل مولد)\n")
+
+    rng = np.random.default_rng(0)
+    tick = {'fuel': rng.integers(0, 100, N), 'temp': rng.integers(60, 120, N)}
+    partial = rng.choice(N, 5_000, replace=False)
+    ts = int(history.times()[-1])
+
+    print(f"{'العملية':<38} {'مللي ث':>10}")
+    rows = [
+        ('نبضة كاملة للأسطول', lambda: history.record(ts + 3600, tick)),
+        ('نبضة جزئية (5k مولد)', lambda: history.record(ts + 3600, {k: v[:5_000] for k, v in tick.items()}, rows=partial)),
+        ('متوسط متحرك 24 ساعة (كل المولدات)', lambda: history.rolling('fuel', 24)),
+        ('أعلى حرارة 7 أيام (كل المولدات)', lambda: history.rolling('temp', 24 * 7, 'max')),
+        ('متوسط 30 يوماً (كل المولدات)', lambda: history.rolling('fuel', 24 * 30)),
+        ('اتجاه الأسطول 30 يوماً (200 نقطة)', lambda: history.downsample('temp', points=200)),
+        ('اتجاه مولد واحد 30 يوماً', lambda: history.downsample('fuel', rows=[123])),
+    ]
+    for name, fn in rows:
+        print(f"{name:<38} {timed(fn):>10.2f}")
@@ -0,0 +1,62 @@
+"""محاكاة ماذا لو: زمن السيناريوهات دفعة واحدة مقابل سيناريو بعد سيناريو، وعدد العمليات
+
+- سيناريو بعد سيناريو: نفس النموذج بدفعات من سيناريو واحد (متجه على المولدات فقط).
+- دفعات: 100 سيناريو في كل مصفوفة (سيناريو × مولد).
+- العمليات: الدفعات موزعة على مجمع عمليات، والنتيجة مطابقة لعملية واحدة (بذرة لكل دفعة).
+
+التشغيل من جذر المستودع:
+    python -m benchmarks.bench_whatif
+    python -m benchmarks.bench_whatif --workers 1 2 4
+"""
+import argparse
+import time
+
+import numpy as np
+
+from fleet.generator import generate_fleet
+from fleet.simulate import Scenario, fleet_arrays, simulate, simulation_pool
+
+SIZES = [1_000, 10_000]
+SCENARIOS = 1_000
+DAYS = 14
+
+
+def timed(fn, repeat=3):
+    """أفضل زمن من عدة تكرارات بالثواني مع آخر نتيجة"""
+    best, result = float('inf'), None
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - t0)
+    return best, result
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="قياس محاكاة ماذا لو")
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 2])
+    args = parser.parse_args()
+
+    scenario = Scenario(days=DAYS, scenarios=SCENARIOS)
+    print(f"{SCENARIOS:,} سيناريو × {DAYS} يوم")
+    print(f"{'المولدات':>10} {'سيناريو بعد سيناريو ث':>22} {'دفعات ث':>10} {'التسريع':>8}")
+    for n in SIZES:
+        arrays = fleet_arrays(generate_fleet(n, seed=42))
+        single_s, _ = timed(lambda: simulate(arrays, scenario, chunk=1), repeat=1)
+        batched_s, _ = timed(lambda: simulate(arrays, scenario))
+        print(f"{n:>10,} {single_s:>22.2f} {batched_s:>10.2f} {single_s / batched_s:>8.1f}x")
+
+    # المجمع يُنشأ ويُسخّن قبل القياس كما في اللوحة (get_simulation_pool)
+    arrays = fleet_arrays(generate_fleet(SIZES[-1], seed=42))
+    print(f"\n{'العمليات':>8} {'الزمن ث':>8} {'التسريع':>8} {'مطابقة':>8}")
+    base_s, base = None, None
+    for workers in args.workers:
+        pool = simulation_pool(workers)
+        if pool is not None:
+            simulate(arrays, Scenario(days=1, scenarios=workers), pool=pool, chunk=1)
+        seconds, result = timed(lambda: simulate(arrays, scenario, pool=pool), repeat=1)
+        if pool is not None:
+            pool.shutdown()
+        if base is None:
+            base_s, base = seconds, result
+        same = all(np.array_equal(base.bands[m], result.bands[m]) for m in base.bands)
+        print(f"{workers:>8} {seconds:>8.2f} {base_s / seconds:>7.1f}x {str(same):>8}")
@@ -0,0 +1,6 @@
+"""محركات بيانات أسطول مولدات ديني المستخدمة في لوحة التحكم"""
+from fleet.alerts import ALERT_RULES, AlertRule, evaluate_alerts
+from fleet.filters import FleetFilterIndex
+from fleet.generator import generate_fleet
+from fleet.kpis import FleetKPIs, compute_kpis
+from fleet.schema import FLEET_SCHEMA, GOVERNORATES, KVA_MAP, MODELS, STATUSES, apply_schema
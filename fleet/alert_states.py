@@ -0,0 +1,184 @@
+"""آلة حالات التنبيهات الحية: فتح وإقرار وحل مع نطاق تخلف (hysteresis) ومدد دنيا
+
+تنبيه اللقطة الواحدة يتذبذب مع كل قراءة لمولد يحوم حول الحد. هنا يُفتح التنبيه بعد أن
+يبقى الشرط متحققاً مدة دنيا، ولا يُحل إلا بعد أن تعود القراءة إلى ما وراء حد الإغلاق
+(أبعد من حد الفتح) وتبقى هناك مدة دنيا أيضاً. القراءات بين الحدين لا تغير شيئاً.
+
+الحالة مصفوفة uint8 (مولد × قاعدة) ووقت آخر تغير للطور int32 بالثواني - 5 بايت لكل قاعدة.
+الدفعة تُعالج بعمليات متجهة: القراءات تحمل وقت الدفعة نفسه، فيكفي لكل مولد آخر قراءة
+خارج النطاق الميت (تحدد الطور) ومعرفة هل ظهر الطور المعاكس داخل الدفعة (يعيد عداد المدة).
+"""
+import threading
+import time
+from dataclasses import dataclass
+
+import numpy as np
+
+from fleet.alerts import ALERT_RULES
+
+# الحالات: الطور "مرتفع" = PENDING/OPEN/ACKED، والطور "منخفض" = CLEAR/RESOLVING/RESOLVING_ACKED
+CLEAR, PENDING, OPEN, ACKED, RESOLVING, RESOLVING_ACKED = np.arange(6, dtype=np.uint8)
+STATE_LABELS = ['سليم', 'قيد التأكيد', 'مفتوح', 'مُقَر', 'قيد الحل', 'قيد الحل (مُقَر)']
+
+_RULES = {r.name: r for r in ALERT_RULES}
+
+
+@dataclass(frozen=True)
+class AlertBand:
+    """قاعدة حية: حد الفتح من جدول القواعد، وحد الإغلاق والمدد الدنيا بالثواني"""
+    name: str
+    field: str
+    clear_at: int
+    open_after: int
+    clear_after: int
+
+    @property
+    def rule(self):
+        return _RULES[self.name]
+
+    def bands(self, values):
+        """(قناع نطاق الفتح، قناع نطاق الإغلاق) - ما بينهما نطاق ميت لا يغير الطور"""
+        if self.rule.op in ('lt', 'le'):
+            return values < self.rule.threshold, values >= self.clear_at
+        return values > self.rule.threshold, values <= self.clear_at
+
+
+ALERT_BANDS = (
+    AlertBand('low_fuel', 'fuel', clear_at=20, open_after=300, clear_after=900),
+    AlertBand('high_temp', 'temp', clear_at=100, open_after=120, clear_after=600),
+)
+# عمود الرسالة لكل حقل (نفس ترتيب IngestPipeline: مولد، وقود، حرارة، ساعات)
+_MESSAGE_COLUMNS = {'fuel': 1, 'temp': 2, 'hours': 3}
+_FRAME_COLUMNS = {'fuel': 'الوقود %', 'temp': 'الحرارة °C', 'hours': 'ساعات العمل'}
+
+
+class AlertStates:
+    """حالة كل (مولد، قاعدة) مع عدادات الفتح والحل منذ البداية"""
+
+    def __init__(self, df, bands=ALERT_BANDS, now=None):
+        now = int(now if now is not None else time.time())
+        self.bands = bands
+        self.names = [b.name for b in bands]
+        self.n = len(df)
+        self.epoch = now
+        self.state = np.full((self.n, len(bands)), CLEAR, dtype=np.uint8)
+        self.since = np.zeros((self.n, len(bands)), dtype=np.int32)
+        # التنبيهات القائمة في اللقطة الحالية تبدأ مفتوحة (لا تنتظر المدة الدنيا مجدداً)
+        for j, band in enumerate(bands):
+            raised, _ = band.bands(df[_FRAME_COLUMNS[band.field]].to_numpy())
+            self.state[raised, j] = OPEN
+        self.opened = np.zeros(len(bands), dtype=np.int64)
+        self.resolved = np.zeros(len(bands), dtype=np.int64)
+        self.version = 0
+        self._lock = threading.Lock()
+
+    @property
+    def nbytes(self):
+        return self.state.nbytes + self.since.nbytes
+
+    def _clock(self, timestamp):
+        return np.int32(int(timestamp if timestamp is not None else time.time()) - self.epoch)
+
+    def update(self, rows, values, timestamp=None):
+        """دفعة قراءات بترتيب وصولها (قد يتكرر المولد) - {'fuel': ..., 'temp': ...} بنفس طول rows"""
+        rows = np.asarray(rows, dtype=np.intp)
+        t = self._clock(timestamp)
+        order = np.arange(len(rows))
+        with self._lock:
+            for j, band in enumerate(self.bands):
+                if band.field not in values:
+                    continue
+                raised, cleared = band.bands(np.asarray(values[band.field]))
+                # آخر موضع لكل مولد في كل نطاق (-1 إن لم يظهر)
+                last_raised = np.full(self.n, -1, dtype=np.int64)
+                last_cleared = np.full(self.n, -1, dtype=np.int64)
+                np.maximum.at(last_raised, rows[raised], order[raised])
+                np.maximum.at(last_cleared, rows[cleared], order[cleared])
+                touched = np.flatnonzero((last_raised >= 0) | (last_cleared >= 0))
+                self._transition(j, touched, last_raised[touched] > last_cleared[touched],
+                                 (last_raised[touched] >= 0) & (last_cleared[touched] >= 0), t)
+            self._advance(t)
+            self.version += 1
+
+    def _transition(self, j, rows, now_raised, interrupted, t):
+        """تغيير الطور للمولدات التي وصلتها قراءة خارج النطاق الميت"""
+        state = self.state[rows, j]
+        was_raised = (state == PENDING) | (state == OPEN) | (state == ACKED)
+        # ظهور الطورين في الدفعة نفسها يعني تذبذباً: عداد المدة يبدأ من جديد
+        changed = (now_raised != was_raised) | interrupted
+        self.since[rows[changed], j] = t
+        up = now_raised & ~was_raised
+        down = ~now_raised & was_raised
+        state = np.select(
+            [up & (state == CLEAR), up & (state == RESOLVING), up & (state == RESOLVING_ACKED),
+             down & (state == PENDING), down & (state == OPEN), down & (state == ACKED)],
+            [PENDING, OPEN, ACKED, CLEAR, RESOLVING, RESOLVING_ACKED],
+            state,
+        )
+        self.state[rows, j] = state
+
+    def _advance(self, t):
+        """المدد الدنيا: قيد التأكيد ← مفتوح، وقيد الحل ← سليم"""
+        for j, band in enumerate(self.bands):
+            state, elapsed = self.state[:, j], t - self.since[:, j]
+            opening = (state == PENDING) & (elapsed >= band.open_after)
+            closing = ((state == RESOLVING) | (state == RESOLVING_ACKED)) & (elapsed >= band.clear_after)
+            state[opening] = OPEN
+            state[closing] = CLEAR
+            self.opened[j] += int(np.count_nonzero(opening))
+            self.resolved[j] += int(np.count_nonzero(closing))
+
+    def tick(self, timestamp=None):
+        """مرور الوقت دون قراءات جديدة (تكتمل المدد الدنيا المنتظرة)"""
+        with self._lock:
+            self._advance(self._clock(timestamp))
+            self.version += 1
+
+    def apply_messages(self, messages, timestamp=None):
+        """مشترك في IngestPipeline.on_batch: كل الرسائل بترتيبها لا آخر قيمة فقط"""
+        self.update(messages[:, 0], {field: messages[:, col] for field, col in _MESSAGE_COLUMNS.items()},
+                    timestamp)
+
+    def acknowledge(self, rows=None, name=None):
+        """إقرار التنبيهات المفتوحة (لمولدات وقاعدة محددة أو للكل) - يعيد عدد ما أُقر"""
+        cols = [self.names.index(name)] if name else list(range(len(self.bands)))
+        with self._lock:
+            block = self.state[:, cols] if rows is None else self.state[np.asarray(rows)][:, cols]
+            acked = np.count_nonzero((block == OPEN) | (block == RESOLVING))
+            block = np.where(block == OPEN, ACKED, np.where(block == RESOLVING, RESOLVING_ACKED, block))
+            if rows is None:
+                self.state[:, cols] = block
+            else:
+                self.state[np.ix_(np.asarray(rows), cols)] = block
+            self.version += 1
+        return int(acked)
+
+    def is_open(self, rows=None):
+        """(مولد × قاعدة) منطقية: التنبيه قائم (مفتوح أو مُقَر أو ينتظر الحل)"""
+        state = self.state if rows is None else self.state[rows]
+        return state >= OPEN
+
+    def active(self, rows=None):
+        """المولدات التي لديها أي تنبيه حي قائم"""
+        return self.is_open(rows).any(axis=1)
+
+    def counts(self, rows=None):
+        """عدد المولدات لكل قاعدة وحالة - {تسمية القاعدة: {الحالة: العدد}}"""
+        state = self.state if rows is None else self.state[rows]
+        return {
+            band.rule.label: dict(zip(STATE_LABELS, np.bincount(state[:, j], minlength=len(STATE_LABELS)).tolist()))
+            for j, band in enumerate(self.bands)
+        }
+
+    def unacknowledged(self, rows=None):
+        """عدد المولدات التي لديها تنبيه قائم لم يُقَر بعد"""
+        state = self.state if rows is None else self.state[rows]
+        return int(np.count_nonzero(((state == OPEN) | (state == RESOLVING)).any(axis=1)))
+
+    def critical(self, alerts, rows):
+        """التنبيهات القائمة لصفوف مرشحة: القواعد الحية من الآلة والباقي (الحالة، الساعات) من اللقطة"""
+        mask = self.active(rows)
+        for rule in ALERT_RULES:
+            if rule.label and rule.name not in self.names:
+                mask = mask | alerts.masks[rule.name]
+        return mask
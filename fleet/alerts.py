@@ -0,0 +1,112 @@
+"""محرك قواعد التنبيهات - جدول قواعد يُقيَّم مرة واحدة لكل إطار بعمليات متجهة"""
+import operator
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+NO_ALERT = "لا يوجد"
+
+_OPS = {
+    'lt': operator.lt,
+    'le': operator.le,
+    'gt': operator.gt,
+    'ge': operator.ge,
+    'eq': operator.eq,
+}
+
+
+@dataclass(frozen=True)
+class AlertRule:
+    """قاعدة تنبيه: عمود ومقارنة وحد - القواعد بدون تسمية تنتج قناعاً فقط"""
+    name: str
+    column: str
+    op: str
+    threshold: object
+    priority: int = 0
+    label: str = None
+
+
+# الأولوية الأصغر تغلب عند تحقق أكثر من قاعدة لنفس المولد
+ALERT_RULES = (
+    AlertRule('low_fuel', 'الوقود %', 'lt', 15, 1, "⚠️ وقود منخفض"),
+    AlertRule('high_temp', 'الحرارة °C', 'gt', 105, 2, "🔴 ارتفاع حرارة"),
+    AlertRule('maintenance', 'الحالة', 'eq', 'صيانة', 3, "🔧 صيانة مجدولة"),
+    AlertRule('overhaul', 'ساعات العمل', 'gt', 4500, 4, "🛠️ مراجعة شاملة"),
+    # حد الوقود الحرج الذي يضبطه المشغل من الشريط الجانبي
+    AlertRule('fuel_watch', 'الوقود %', 'lt', 20),
+)
+
+
+def alert_categories(rules=ALERT_RULES):
+    """تسميات التنبيه بترتيب الأكواد: 0 = لا يوجد ثم القواعد حسب الأولوية"""
+    return [NO_ALERT] + [r.label for r in _labelled(rules)]
+
+
+def _labelled(rules):
+    return sorted((r for r in rules if r.label), key=lambda r: r.priority)
+
+
+def _column_mask(column, op, threshold):
+    """قناع منطقي لعمود واحد - يقارن أكواد الفئات مباشرة عند وجودها"""
+    if isinstance(column.dtype, pd.CategoricalDtype) and op == 'eq':
+        categories = column.cat.categories
+        if threshold not in categories:
+            return np.zeros(len(column), dtype=bool)
+        return column.cat.codes.to_numpy() == categories.get_loc(threshold)
+    if not pd.api.types.is_numeric_dtype(column.dtype):
+        # الأعمدة النصية تُقارن داخل pandas لتجنب تحويلها إلى كائنات بايثون
+        return _OPS[op](column, threshold).to_numpy(dtype=bool)
+    return _OPS[op](column.to_numpy(), threshold)
+
+
+@dataclass
+class AlertResult:
+    """نتيجة تقييم القواعد: كود التنبيه لكل صف وقناع لكل قاعدة"""
+    codes: np.ndarray
+    masks: dict
+    categories: list
+
+    def labels(self):
+        """عمود التنبيه كفئات - الأكواد هي نفسها ترتيب القواعد"""
+        return pd.Categorical.from_codes(self.codes, categories=self.categories)
+
+    def count(self, name):
+        return int(np.count_nonzero(self.masks[name]))
+
+    @property
+    def active(self):
+        """المولدات التي لديها أي تنبيه"""
+        return self.codes != 0
+
+    @property
+    def nbytes(self):
+        return self.codes.nbytes + sum(mask.nbytes for mask in self.masks.values())
+
+
+def _first_set_bit_table(n):
+    """كود أول قاعدة متحققة لكل تركيبة من n بت (0 إذا لم تتحقق أي قاعدة)"""
+    combos = np.arange(1 << n)
+    table = np.zeros(1 << n, dtype=np.int8)
+    for i in range(n - 1, -1, -1):
+        table[(combos >> i) & 1 == 1] = i + 1
+    return table
+
+
+def evaluate_alerts(df, rules=ALERT_RULES, thresholds=None):
+    """تقييم جدول القواعد على الإطار مرة واحدة مع إمكانية تجاوز الحدود بالاسم"""
+    thresholds = thresholds or {}
+    masks = {
+        r.name: _column_mask(df[r.column], r.op, thresholds.get(r.name, r.threshold))
+        for r in rules
+    }
+    # نفس دلالة np.select (أول قاعدة متحققة تغلب): نجمع الأقنعة في بتات ثم
+    # جدول بحث صغير يحوّل كل تركيبة بتات إلى كود القاعدة الأعلى أولوية
+    ordered = _labelled(rules)
+    if len(ordered) > 8:
+        raise ValueError("جدول التنبيهات يدعم حتى 8 قواعد ذات تسمية")
+    bits = np.zeros(len(df), dtype=np.uint8)
+    for i, r in enumerate(ordered):
+        bits |= masks[r.name].view(np.uint8) << np.uint8(i)
+    codes = _first_set_bit_table(len(ordered))[bits]
+    return AlertResult(codes, masks, alert_categories(rules))
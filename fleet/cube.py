@@ -0,0 +1,107 @@
+"""مكعب تجميع مسبق للأسطول: عدد ومجاميع المقاييس لكل خلية أبعاد
+
+الأبعاد أكواد فئات (المحافظة، الحالة، الموديل، الموقع) إضافة إلى السعة كبعد خامس
+حتى يُطبق مرشح نطاق السعة على المكعب نفسه (السعة تتبع الموديل فلا يكبر المكعب عملياً).
+كل الرسوم والتقارير تُجاب بجمع محاور المكعب دون groupby على الصفوف، والصفوف الخام
+لا تُقرأ إلا عند طلب تفصيل خلية بعينها.
+"""
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+CUBE_DIMENSIONS = ('المحافظة', 'الحالة', 'الموديل', 'الموقع', 'السعة')
+
+# اسم المقياس ← عمود الإطار (يُخزن مجموعه لكل خلية)
+CUBE_MEASURES = {
+    'revenue': 'الإيراد الشهري',
+    'fuel': 'الوقود %',
+    'temp': 'الحرارة °C',
+    'hours': 'ساعات العمل',
+}
+
+
+def _axis(column):
+    """(أكواد الصفوف، تسميات المحور) - الفئات مباشرة والأرقام عبر قيمها الفريدة"""
+    if isinstance(column.dtype, pd.CategoricalDtype):
+        return column.cat.codes.to_numpy().astype(np.intp), list(column.cat.categories)
+    labels, codes = np.unique(column.to_numpy(), return_inverse=True)
+    return codes, labels.tolist()
+
+
+@dataclass(frozen=True)
+class FleetCube:
+    """مصفوفات بشكل المكعب: العدد ومجموع كل مقياس، مع تسميات كل محور"""
+    labels: dict
+    counts: np.ndarray
+    sums: dict
+
+    @classmethod
+    def build(cls, df, dimensions=CUBE_DIMENSIONS, measures=CUBE_MEASURES):
+        """تمريرة واحدة: فهرس مسطح لكل صف ثم bincount للعدد ولكل مقياس"""
+        axes = [_axis(df[dim]) for dim in dimensions]
+        shape = tuple(len(labels) for _, labels in axes)
+        flat = np.ravel_multi_index([codes for codes, _ in axes], shape)
+        size = int(np.prod(shape))
+        counts = np.bincount(flat, minlength=size).reshape(shape)
+        sums = {
+            name: np.bincount(flat, weights=df[column].to_numpy(), minlength=size).reshape(shape)
+            for name, column in measures.items()
+        }
+        labels = {dim: axis_labels for dim, (_, axis_labels) in zip(dimensions, axes)}
+        return cls(labels, counts, sums)
+
+    @property
+    def dimensions(self):
+        return tuple(self.labels)
+
+    @property
+    def total(self):
+        return int(self.counts.sum())
+
+    def _index(self, dim, values):
+        labels = self.labels[dim]
+        wanted = set(values)
+        return [i for i, label in enumerate(labels) if label in wanted]
+
+    def slice(self, value_range=None, **selections):
+        """مكعب جزئي حسب قيم كل بعد (بأسماء الأعمدة) ونطاق السعة - عمليات على المصفوفات الصغيرة فقط"""
+        index = {dim: range(len(labels)) for dim, labels in self.labels.items()}
+        for dim, values in selections.items():
+            index[dim] = self._index(dim, values)
+        if value_range is not None:
+            low, high = value_range
+            index['السعة'] = [i for i, v in enumerate(self.labels['السعة']) if low <= v <= high]
+        take = np.ix_(*[list(ix) for ix in index.values()])
+        return FleetCube(
+            labels={dim: [self.labels[dim][i] for i in ix] for dim, ix in index.items()},
+            counts=self.counts[take],
+            sums={name: array[take] for name, array in self.sums.items()},
+        )
+
+    def rollup(self, *dims):
+        """إطار مفهرس بالأبعاد المطلوبة: العدد ومجموع كل مقياس، دون الخلايا الفارغة"""
+        keep = [self.dimensions.index(d) for d in dims]
+        drop = tuple(i for i in range(len(self.dimensions)) if i not in keep)
+        # المحاور الباقية بعد الجمع بترتيب المكعب - نعيد ترتيبها كما طُلبت
+        axes = [sorted(keep).index(k) for k in keep]
+
+        def reduce(array):
+            return array.sum(axis=drop).transpose(axes).ravel()
+
+        index = pd.MultiIndex.from_product([self.labels[d] for d in dims], names=list(dims))
+        frame = pd.DataFrame(
+            {'count': reduce(self.counts), **{name: reduce(s) for name, s in self.sums.items()}},
+            index=index,
+        )
+        frame = frame[frame['count'] > 0]
+        if len(dims) == 1:
+            frame.index = frame.index.get_level_values(0)
+        return frame
+
+    def drill(self, df, **cell):
+        """صفوف خلية محددة من الإطار الخام - المسار الوحيد الذي يقرأ الصفوف"""
+        mask = np.ones(len(df), dtype=bool)
+        for dim, value in cell.items():
+            mask &= (df[dim] == value).to_numpy(dtype=bool)
+        return df[mask]
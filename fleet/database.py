@@ -0,0 +1,234 @@
+"""مخزن الأسطول الدائم على القرص: ملف SQLite محلي لسجل المولدات وسجل القراءات
+
+جدول المولدات مرتب فعلياً (WITHOUT ROWID) بمفتاح المرشحات (المحافظة، الحالة، السعة، الصف)
+فتطبيق مرشحات الشريط الجانبي داخل الاستعلام يقرأ مجالات متصلة من الملف فقط بدل تحميل
+الأسطول كاملاً. النصوص المتكررة تُخزن بأكواد فئات المخطط، والقراءات نبضة لكل صف بمصفوفة
+الأسطول كاملة كبايتات لكل مقياس - نفس تخطيط (زمن × مولد) في TelemetryHistory.
+"""
+import contextlib
+import os
+import sqlite3
+
+import numpy as np
+import pandas as pd
+
+from fleet.schema import FLEET_SCHEMA, categorical
+from fleet.telemetry import TELEMETRY_METRICS, TelemetryHistory
+
+# عمود الإطار ← اسم العمود في القاعدة
+COLUMNS = {
+    'معرف المولد': 'gid',
+    'الموديل': 'model',
+    'السعة': 'capacity',
+    'المحافظة': 'gov',
+    'lat': 'lat',
+    'lon': 'lon',
+    'الحالة': 'status',
+    'الإيراد الشهري': 'revenue',
+    'الوقود %': 'fuel',
+    'الحرارة °C': 'temp',
+    'ساعات العمل': 'hours',
+    'التنبيه': 'alert',
+    'الموقع': 'site',
+}
+CATEGORY_COLUMNS = [col for col, dtype in FLEET_SCHEMA.items() if isinstance(dtype, pd.CategoricalDtype)]
+BULK_ROWS = 100_000
+
+
+def _sql_type(col):
+    if col in CATEGORY_COLUMNS:
+        return 'INTEGER'
+    if FLEET_SCHEMA[col] == 'str':
+        return 'TEXT'
+    return 'REAL' if np.dtype(FLEET_SCHEMA[col]).kind == 'f' else 'INTEGER'
+
+
+_SCHEMA = f"""
+CREATE TABLE IF NOT EXISTS generators (
+    row INTEGER NOT NULL,
+    {', '.join(f'{name} {_sql_type(col)}' for col, name in COLUMNS.items())},
+    PRIMARY KEY (gov, status, capacity, row)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS telemetry (
+    ts INTEGER PRIMARY KEY,
+    {', '.join(f'{name} BLOB' for name in TELEMETRY_METRICS)}
+);
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);
+"""
+
+
+class FleetDatabase:
+    """ملف القاعدة - اتصال جديد لكل عملية حتى يصلح الكائن للمشاركة بين خيوط الجلسات"""
+
+    def __init__(self, path):
+        self.path = path
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        with self._connect() as con:
+            con.executescript(_SCHEMA)
+
+    @contextlib.contextmanager
+    def _connect(self):
+        con = sqlite3.connect(self.path)
+        try:
+            with con:
+                yield con
+        finally:
+            con.close()
+
+    def __len__(self):
+        with self._connect() as con:
+            return con.execute("SELECT COUNT(*) FROM generators").fetchone()[0]
+
+    @property
+    def nbytes(self):
+        return os.path.getsize(self.path)
+
+    def meta(self):
+        with self._connect() as con:
+            return dict(con.execute("SELECT key, value FROM meta"))
+
+    def bulk_load(self, df, chunk_rows=BULK_ROWS, **meta):
+        """استبدال سجل المولدات بإطار كامل في معاملة واحدة، دفعة بعد دفعة من المصفوفات"""
+        names = ['row'] + list(COLUMNS.values())
+        insert = f"INSERT INTO generators ({', '.join(names)}) VALUES ({', '.join('?' * len(names))})"
+        columns = [np.arange(len(df))]
+        for col in COLUMNS:
+            values = df[col]
+            columns.append(values.cat.codes.to_numpy() if col in CATEGORY_COLUMNS else values.to_numpy())
+        with self._connect() as con:
+            # لا حاجة لسجل استرجاع أثناء التحميل: الملف يُبنى من جديد إن انقطع
+            con.execute("PRAGMA journal_mode=OFF")
+            con.execute("PRAGMA synchronous=OFF")
+            con.execute("DELETE FROM generators")
+            for start in range(0, len(df), chunk_rows):
+                # tolist يحول كل عمود إلى قيم بايثون دفعة واحدة (أسرع من تحويل كل خلية على حدة)
+                chunk = [c[start:start + chunk_rows].tolist() for c in columns]
+                con.executemany(insert, zip(*chunk))
+            con.executemany("INSERT OR REPLACE INTO meta VALUES (?, ?)",
+                            [(key, str(value)) for key, value in {'rows': len(df), **meta}.items()])
+            # إحصاءات للمخطط الاستعلامي: مسح كامل بدل الفهرس عندما يطابق المرشح معظم الأسطول
+            con.execute("ANALYZE")
+        return self
+
+    @staticmethod
+    def _where(selections, value_range, category_columns=('المحافظة', 'الحالة'), range_column='السعة'):
+        """شرط WHERE من المرشحات - المرشح الذي يختار كل القيم لا يُضاف للشرط"""
+        clauses, params = [], []
+        for col, values in zip(category_columns, selections or ()):
+            if values is None:
+                continue
+            categories = list(FLEET_SCHEMA[col].categories)
+            codes = sorted({categories.index(v) for v in values if v in categories})
+            if len(codes) == len(categories):
+                continue
+            clauses.append(f"{COLUMNS[col]} IN ({', '.join('?' * len(codes))})" if codes else "0")
+            params += codes
+        if value_range is not None:
+            clauses.append(f"{COLUMNS[range_column]} BETWEEN ? AND ?")
+            params += [int(value_range[0]), int(value_range[1])]
+        return (f" WHERE {' AND '.join(clauses)}" if clauses else ''), params
+
+    def query(self, selections=None, value_range=None, columns=None):
+        """الصفوف المطابقة للمرشحات فقط بأنواع المخطط وبترتيب الأسطول الأصلي"""
+        columns = list(COLUMNS) if columns is None else list(columns)
+        where, params = self._where(selections, value_range)
+        with self._connect() as con:
+            rows = con.execute(
+                f"SELECT row, {', '.join(COLUMNS[col] for col in columns)} FROM generators{where}", params
+            ).fetchall()
+        return self._frame(rows, columns)
+
+    def load(self):
+        """الأسطول كاملاً (بدء بارد دون إعادة توليد)"""
+        return self.query()
+
+    def count(self, selections=None, value_range=None):
+        where, params = self._where(selections, value_range)
+        with self._connect() as con:
+            return con.execute(f"SELECT COUNT(*) FROM generators{where}", params).fetchone()[0]
+
+    @staticmethod
+    def _frame(rows, columns):
+        """إطار بأنواع المخطط من صفوف الاستعلام - مرتب برقم الصف لا بمفتاح الجدول"""
+        if not rows:
+            return pd.DataFrame({col: pd.Series(dtype=FLEET_SCHEMA[col]) for col in columns})
+        values = list(zip(*rows))
+        row = np.array(values[0], dtype=np.int64)
+        order = np.argsort(row, kind='stable')
+        data = {}
+        for col, raw in zip(columns, values[1:]):
+            if col in CATEGORY_COLUMNS:
+                data[col] = categorical(np.array(raw, dtype=np.int16)[order], col)
+            elif FLEET_SCHEMA[col] == 'str':
+                data[col] = pd.array(np.array(raw, dtype=object)[order], dtype=FLEET_SCHEMA[col])
+            else:
+                data[col] = np.array(raw, dtype=FLEET_SCHEMA[col])[order]
+        row = row[order]
+        # الأسطول كاملاً يعود بنفس فهرس الإطار المولد، والمرشح يحتفظ بأرقام صفوفه الأصلية
+        return pd.DataFrame(data, index=pd.RangeIndex(len(row)) if row[-1] == len(row) - 1 else row)
+
+    def save_telemetry(self, history):
+        """حفظ نبضات السجل الدائري كاملة بترتيبها الزمني (تستبدل المحفوظ)"""
+        slots = (history.head - history.size + np.arange(history.size)) % history.capacity
+        rows = [(int(history.timestamps[s]), *(history.data[name][s].tobytes() for name in TELEMETRY_METRICS))
+                for s in slots]
+        with self._connect() as con:
+            con.execute("DELETE FROM telemetry")
+            con.executemany(f"INSERT INTO telemetry VALUES ({', '.join('?' * (len(TELEMETRY_METRICS) + 1))})", rows)
+
+    def append_tick(self, timestamp, values, alerts, keep=None):
+        """إضافة نبضة أسطول كاملة وتحديث قيم المولدات وتنبيهاتها في نفس المعاملة، وحذف ما زاد عن آخر `keep` نبضة
+
+        `alerts` عمود التنبيه بعد النبضة بترتيب الأسطول، فيعود load() بالقراءات الأخيرة لا بقيم التعبئة الأولى.
+        """
+        dtypes = {name: dtype for name, (_, dtype) in TELEMETRY_METRICS.items()}
+        arrays = [np.asarray(values[name], dtype=dtypes[name]) for name in TELEMETRY_METRICS]
+        blobs = [array.tobytes() for array in arrays]
+        codes = pd.Categorical(alerts, dtype=FLEET_SCHEMA['التنبيه']).codes
+        names = list(TELEMETRY_METRICS) + ['alert']
+        with self._connect() as con:
+            con.execute(f"INSERT OR REPLACE INTO telemetry VALUES ({', '.join('?' * (len(blobs) + 1))})",
+                        (int(timestamp), *blobs))
+            # جدول مؤقت بمفتاح رقم الصف ثم تحديث واحد بالربط - بدل تحديث لكل صف بحثاً في مفتاح المرشحات
+            con.execute(f"CREATE TEMP TABLE tick (row INTEGER PRIMARY KEY, {', '.join(names)})")
+            con.executemany(f"INSERT INTO tick VALUES ({', '.join('?' * (len(names) + 1))})",
+                            zip(range(len(codes)), *(array.tolist() for array in arrays), codes.tolist()))
+            con.execute(f"UPDATE generators SET {', '.join(f'{name} = tick.{name}' for name in names)} "
+                        "FROM tick WHERE generators.row = tick.row")
+            if keep:
+                con.execute("DELETE FROM telemetry WHERE ts NOT IN "
+                            "(SELECT ts FROM telemetry ORDER BY ts DESC LIMIT ?)", (keep,))
+
+    def load_telemetry(self, n, capacity):
+        """آخر `capacity` نبضة في سجل دائري جديد، أو None إن لم يُحفظ سجل لهذا الحجم"""
+        with self._connect() as con:
+            rows = con.execute("SELECT * FROM (SELECT * FROM telemetry ORDER BY ts DESC LIMIT ?) ORDER BY ts",
+                               (capacity,)).fetchall()
+        dtypes = [dtype for _, dtype in TELEMETRY_METRICS.values()]
+        if not rows or len(rows[0][1]) != n * np.dtype(dtypes[0]).itemsize:
+            return None
+        history = TelemetryHistory(n, capacity)
+        for slot, (ts, *blobs) in enumerate(rows):
+            history.timestamps[slot] = ts
+            for name, dtype, blob in zip(TELEMETRY_METRICS, dtypes, blobs):
+                history.data[name][slot] = np.frombuffer(blob, dtype=dtype)
+        history.size = len(rows)
+        history.head = len(rows) % capacity
+        history.version = 1
+        return history
+
+
+def open_fleet_database(path, build, backfill=None, **meta):
+    """فتح القاعدة وتعبئتها عند أول تشغيل: build() يعطي الإطار، وbackfill(df) السجل
+
+    meta (مثل حجم الأسطول والبذرة) تُحفظ مع التعبئة، واختلافها عن المحفوظ في ملف قائم
+    يعيد التعبئة بدل تقديم أسطول قديم لا يطابق الإعداد الحالي.
+    """
+    db = FleetDatabase(path)
+    stored = db.meta()
+    if len(db) == 0 or any(stored.get(key) != str(value) for key, value in meta.items()):
+        db.bulk_load(build(), **meta)
+        if backfill is not None:
+            db.save_telemetry(backfill(db.load()))
+    return db
@@ -0,0 +1,157 @@
+"""تخطيط إرسال الفنيين وسيارات الوقود: فهرس شبكي للمواقع وأقرب المولدات لكل فرع
+
+كل الحسابات محلية (مسافة هافرساين على الإحداثيات) دون أي خدمة خرائط. الفهرس خلايا
+متساوية تقريباً بالكيلومتر مرتبة بمفتاح الخلية مع حدود كل خلية (CSR)، والبحث عن أقرب K
+يوسع مربع الخلايا حول نقطة الاستعلام حتى يضمن أن لا مولد خارج المربع أقرب من الـK المختارة.
+"""
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from fleet.schema import GOVERNORATES
+
+EARTH_RADIUS_KM = 6371.0
+KM_PER_DEGREE = 111.195
+# فرع لكل محافظة في مركزها
+DEPOTS = {f"فرع {gov}": (pos['lat'], pos['lon']) for gov, pos in GOVERNORATES.items()}
+CELL_KM = 10.0
+# أقصى عدد مولدات في جولة وقود واحدة
+RUN_STOPS = 12
+
+
+def haversine_km(lat1, lon1, lat2, lon2):
+    """المسافة على سطح الأرض بالكيلومتر - تقبل مصفوفات بأي شكل قابل للبث"""
+    lat1, lon1, lat2, lon2 = (np.radians(np.asarray(v, dtype=np.float64)) for v in (lat1, lon1, lat2, lon2))
+    a = np.sin((lat2 - lat1) / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(a))
+
+
+def _ranges(starts, ends):
+    """دمج مجالات [start, end) في مصفوفة أرقام واحدة دون حلقة بايثون"""
+    lengths = ends - starts
+    total = int(lengths.sum())
+    if total == 0:
+        return np.empty(0, dtype=np.intp)
+    offsets = np.repeat(starts - np.concatenate(([0], np.cumsum(lengths)[:-1])), lengths)
+    return offsets + np.arange(total)
+
+
+class GridIndex:
+    """فهرس شبكي للمولدات: ترتيب الصفوف حسب الخلية وحدود كل خلية"""
+
+    def __init__(self, lat, lon, cell_km=CELL_KM):
+        self.lat = np.asarray(lat, dtype=np.float64)
+        self.lon = np.asarray(lon, dtype=np.float64)
+        lat0 = float(self.lat.min()) if len(self.lat) else 0.0
+        lat1 = float(self.lat.max()) if len(self.lat) else 0.0
+        # خلايا العرض أوسع بالدرجات حتى تبقى مربعة تقريباً بالكيلومتر عند خط العرض الأوسط
+        self.cell_lat = cell_km / KM_PER_DEGREE
+        self.cell_lon = self.cell_lat / np.cos(np.radians((lat0 + lat1) / 2))
+        # أقل ضلع للخلية بالكيلومتر في أي مكان داخل الشبكة (العرض يضيق شمالاً)
+        self.cell_km = min(cell_km, self.cell_lon * KM_PER_DEGREE * np.cos(np.radians(max(abs(lat0), abs(lat1)))))
+        self.origin = (lat0, float(self.lon.min()) if len(self.lon) else 0.0)
+        rows, cols = self._cell(self.lat, self.lon)
+        self.shape = (int(rows.max()) + 1 if len(rows) else 1, int(cols.max()) + 1 if len(cols) else 1)
+        keys = rows * self.shape[1] + cols
+        self.order = np.argsort(keys, kind='stable')
+        self.bounds = np.searchsorted(keys[self.order], np.arange(self.shape[0] * self.shape[1] + 1))
+
+    def __len__(self):
+        return len(self.lat)
+
+    def _cell(self, lat, lon):
+        return (np.floor((lat - self.origin[0]) / self.cell_lat).astype(np.int64),
+                np.floor((lon - self.origin[1]) / self.cell_lon).astype(np.int64))
+
+    def _square(self, row, col, radius):
+        """صفوف المولدات في مربع الخلايا [row±radius]×[col±radius] داخل الشبكة"""
+        r = np.arange(max(row - radius, 0), min(row + radius, self.shape[0] - 1) + 1)
+        c0, c1 = max(col - radius, 0), min(col + radius, self.shape[1] - 1)
+        if len(r) == 0 or c0 > c1:
+            return np.empty(0, dtype=np.intp)
+        # كل صف خلايا في المربع مجال متصل من المفاتيح فيكفي حدّاه
+        starts = self.bounds[r * self.shape[1] + c0]
+        ends = self.bounds[r * self.shape[1] + c1 + 1]
+        return self.order[_ranges(starts, ends)]
+
+    def nearest(self, lat, lon, k, mask=None):
+        """(أرقام الصفوف، المسافات كم) لأقرب k مولد من النقطة - ضمن قناع صفوف إن وُجد"""
+        if len(self) == 0 or k <= 0:
+            return np.empty(0, dtype=np.intp), np.empty(0)
+        row, col = (int(v) for v in self._cell(np.float64(lat), np.float64(lon)))
+        # النقطة قد تكون خارج الشبكة (فرع بعيد عن المولدات) فنبدأ بالمسافة حتى أقرب حافة
+        radius = max(-row, row - self.shape[0] + 1, -col, col - self.shape[1] + 1, 1)
+        while True:
+            rows = self._square(row, col, radius)
+            if mask is not None:
+                rows = rows[mask[rows]]
+            covers_all = (row - radius <= 0 and col - radius <= 0 and row + radius >= self.shape[0] - 1
+                          and col + radius >= self.shape[1] - 1)
+            if len(rows) >= k or covers_all:
+                dist = haversine_km(lat, lon, self.lat[rows], self.lon[rows])
+                take = min(k, len(rows))
+                top = np.argpartition(dist, take - 1)[:take] if take else np.empty(0, dtype=np.intp)
+                top = top[np.argsort(dist[top])]
+                # أي مولد خارج المربع يبعد على الأقل radius خلية عن النقطة
+                if covers_all or (take and dist[top[-1]] <= radius * self.cell_km):
+                    return rows[top], dist[top]
+            radius *= 2
+
+
+def nearest_depot(lat, lon, depots=DEPOTS):
+    """(اسم أقرب فرع، المسافة كم) لكل مولد - مصفوفة (مولد × فرع) صغيرة"""
+    names = list(depots)
+    positions = np.array(list(depots.values()))
+    dist = haversine_km(np.asarray(lat)[:, None], np.asarray(lon)[:, None], positions[:, 0], positions[:, 1])
+    nearest = dist.argmin(axis=1)
+    return np.array(names, dtype=object)[nearest], dist[np.arange(len(nearest)), nearest]
+
+
+@dataclass(frozen=True)
+class RefuelPlan:
+    """جولات الوقود: الجولة لكل مولد، وجدول ملخص لكل جولة"""
+    rows: np.ndarray
+    run: np.ndarray
+    runs: pd.DataFrame
+
+
+def refuel_runs(lat, lon, rows, depots=DEPOTS, stops=RUN_STOPS):
+    """تجميع المولدات في جولات من أقرب فرع بخوارزمية المسح الزاوي (sweep)
+
+    كل مولد يُنسب لأقرب فرع، ثم تُرتب مولدات كل فرع حسب الزاوية حوله وتُقسم كل `stops`
+    متتالية في جولة - مولدات الجولة الواحدة في قطاع ضيق فيقصر مسارها. المسافة تقدير
+    لمسار (الفرع ← المحطات بترتيب الزاوية ← الفرع).
+    """
+    rows = np.asarray(rows)
+    columns = ['الفرع', 'الجولة', 'عدد المولدات', 'المسافة التقديرية كم']
+    if len(rows) == 0:
+        return RefuelPlan(rows, np.empty(0, dtype=np.intp), pd.DataFrame(columns=columns))
+    lat, lon = np.asarray(lat, dtype=np.float64)[rows], np.asarray(lon, dtype=np.float64)[rows]
+    names = list(depots)
+    positions = np.array(list(depots.values()))
+    depot = haversine_km(lat[:, None], lon[:, None], positions[:, 0], positions[:, 1]).argmin(axis=1)
+    angle = np.arctan2(lat - positions[depot, 0], lon - positions[depot, 1])
+    order = np.lexsort((angle, depot))
+    depot, lat, lon = depot[order], lat[order], lon[order]
+    # الترتيب داخل كل فرع ثم رقم الجولة العام
+    first = np.flatnonzero(np.r_[True, depot[1:] != depot[:-1]])
+    position = np.arange(len(depot)) - np.repeat(first, np.diff(np.r_[first, len(depot)]))
+    local_run = position // stops
+    starts = np.flatnonzero(np.r_[True, (depot[1:] != depot[:-1]) | (local_run[1:] != local_run[:-1])])
+    run = np.repeat(np.arange(len(starts)), np.diff(np.r_[starts, len(depot)]))
+    # طول المسار: خروج من الفرع لأول محطة، بين المحطات المتتالية، وعودة من آخر محطة
+    ends = np.r_[starts[1:], len(depot)] - 1
+    legs = haversine_km(lat[:-1], lon[:-1], lat[1:], lon[1:])
+    same = run[1:] == run[:-1]
+    inner = np.bincount(run[:-1][same], weights=legs[same], minlength=len(starts))
+    run_depot = depot[starts]
+    out_leg = haversine_km(positions[run_depot, 0], positions[run_depot, 1], lat[starts], lon[starts])
+    back_leg = haversine_km(lat[ends], lon[ends], positions[run_depot, 0], positions[run_depot, 1])
+    runs = pd.DataFrame({
+        'الفرع': np.array(names, dtype=object)[run_depot],
+        'الجولة': local_run[starts] + 1,
+        'عدد المولدات': ends - starts + 1,
+        'المسافة التقديرية كم': np.round(out_leg + inner + back_leg, 1),
+    })
+    return RefuelPlan(rows[order], run, runs)
@@ -0,0 +1,142 @@
+"""تصدير الأسطول على دفعات: CSV بترميز UTF-8-BOM أو Parquet / Arrow IPC عمودية
+
+الملف يُكتب دفعة بعد دفعة إلى ملف مؤقت على القرص فلا يجتمع النص الكامل في الذاكرة،
+ويُحفظ الملف الناتج حسب مفتاح حالة المرشحات فلا يُعاد بناؤه لنفس الطلب.
+"""
+import os
+import shutil
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+
+CHUNK_ROWS = 100_000
+
+# الصيغة ← (الاسم المعروض، نوع MIME، الامتداد)
+EXPORT_FORMATS = {
+    'csv': ('CSV', 'text/csv', '.csv'),
+    'parquet': ('Parquet', 'application/vnd.apache.parquet', '.parquet'),
+    'arrow': ('Arrow IPC', 'application/vnd.apache.arrow.stream', '.arrow'),
+}
+
+
+def available_formats():
+    """الصيغ المتاحة - Parquet و Arrow تحتاجان pyarrow (اختياري)"""
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        return ['csv']
+    return list(EXPORT_FORMATS)
+
+
+def _chunks(df, chunk_rows):
+    for start in range(0, len(df), chunk_rows):
+        yield df.iloc[start:start + chunk_rows]
+
+
+def iter_csv(df, chunk_rows=CHUNK_ROWS):
+    """أجزاء CSV بالبايت: علامة BOM والعناوين أولاً ثم دفعة صفوف في كل جزء"""
+    yield '﻿'.encode('utf-8') + df.iloc[:0].to_csv(index=False).encode('utf-8')
+    for chunk in _chunks(df, chunk_rows):
+        yield chunk.to_csv(index=False, header=False).encode('utf-8')
+
+
+def write_csv(df, out, chunk_rows=CHUNK_ROWS):
+    for part in iter_csv(df, chunk_rows):
+        out.write(part)
+
+
+def write_parquet(df, out, chunk_rows=CHUNK_ROWS):
+    """مجموعة صفوف (row group) لكل دفعة - الأعمدة الفئوية تبقى قواميس مضغوطة"""
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    schema = pa.Schema.from_pandas(df.iloc[:0], preserve_index=False)
+    with pq.ParquetWriter(out, schema) as writer:
+        for chunk in _chunks(df, chunk_rows):
+            writer.write_table(pa.Table.from_pandas(chunk, schema=schema, preserve_index=False))
+
+
+def write_arrow(df, out, chunk_rows=CHUNK_ROWS):
+    """تدفق Arrow IPC: دفعة سجلات (record batch) لكل دفعة صفوف"""
+    import pyarrow as pa
+
+    schema = pa.Schema.from_pandas(df.iloc[:0], preserve_index=False)
+    with pa.ipc.new_stream(out, schema) as writer:
+        for chunk in _chunks(df, chunk_rows):
+            writer.write_batch(pa.RecordBatch.from_pandas(chunk, schema=schema, preserve_index=False))
+
+
+WRITERS = {
+    'csv': write_csv,
+    'parquet': write_parquet,
+    'arrow': write_arrow,
+}
+
+
+class ExportCache:
+    """ملفات التصدير على القرص حسب (المفتاح، الصيغة) مع حذف الأقدم عند تجاوز الحد"""
+
+    def __init__(self, directory=None, max_entries=16, chunk_rows=CHUNK_ROWS):
+        self.directory = directory or tempfile.mkdtemp(prefix='fleet-export-')
+        os.makedirs(self.directory, exist_ok=True)
+        self.max_entries = max_entries
+        self.chunk_rows = chunk_rows
+        self.stats = {'builds': 0, 'hits': 0, 'build_ms': 0.0}
+        self._paths = OrderedDict()
+        self._lock = threading.Lock()
+
+    def path(self, key, fmt, frame):
+        """مسار ملف التصدير - `frame` دالة تعطي الإطار ولا تُستدعى إلا عند البناء"""
+        full_key = (key, fmt)
+        with self._lock:
+            # ملف حُذف من خارج الذاكرة (تنظيف مجلد المؤقتات مثلاً) يُبنى من جديد
+            if full_key in self._paths and os.path.exists(self._paths[full_key]):
+                self._paths.move_to_end(full_key)
+                self.stats['hits'] += 1
+                return self._paths[full_key]
+        t0 = time.perf_counter()
+        fd, path = tempfile.mkstemp(suffix=EXPORT_FORMATS[fmt][2], dir=self.directory)
+        with os.fdopen(fd, 'wb') as out:
+            WRITERS[fmt](frame(), out, self.chunk_rows)
+        with self._lock:
+            self.stats['builds'] += 1
+            self.stats['build_ms'] += (time.perf_counter() - t0) * 1000
+            if full_key in self._paths and os.path.exists(self._paths[full_key]):
+                # بناء متزامن لنفس المفتاح من جلسة أخرى - نحتفظ بالأول
+                os.remove(path)
+                return self._paths[full_key]
+            self._paths[full_key] = path
+            self._paths.move_to_end(full_key)
+            while len(self._paths) > self.max_entries:
+                _, stale = self._paths.popitem(last=False)
+                if os.path.exists(stale):
+                    os.remove(stale)
+        return path
+
+    def read(self, key, fmt, frame):
+        """محتوى ملف التصدير بالبايت (يُبنى عند أول طلب)
+
+        القراءة تحت قفل الإخلاء فلا يُحذف الملف أثناءها، والملف الذي أخلته جلسة أخرى بين
+        إعطاء المسار وفتحه يُبنى من جديد.
+        """
+        while True:
+            path = self.path(key, fmt, frame)
+            with self._lock:
+                if os.path.exists(path):
+                    with open(path, 'rb') as f:
+                        return f.read()
+
+    def opener(self, key, fmt, frame):
+        """دالة بلا معاملات لـ st.download_button: تبني الملف عند النقر فقط
+
+        التقديم ليس تدفقاً: Streamlit يقرأ الناتج كاملاً في الذاكرة قبل إرساله، فالملف يُقرأ
+        بايتات هنا ويُغلق فوراً. ما يوفره القرص هو البناء على دفعات والحفظ لنفس المرشحات.
+        """
+        return lambda: self.read(key, fmt, frame)
+
+    def clear(self):
+        with self._lock:
+            self._paths.clear()
+            shutil.rmtree(self.directory, ignore_errors=True)
+            os.makedirs(self.directory, exist_ok=True)
@@ -0,0 +1,131 @@
+"""محرك المرشحات المفهرس للشريط الجانبي (المحافظة / الحالة / السعة)"""
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+# إذا تجاوزت المجموعة المرشحة هذه النسبة من الأسطول يكون القناع الكامل أسرع من الفهارس
+DENSE_FRACTION = 0.125
+
+
+class _CategoryIndex:
+    """أكواد الفئات لكل صف وقائمة صفوف مرتبة لكل قيمة"""
+
+    def __init__(self, column):
+        codes, uniques = pd.factorize(column, sort=False)
+        self.codes = codes.astype(np.int32, copy=False)
+        self.lookup = {value: i for i, value in enumerate(uniques)}
+        order = np.argsort(self.codes, kind='stable')
+        bounds = np.searchsorted(self.codes[order], np.arange(len(uniques) + 1))
+        self.rows = [order[bounds[i]:bounds[i + 1]] for i in range(len(uniques))]
+
+    def allowed(self, values):
+        """جدول منطقي صغير: هل الكود ضمن القيم المختارة؟"""
+        table = np.zeros(len(self.rows), dtype=bool)
+        table[[self.lookup[v] for v in values if v in self.lookup]] = True
+        return table
+
+    def size(self, table):
+        return sum(len(self.rows[i]) for i in np.flatnonzero(table))
+
+    def candidates(self, table):
+        parts = [self.rows[i] for i in np.flatnonzero(table)]
+        return np.sort(np.concatenate(parts)) if parts else np.empty(0, dtype=np.intp)
+
+
+class _RangeIndex:
+    """فهرس مرتب لعمود رقمي للإجابة على between بالبحث الثنائي"""
+
+    def __init__(self, column):
+        self.values = column.to_numpy()
+        self.order = np.argsort(self.values, kind='stable')
+        self.sorted = self.values[self.order]
+
+    def bounds(self, low, high):
+        return (np.searchsorted(self.sorted, low, side='left'),
+                np.searchsorted(self.sorted, high, side='right'))
+
+    def candidates(self, low, high):
+        lo, hi = self.bounds(low, high)
+        return np.sort(self.order[lo:hi])
+
+
+class FleetFilterIndex:
+    """فهارس مسبقة للمرشحات مع ذاكرة لأرقام الصفوف حسب مجموعة قيم المرشحات"""
+
+    def __init__(self, df, category_columns=('المحافظة', 'الحالة'), range_column='السعة', cache_size=32):
+        self.df = df
+        self.categories = {col: _CategoryIndex(df[col]) for col in category_columns}
+        self.range_column = range_column
+        self.range = _RangeIndex(df[range_column])
+        self.cache_size = cache_size
+        self._cache = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def values(self, column):
+        """القيم المتاحة لعمود فئوي بترتيب ظهورها (مثل unique)"""
+        return list(self.categories[column].lookup)
+
+    def value_bounds(self):
+        """أصغر وأكبر قيمة في عمود النطاق"""
+        return self.range.sorted[0], self.range.sorted[-1]
+
+    @staticmethod
+    def key(selections, value_range):
+        """مفتاح الذاكرة: ترتيب الاختيارات في الواجهة لا يغير النتيجة"""
+        return (tuple(frozenset(v) for v in selections), tuple(value_range))
+
+    def rows(self, selections, value_range):
+        """أرقام الصفوف المطابقة بالترتيب الأصلي"""
+        tables = [idx.allowed(values) for idx, values in zip(self.categories.values(), selections)]
+        low, high = value_range
+        lo, hi = self.range.bounds(low, high)
+
+        sizes = [idx.size(t) for idx, t in zip(self.categories.values(), tables)] + [hi - lo]
+        smallest = int(np.argmin(sizes))
+        n = len(self.df)
+
+        if sizes[smallest] > DENSE_FRACTION * n:
+            # مرشح واسع: قناع واحد عبر جداول الأكواد الصغيرة
+            mask = np.ones(n, dtype=bool)
+            for idx, table in zip(self.categories.values(), tables):
+                mask &= table[idx.codes]
+            values = self.range.values
+            mask &= (values >= low) & (values <= high)
+            return np.flatnonzero(mask)
+
+        # مرشح ضيق: نبدأ من أصغر مجموعة ونتحقق من باقي الشروط عليها فقط
+        if smallest < len(tables):
+            rows = list(self.categories.values())[smallest].candidates(tables[smallest])
+        else:
+            rows = self.range.candidates(low, high)
+        keep = np.ones(len(rows), dtype=bool)
+        for idx, table in zip(self.categories.values(), tables):
+            keep &= table[idx.codes[rows]]
+        values = self.range.values[rows]
+        keep &= (values >= low) & (values <= high)
+        return rows[keep]
+
+    def positions(self, selections, value_range):
+        """أرقام الصفوف المطابقة - محفوظة حسب قيم المرشحات"""
+        key = self.key(selections, value_range)
+        with self._lock:
+            if key in self._cache:
+                self.hits += 1
+                self._cache.move_to_end(key)
+                return self._cache[key]
+            self.misses += 1
+        result = self.rows(selections, value_range)
+        with self._lock:
+            self._cache[key] = result
+            if len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        return result
+
+    def filtered(self, selections, value_range, frame=None):
+        """الإطار المرشح من إطار الفهرس أو من نسخة أحدث بنفس الصفوف (قراءات حية)"""
+        frame = self.df if frame is None else frame
+        return frame.take(self.positions(selections, value_range))
@@ -0,0 +1,53 @@
+"""توليد بيانات أسطول مولدات ديني المحاكاة دفعة واحدة بعمليات NumPy"""
+import numpy as np
+import pandas as pd
+
+from fleet.alerts import evaluate_alerts
+from fleet.schema import (
+    FLEET_SCHEMA, GOVERNORATES, KVA_MAP, MODELS, SITES_PER_GOV, STATUSES, categorical
+)
+
+STATUS_PROBS = [0.65, 0.15, 0.15, 0.05]
+
+
+def generate_fleet(n=50, seed=42):
+    """توليد أسطول من n مولد - نفس البذرة ونفس الحجم يعطيان نفس البيانات دائماً"""
+    # مولد مستقل عن الحالة العامة لـ np.random وترتيب السحب ثابت لضمان الحتمية
+    rng = np.random.default_rng(seed)
+
+    gov_names = list(GOVERNORATES)
+    gov_lat = np.array([GOVERNORATES[g]['lat'] for g in gov_names])
+    gov_lon = np.array([GOVERNORATES[g]['lon'] for g in gov_names])
+    kva_by_model = np.array([KVA_MAP[m] for m in MODELS])
+
+    gov_idx = rng.integers(0, len(gov_names), n)
+    lat = gov_lat[gov_idx] + rng.uniform(-0.1, 0.1, n)
+    lon = gov_lon[gov_idx] + rng.uniform(-0.1, 0.1, n)
+
+    model_idx = rng.integers(0, len(MODELS), n)
+    kva = kva_by_model[model_idx]
+
+    revenue = np.round(rng.integers(8000, 45000, n) * (kva / 50), 2)
+    status_idx = rng.choice(len(STATUSES), n, p=STATUS_PROBS)
+    fuel = rng.integers(5, 100, n)
+    temp = rng.integers(65, 115, n)
+    hours = rng.integers(100, 5000, n)
+    site_idx = gov_idx * SITES_PER_GOV + rng.integers(0, SITES_PER_GOV, n)
+
+    # الأعمدة تُبنى مباشرة بأنواع المخطط: فئات من الأكواد وأرقام ضيقة
+    df = pd.DataFrame({
+        'معرف المولد': pd.array([f'DNY-{1000 + i}' for i in range(n)], dtype=FLEET_SCHEMA['معرف المولد']),
+        'الموديل': categorical(model_idx, 'الموديل'),
+        'السعة': kva.astype(FLEET_SCHEMA['السعة']),
+        'المحافظة': categorical(gov_idx, 'المحافظة'),
+        'lat': lat.astype(FLEET_SCHEMA['lat']),
+        'lon': lon.astype(FLEET_SCHEMA['lon']),
+        'الحالة': categorical(status_idx, 'الحالة'),
+        'الإيراد الشهري': revenue,
+        'الوقود %': fuel.astype(FLEET_SCHEMA['الوقود %']),
+        'الحرارة °C': temp.astype(FLEET_SCHEMA['الحرارة °C']),
+        'ساعات العمل': hours.astype(FLEET_SCHEMA['ساعات العمل']),
+        'الموقع': categorical(site_idx, 'الموقع')
+    })
+    df.insert(df.columns.get_loc('الموقع'), 'التنبيه', evaluate_alerts(df).labels())
+    return df
@@ -0,0 +1,188 @@
+"""تجميع مواقع المولدات في خلايا شبكية حسب مستوى التكبير بدل إرسال كل نقطة للخريطة"""
+import threading
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from fleet.alerts import alert_categories
+from fleet.schema import GOVERNORATES
+
+# أقل من هذا العدد تُرسل النقاط كما هي
+RAW_POINT_LIMIT = 2_000
+ZOOM_LEVELS = list(range(4, 11))
+DEFAULT_ZOOM = 5
+# ضلع الخلية بالدرجات عند التكبير 0 - يتضاعف التفصيل مع كل مستوى
+CELL_DEGREES_AT_ZOOM0 = 8.0
+KM_PER_DEGREE = 111.0
+# أكبر مستطيل خلايا يُجمع بمصفوفة كثيفة بدل الفرز
+DENSE_GROUP_LIMIT = 1 << 24
+
+# لون كل كود تنبيه (0 = لا يوجد) بنفس ألوان تقرير السلامة
+SEVERITY_COLORS = ['#00a8e8', '#ff6b6b', '#ffa500', '#ffd700', '#ff9999']
+
+
+def cell_degrees(zoom):
+    return CELL_DEGREES_AT_ZOOM0 / (1 << zoom)
+
+
+@dataclass(frozen=True)
+class GridBins:
+    """خلايا مشغولة فقط: مفتاح الخلية ومركز الثقل وعدد المولدات وتوزيع أكواد التنبيه"""
+    keys: np.ndarray
+    lat_sum: np.ndarray
+    lon_sum: np.ndarray
+    counts: np.ndarray
+    alerts: np.ndarray  # (خلية × كود تنبيه)
+    cell: float
+
+    @property
+    def total(self):
+        return int(self.counts.sum())
+
+    def __len__(self):
+        return len(self.keys)
+
+
+def _cells(lat, lon, cell):
+    """(صف، عمود) كل نقطة في الشبكة العالمية"""
+    return (np.floor((lat + 90) / cell).astype(np.int64),
+            np.floor((lon + 180) / cell).astype(np.int64))
+
+
+def _group(row, col, cell):
+    """(المفاتيح العالمية الفريدة، رقم الخلية لكل نقطة)
+
+    المفاتيح محلية داخل المستطيل المحيط بالنقاط، فإن كان صغيراً تُجمع عبر bincount كثيف
+    بدل الفرز، ثم تُحوّل الخلايا المشغولة إلى مفاتيح عالمية حتى تُدمج خلايا المحافظات.
+    """
+    if len(row) == 0:
+        return row, row
+    row0, col0 = row.min(), col.min()
+    width = int(col.max() - col0) + 1
+    local = (row - row0) * width + (col - col0)
+    span = int(local.max()) + 1
+    if span > DENSE_GROUP_LIMIT:
+        occupied, inverse = np.unique(local, return_inverse=True)
+    else:
+        occupied = np.flatnonzero(np.bincount(local, minlength=span))
+        lookup = np.empty(span, dtype=np.intp)
+        lookup[occupied] = np.arange(len(occupied))
+        inverse = lookup[local]
+    global_width = int(360 / cell) + 1
+    return (occupied // width + row0) * global_width + (occupied % width + col0), inverse
+
+
+def bin_points(lat, lon, alert_codes, zoom, n_codes=None):
+    """خلايا شبكة التكبير `zoom` لمجموعة نقاط - كل التجميع عبر bincount"""
+    n_codes = n_codes or len(alert_categories())
+    cell = cell_degrees(zoom)
+    keys, inverse = _group(*_cells(lat, lon, cell), cell)
+    size = len(keys)
+    alerts = np.bincount(inverse * n_codes + alert_codes.astype(np.int64), minlength=size * n_codes)
+    return GridBins(
+        keys=keys,
+        lat_sum=np.bincount(inverse, weights=lat, minlength=size),
+        lon_sum=np.bincount(inverse, weights=lon, minlength=size),
+        counts=np.bincount(inverse, minlength=size),
+        alerts=alerts.reshape(size, n_codes),
+        cell=cell,
+    )
+
+
+def merge_bins(parts):
+    """دمج خلايا محسوبة مسبقاً (محافظات متجاورة قد تتشارك خلايا)"""
+    parts = [p for p in parts if len(p)]
+    if len(parts) <= 1:
+        return parts[0] if parts else None
+    keys, inverse = np.unique(np.concatenate([p.keys for p in parts]), return_inverse=True)
+    size = len(keys)
+    alerts = np.zeros((size, parts[0].alerts.shape[1]), dtype=np.int64)
+    np.add.at(alerts, inverse, np.concatenate([p.alerts for p in parts]))
+    return GridBins(
+        keys=keys,
+        lat_sum=np.bincount(inverse, weights=np.concatenate([p.lat_sum for p in parts]), minlength=size),
+        lon_sum=np.bincount(inverse, weights=np.concatenate([p.lon_sum for p in parts]), minlength=size),
+        counts=np.bincount(inverse, weights=np.concatenate([p.counts for p in parts]), minlength=size).astype(np.int64),
+        alerts=alerts,
+        cell=parts[0].cell,
+    )
+
+
+def _with_alpha(colors, alpha):
+    return [f"{c}{int(a * 255):02x}" for c, a in zip(colors, alpha)]
+
+
+def bins_layer(bins):
+    """إطار st.map: مركز ثقل كل خلية، نصف قطر حسب العدد، ولون التنبيه الغالب وشفافية حسب نسبته"""
+    counts = np.maximum(bins.counts, 1)
+    alerted = bins.alerts[:, 1:].sum(axis=1)
+    dominant = np.where(alerted > 0, bins.alerts[:, 1:].argmax(axis=1) + 1, 0)
+    share = alerted / counts
+    radius = bins.cell * KM_PER_DEGREE * 1000 / 2 * np.sqrt(counts / counts.max())
+    return pd.DataFrame({
+        'latitude': bins.lat_sum / counts,
+        'longitude': bins.lon_sum / counts,
+        'size': np.maximum(radius, bins.cell * KM_PER_DEGREE * 1000 / 10),
+        'color': _with_alpha(np.array(SEVERITY_COLORS)[dominant], 0.35 + 0.6 * share),
+        'العدد': bins.counts,
+        'تنبيهات': alerted,
+    })
+
+
+def points_layer(df, zoom):
+    """النقاط كما هي ملونة حسب كود التنبيه - لأعداد صغيرة فقط"""
+    codes = df['التنبيه'].cat.codes.to_numpy()
+    return pd.DataFrame({
+        'latitude': df['lat'].to_numpy(dtype=np.float64),
+        'longitude': df['lon'].to_numpy(dtype=np.float64),
+        'size': np.full(len(df), cell_degrees(zoom) * KM_PER_DEGREE * 1000 / 8),
+        'color': np.array(SEVERITY_COLORS)[codes],
+    })
+
+
+class GeoIndex:
+    """خلايا كل محافظة لكل مستوى تكبير تُحسب عند الطلب الأول ثم تُعاد استخدامها"""
+
+    def __init__(self, df):
+        self.df = df
+        codes = df['المحافظة'].cat.codes.to_numpy()
+        order = np.argsort(codes, kind='stable')
+        bounds = np.searchsorted(codes[order], np.arange(len(GOVERNORATES) + 1))
+        self.rows = {gov: order[bounds[i]:bounds[i + 1]] for i, gov in enumerate(df['المحافظة'].cat.categories)}
+        self._lat = df['lat'].to_numpy()
+        self._lon = df['lon'].to_numpy()
+        self._alerts = df['التنبيه'].cat.codes.to_numpy()
+        self._bins = {}
+        self._lock = threading.Lock()
+
+    def governorate_bins(self, gov, zoom):
+        key = (gov, zoom)
+        with self._lock:
+            bins = self._bins.get(key)
+        if bins is None:
+            rows = self.rows[gov]
+            bins = bin_points(self._lat[rows], self._lon[rows], self._alerts[rows], zoom)
+            with self._lock:
+                bins = self._bins.setdefault(key, bins)
+        return bins
+
+    def precompute(self, zooms=ZOOM_LEVELS):
+        for gov in self.rows:
+            for zoom in zooms:
+                self.governorate_bins(gov, zoom)
+        return self
+
+    def layer(self, governorates, zoom, frame=None):
+        """طبقة الخريطة: المحافظات كاملة من الخلايا المحفوظة، أو إطار مرشح بقيود أخرى يُجمع مباشرة"""
+        if frame is None:
+            count = sum(len(self.rows[g]) for g in governorates)
+            if count <= RAW_POINT_LIMIT:
+                rows = np.concatenate([self.rows[g] for g in governorates]) if governorates else np.empty(0, np.intp)
+                return points_layer(self.df.take(rows), zoom), count, False
+            return bins_layer(merge_bins([self.governorate_bins(g, zoom) for g in governorates])), count, True
+        if len(frame) <= RAW_POINT_LIMIT:
+            return points_layer(frame, zoom), len(frame), False
+        bins = bin_points(frame['lat'].to_numpy(), frame['lon'].to_numpy(),
+                          frame['التنبيه'].cat.codes.to_numpy(), zoom)
+        return bins_layer(bins), len(frame), True
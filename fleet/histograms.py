@@ -0,0 +1,100 @@
+"""توزيعات الحرارة والوقود محسوبة مسبقاً: عدد المولدات لكل قيمة صحيحة لكل مجموعة مرشحات
+
+المجموعات هي أبعاد الشريط الجانبي (المحافظة × الحالة × السعة)، فتوزيع أي حالة مرشحات
+جمع محاور صغيرة لا يمر على الصفوف، والقراءات الحية تعدّل العدادات لصفوفها فقط
+(طرح القيمة القديمة وإضافة الجديدة) فتكلفة الرسم والتحديث مستقلة عن حجم الأسطول.
+"""
+import threading
+
+import numpy as np
+
+from fleet.cube import _axis
+
+HISTOGRAM_GROUPS = ('المحافظة', 'الحالة', 'السعة')
+
+# اسم المقياس ← (عمود الإطار، أدنى قيمة، أعلى قيمة) - القيم خارج المدى تُقص إلى حدوده
+HISTOGRAM_METRICS = {
+    'fuel': ('الوقود %', 0, 100),
+    'temp': ('الحرارة °C', 40, 130),
+}
+
+DISPLAY_BINS = 15
+
+
+class BinnedHistograms:
+    """مصفوفة (مجموعة × قيمة) لكل مقياس مع نسخة القيم الحالية لكل مولد"""
+
+    def __init__(self, df, groups=HISTOGRAM_GROUPS, metrics=HISTOGRAM_METRICS):
+        axes = [_axis(df[dim]) for dim in groups]
+        self.labels = {dim: labels for dim, (_, labels) in zip(groups, axes)}
+        self.shape = tuple(len(labels) for _, labels in axes)
+        self.group = np.ravel_multi_index([codes for codes, _ in axes], self.shape)
+        self.metrics = metrics
+        self.values = {}
+        self.counts = {}
+        for name, (column, low, high) in metrics.items():
+            values = np.clip(df[column].to_numpy(), low, high).astype(np.int16)
+            self.values[name] = values
+            self.counts[name] = self._bincount(name, self.group, values)
+        self.version = 0
+        self._lock = threading.Lock()
+
+    def _width(self, metric):
+        _, low, high = self.metrics[metric]
+        return high - low + 1
+
+    def _bincount(self, metric, group, values):
+        width = self._width(metric)
+        low = self.metrics[metric][1]
+        flat = group * width + (values.astype(np.intp) - low)
+        return np.bincount(flat, minlength=int(np.prod(self.shape)) * width).reshape(self.shape + (width,))
+
+    def update(self, rows, values):
+        """قراءات جديدة لمولدات محددة (صف واحد لكل مولد) - تُعدّل عدادات مجموعاتها فقط"""
+        group = self.group[rows]
+        with self._lock:
+            for name, new in values.items():
+                if name not in self.metrics:
+                    continue
+                _, low, high = self.metrics[name]
+                new = np.clip(new, low, high).astype(np.int16)
+                counts = self.counts[name].reshape(-1, self._width(name))
+                old = self.values[name][rows]
+                np.subtract.at(counts, (group, old - low), 1)
+                np.add.at(counts, (group, new - low), 1)
+                self.values[name][rows] = new
+            self.version += 1
+
+    def apply_messages(self, messages, timestamp=None):
+        """مشترك في IngestPipeline.on_batch: آخر رسالة لكل مولد داخل الدفعة هي التي تُحتسب"""
+        _, first = np.unique(messages[::-1, 0], return_index=True)
+        latest = messages[len(messages) - 1 - first]
+        self.update(latest[:, 0], {'fuel': latest[:, 1], 'temp': latest[:, 2]})
+
+    def distribution(self, metric, value_range=None, **selections):
+        """عدد المولدات لكل قيمة صحيحة ضمن حالة المرشحات"""
+        index = []
+        for dim, labels in self.labels.items():
+            if dim in selections:
+                wanted = set(selections[dim])
+                index.append([i for i, label in enumerate(labels) if label in wanted])
+            elif dim == 'السعة' and value_range is not None:
+                low, high = value_range
+                index.append([i for i, v in enumerate(labels) if low <= v <= high])
+            else:
+                index.append(list(range(len(labels))))
+        with self._lock:
+            block = self.counts[metric][np.ix_(*index)]
+        return block.reshape(-1, block.shape[-1]).sum(axis=0)
+
+    def binned(self, metric, bins=DISPLAY_BINS, value_range=None, **selections):
+        """(بداية كل فئة، عرض الفئة، العدد) بفئات متساوية على مدى القيم الموجودة فعلاً"""
+        counts = self.distribution(metric, value_range, **selections)
+        low = self.metrics[metric][1]
+        present = np.flatnonzero(counts)
+        if len(present) == 0:
+            return np.empty(0), 1, np.empty(0, dtype=np.int64)
+        first, last = present[0], present[-1]
+        width = max(1, -(-(last - first + 1) // bins))
+        starts = np.arange(first, last + 1, width)
+        return starts + low, width, np.add.reduceat(counts[first:last + 1], starts - first)
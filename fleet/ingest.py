@@ -0,0 +1,351 @@
+"""خط استقبال القراءات الحية بـ asyncio: مصدر محلي ← طابور محدود ← دفعات ← لقطة متسقة
+
+صيغة الرسالة سطر نصي واحد: ``رقم_المولد,الوقود,الحرارة,الساعات``
+
+المحاكي كعملية منفصلة يرسل إلى منفذ محلي أو يكتب في ملف تتابعه اللوحة:
+    python -m fleet.ingest --tcp 127.0.0.1:9009 --fleet-size 50 --rate 2000
+    python -m fleet.ingest --file /tmp/telemetry.csv --fleet-size 50 --rate 2000
+"""
+import argparse
+import asyncio
+import io
+import os
+import socket
+import threading
+import time
+from dataclasses import dataclass
+
+import numpy as np
+
+from fleet.alerts import evaluate_alerts
+from fleet.schema import FLEET_SCHEMA
+
+# حقول الرسالة بعد رقم المولد ← عمود الإطار
+MESSAGE_FIELDS = {
+    'fuel': 'الوقود %',
+    'temp': 'الحرارة °C',
+    'hours': 'ساعات العمل',
+}
+# المدى المقبول لكل حقل (شاملاً) - القراءة خارجه تُسقط قبل أن تصل للإطار والعدادات
+MESSAGE_RANGES = {
+    'fuel': (0, 100),
+    'temp': (0, 200),
+    'hours': (0, np.iinfo(np.int32).max),
+}
+
+
+def encode_messages(rows, fuel, temp, hours):
+    """ترميز دفعة قراءات إلى أسطر نصية"""
+    lines = '\n'.join(f"{r},{f},{t},{h}" for r, f, t, h in zip(
+        rows.tolist(), fuel.tolist(), temp.tolist(), hours.tolist()))
+    return (lines + '\n').encode() if lines else b''
+
+
+def decode_messages(buf):
+    """فك ترميز كتلة أسطر كاملة إلى مصفوفة (رسالة × 4) في استدعاء واحد
+
+    الأسطر التالفة (نص غير رقمي أو عدد حقول غير 4) تُسقط، فيكون عدد الصفوف أقل من عدد الأسطر.
+    """
+    if not buf:
+        return np.empty((0, 4), dtype=np.int64)
+    try:
+        messages = np.loadtxt(io.BytesIO(buf), delimiter=',', dtype=np.int64, ndmin=2)
+        if messages.shape[1] == 4:
+            return messages
+    except ValueError:
+        pass
+    return _decode_lines(buf)
+
+
+def _decode_lines(buf):
+    """المسار البطيء عند وجود أسطر تالفة: سطراً سطراً مع إسقاط ما لا يُقرأ"""
+    rows = []
+    for line in buf.splitlines():
+        fields = line.split(b',')
+        if len(fields) != 4:
+            continue
+        try:
+            rows.append([int(f) for f in fields])
+        except ValueError:
+            continue
+    return np.array(rows, dtype=np.int64).reshape(-1, 4)
+
+
+def simulate_messages(rng, n_generators, count):
+    """دفعة رسائل محاكاة لمولدات عشوائية"""
+    return encode_messages(
+        rng.integers(0, n_generators, count),
+        rng.integers(5, 100, count),
+        rng.integers(65, 115, count),
+        rng.integers(100, 5000, count),
+    )
+
+
+# ========================
+# المصادر المحلية - كل مصدر مولد غير متزامن يعطي كتلاً من أسطر كاملة
+# ========================
+async def simulated_source(n_generators, rate=None, batch=5000, seed=None):
+    """محاكي داخل العملية - rate=None يعني أقصى سرعة يسمح بها المستهلك"""
+    rng = np.random.default_rng(seed)
+    started = time.perf_counter()
+    sent = 0
+    while True:
+        yield simulate_messages(rng, n_generators, batch)
+        sent += batch
+        if rate:
+            delay = sent / rate - (time.perf_counter() - started)
+            await asyncio.sleep(max(delay, 0))
+        else:
+            await asyncio.sleep(0)
+
+
+async def file_tail_source(path, poll_interval=0.2, from_start=False):
+    """متابعة ملف يُكتب إليه (مثل tail -f) مع الاحتفاظ بالسطر غير المكتمل"""
+    while not os.path.exists(path):
+        await asyncio.sleep(poll_interval)
+    with open(path, 'rb') as f:
+        if not from_start:
+            f.seek(0, os.SEEK_END)
+        pending = b''
+        while True:
+            data = f.read(1 << 20)
+            if not data:
+                await asyncio.sleep(poll_interval)
+                continue
+            pending += data
+            cut = pending.rfind(b'\n') + 1
+            if cut:
+                yield pending[:cut]
+                pending = pending[cut:]
+
+
+async def socket_source(host='127.0.0.1', port=9009, max_pending=64):
+    """خادم TCP محلي - امتلاء الطابور يوقف القراءة من المقبس فينتقل الضغط للمرسل"""
+    chunks = asyncio.Queue(maxsize=max_pending)
+
+    async def handle(reader, writer):
+        pending = b''
+        while data := await reader.read(1 << 16):
+            pending += data
+            cut = pending.rfind(b'\n') + 1
+            if cut:
+                await chunks.put(pending[:cut])
+                pending = pending[cut:]
+        writer.close()
+
+    server = await asyncio.start_server(handle, host, port)
+    async with server:
+        while True:
+            yield await chunks.get()
+
+
+def make_source(spec, n_generators):
+    """المصدر من نص الإعداد: simulate[:RATE] أو file:PATH أو tcp:HOST:PORT"""
+    kind, _, arg = spec.partition(':')
+    if kind == 'simulate':
+        rate = float(arg) if arg else None
+        # عشر دفعات في الثانية عند تحديد معدل حتى تصل القراءات بانتظام
+        return simulated_source(n_generators, rate=rate, batch=max(1, int(rate // 10)) if rate else 5000)
+    if kind == 'file':
+        return file_tail_source(arg)
+    if kind == 'tcp':
+        host, _, port = arg.rpartition(':')
+        return socket_source(host or '127.0.0.1', int(port))
+    raise ValueError(f"مصدر قراءات غير معروف: {spec}")
+
+
+# ========================
+# اللقطة والخط
+# ========================
+@dataclass(frozen=True)
+class FleetSnapshot:
+    """لقطة ثابتة لآخر القراءات - تُستبدل كاملة ولا تُعدل أبداً"""
+    version: int
+    fuel: np.ndarray
+    temp: np.ndarray
+    hours: np.ndarray
+    updated_at: float
+    messages: int
+
+    def apply(self, df):
+        """إطار الأسطول بعد دمج القراءات الحية وإعادة تقييم التنبيهات"""
+        live = df.copy(deep=False)
+        for field, column in MESSAGE_FIELDS.items():
+            live[column] = getattr(self, field).astype(FLEET_SCHEMA[column], copy=False)
+        live['التنبيه'] = evaluate_alerts(live).labels()
+        return live
+
+
+class IngestPipeline:
+    """منتج ومستهلك على حلقة asyncio في خيط خلفي - اللوحة تقرأ اللقطة دون انتظار"""
+
+    def __init__(self, df, source, max_pending=64, batch_messages=20_000, flush_interval=0.25, on_batch=()):
+        self.n = len(df)
+        self.source = source
+        self.max_pending = max_pending
+        self.batch_messages = batch_messages
+        self.flush_interval = flush_interval
+        self.on_batch = list(on_batch)
+        # الحالة بأنواع المخطط الضيقة حتى يكون نسخ اللقطة رخيصاً
+        self._state = {field: df[column].to_numpy().astype(FLEET_SCHEMA[column])
+                       for field, column in MESSAGE_FIELDS.items()}
+        self._snapshot = self._publish(version=0, messages=0)
+        self.stats = {'received': 0, 'applied': 0, 'dropped': 0, 'batches': 0, 'errors': 0,
+                      'max_depth': 0, 'blocked_seconds': 0.0}
+        self.last_error = None
+        self._loop = None
+        self._started = threading.Event()
+        self._thread = None
+        self._stopping = None
+
+    def snapshot(self):
+        """آخر لقطة متسقة - مجرد قراءة مرجع فلا تنتظر خيط الاستقبال"""
+        return self._snapshot
+
+    def _publish(self, version, messages, updated_at=None):
+        return FleetSnapshot(
+            version=version,
+            fuel=self._state['fuel'].copy(),
+            temp=self._state['temp'].copy(),
+            hours=self._state['hours'].copy(),
+            updated_at=time.time() if updated_at is None else updated_at,
+            messages=messages,
+        )
+
+    def apply_batch(self, messages):
+        """دمج دفعة رسائل: آخر قراءة لكل مولد داخل الدفعة هي التي تبقى
+
+        الرسالة برقم مولد أو قيمة خارج MESSAGE_RANGES تُسقط. المشتركون يستلمون الدفعة قبل نشر
+        اللقطة - كل منهم على حدة فلا يوقف فشل أحدهم الباقين - فلا تسبق اللقطة المنشورة عداداتهم.
+        """
+        rows = messages[:, 0]
+        valid = (rows >= 0) & (rows < self.n)
+        for i, field in enumerate(MESSAGE_FIELDS):
+            low, high = MESSAGE_RANGES[field]
+            valid &= (messages[:, i + 1] >= low) & (messages[:, i + 1] <= high)
+        self.stats['dropped'] += int(len(rows) - np.count_nonzero(valid))
+        messages = messages[valid]
+        # إزالة التكرار مع الاحتفاظ بآخر ظهور لكل مولد
+        reversed_rows = messages[::-1, 0]
+        _, first = np.unique(reversed_rows, return_index=True)
+        latest = messages[len(messages) - 1 - first]
+        rows = latest[:, 0]
+        values = {field: latest[:, i + 1] for i, field in enumerate(MESSAGE_FIELDS)}
+        for field, column in values.items():
+            self._state[field][rows] = column
+        updated_at = time.time()
+        # المشتركون يستلمون كل الرسائل الصالحة بترتيب وصولها (لا آخر قيمة فقط)
+        for callback in self.on_batch:
+            try:
+                callback(messages, updated_at)
+            except Exception as exc:
+                self.stats['errors'] += 1
+                self.last_error = repr(exc)
+        snapshot = self._snapshot
+        self._snapshot = self._publish(snapshot.version + 1, snapshot.messages + len(messages), updated_at)
+        self.stats['applied'] += len(messages)
+        self.stats['batches'] += 1
+
+    def submit(self, messages, timeout=5):
+        """دفعة من خارج المصدر (مثل زر التحديث) تُدمج على خيط الحلقة بالترتيب مع دفعات المصدر
+        فتصل للمشتركين وللقطة نفسها - تعيد اللقطة بعد الدمج"""
+        async def apply():
+            self.apply_batch(messages)
+        asyncio.run_coroutine_threadsafe(apply(), self._loop).result(timeout)
+        return self._snapshot
+
+    async def _produce(self, queue):
+        async for chunk in self.source:
+            if queue.full():
+                # الضغط العكسي: المصدر ينتظر حتى يفرغ المستهلك مكاناً
+                t0 = time.perf_counter()
+                await queue.put(chunk)
+                self.stats['blocked_seconds'] += time.perf_counter() - t0
+            else:
+                queue.put_nowait(chunk)
+            self.stats['max_depth'] = max(self.stats['max_depth'], queue.qsize())
+
+    async def _consume(self, queue):
+        pending, count = [], 0
+        while True:
+            try:
+                chunk = await asyncio.wait_for(queue.get(), timeout=self.flush_interval)
+                lines = chunk.count(b'\n')
+                pending.append(chunk)
+                count += lines
+                self.stats['received'] += lines
+            except asyncio.TimeoutError:
+                pass
+            if pending and (count >= self.batch_messages or queue.empty()):
+                # دفعة فاشلة تُحسب وتُسقط ولا توقف المستهلك - المصادر الخارجية قد ترسل أي شيء
+                try:
+                    messages = decode_messages(b''.join(pending))
+                    self.stats['dropped'] += count - len(messages)
+                    if len(messages):
+                        self.apply_batch(messages)
+                except Exception as exc:
+                    self.stats['errors'] += 1
+                    self.last_error = repr(exc)
+                pending, count = [], 0
+
+    async def run(self):
+        self._stopping = asyncio.Event()
+        queue = asyncio.Queue(maxsize=self.max_pending)
+        tasks = [asyncio.create_task(self._produce(queue)), asyncio.create_task(self._consume(queue))]
+        await self._stopping.wait()
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    def start(self):
+        """تشغيل الحلقة في خيط خلفي مستقل عن خيط Streamlit - يعود بعد إنشاء الحلقة فيصح submit فوراً"""
+        def target():
+            self._loop = asyncio.new_event_loop()
+            self._started.set()
+            self._loop.run_until_complete(self.run())
+            self._loop.close()
+
+        self._thread = threading.Thread(target=target, name='fleet-ingest', daemon=True)
+        self._thread.start()
+        self._started.wait()
+        return self
+
+    def stop(self, timeout=5):
+        if self._loop and self._stopping:
+            self._loop.call_soon_threadsafe(self._stopping.set)
+        if self._thread:
+            self._thread.join(timeout)
+
+
+def _run_simulator(args):
+    """عملية محاكاة مستقلة تكتب إلى منفذ TCP أو ملف بالمعدل المطلوب"""
+    rng = np.random.default_rng(args.seed)
+    batch = max(1, int(args.rate // 10))
+    if args.tcp:
+        host, _, port = args.tcp.rpartition(':')
+        out = socket.create_connection((host or '127.0.0.1', int(port)))
+        write = out.sendall
+    else:
+        out = open(args.file, 'ab', buffering=0)
+        write = out.write
+    started, sent = time.perf_counter(), 0
+    try:
+        while True:
+            write(simulate_messages(rng, args.fleet_size, batch))
+            sent += batch
+            time.sleep(max(sent / args.rate - (time.perf_counter() - started), 0))
+    except (KeyboardInterrupt, BrokenPipeError):
+        pass
+    finally:
+        out.close()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="محاكي قراءات مولدات ديني")
+    target = parser.add_mutually_exclusive_group(required=True)
+    target.add_argument('--tcp', help="HOST:PORT")
+    target.add_argument('--file', help="مسار ملف تتابعه اللوحة")
+    parser.add_argument('--fleet-size', type=int, default=50)
+    parser.add_argument('--rate', type=float, default=1000, help="رسالة في الثانية")
+    parser.add_argument('--seed', type=int, default=None)
+    _run_simulator(parser.parse_args())
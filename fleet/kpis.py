@@ -0,0 +1,74 @@
+"""حساب مقاييس الأسطول الرئيسية في تمريرة واحدة دون نسخ إطارات مرشحة"""
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+
+@dataclass(frozen=True)
+class FleetKPIs:
+    """المقاييس المشتركة بين رأس الصفحة والتبويبات والتذييل"""
+    count: int
+    total_revenue: float
+    total_capacity: float
+    avg_fuel: float
+    avg_temp: float
+    avg_hours: float
+    active_count: int
+    maintenance_count: int
+    maintenance_capacity: float
+    down_or_transit_count: int
+    critical_alerts: int
+    low_fuel_count: int
+    high_temp_count: int
+    overhaul_count: int
+
+    @property
+    def utilization(self):
+        return (self.active_count / self.count * 100) if self.count > 0 else 0
+
+    @property
+    def avg_revenue(self):
+        return self.total_revenue / self.count if self.count > 0 else 0
+
+    @property
+    def avg_capacity(self):
+        return self.total_capacity / self.count if self.count > 0 else 0
+
+
+def _mean(total, count):
+    return total / count if count > 0 else float('nan')
+
+
+def _value_counts(column):
+    """عدد الصفوف لكل قيمة - عبر أكواد الفئات إن وجدت"""
+    if isinstance(column.dtype, pd.CategoricalDtype):
+        counts = np.bincount(column.cat.codes.to_numpy() + 1, minlength=len(column.cat.categories) + 1)[1:]
+        return dict(zip(column.cat.categories, counts.tolist()))
+    return column.value_counts(sort=False).to_dict()
+
+
+def compute_kpis(df, alerts):
+    """تمريرة واحدة على أعمدة الإطار المرشح وأقنعة التنبيهات المحسوبة مسبقاً"""
+    n = len(df)
+    status = _value_counts(df['الحالة'])
+    fuel_total = float(df['الوقود %'].to_numpy().sum(dtype=np.int64))
+    temp_total = float(df['الحرارة °C'].to_numpy().sum(dtype=np.int64))
+    hours_total = float(df['ساعات العمل'].to_numpy().sum(dtype=np.int64))
+    capacity = df['السعة'].to_numpy()
+    return FleetKPIs(
+        count=n,
+        total_revenue=float(df['الإيراد الشهري'].to_numpy().sum(dtype=np.float64)),
+        total_capacity=float(capacity.sum(dtype=np.int64)),
+        avg_fuel=_mean(fuel_total, n),
+        avg_temp=_mean(temp_total, n),
+        avg_hours=_mean(hours_total, n),
+        active_count=int(status.get('نشط', 0)),
+        maintenance_count=int(status.get('صيانة', 0)),
+        maintenance_capacity=float(capacity.sum(where=alerts.masks['maintenance'], dtype=np.int64)),
+        down_or_transit_count=int(status.get('معطل', 0) + status.get('في الطريق', 0)),
+        critical_alerts=int(np.count_nonzero(alerts.active)),
+        low_fuel_count=alerts.count('fuel_watch'),
+        high_temp_count=alerts.count('high_temp'),
+        overhaul_count=alerts.count('overhaul'),
+    )
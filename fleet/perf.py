@@ -0,0 +1,213 @@
+"""أدوات الأداء للوحة: ذاكرة نتائج الأقسام حسب مدخلاتها، وعدّاد الأقسام المعاد حسابها،
+ومقاطع زمنية مسماة لكل تشغيل مع تنميط اختياري (cProfile أو tracemalloc)"""
+import cProfile
+import json
+import os
+import pstats
+import threading
+import time
+import tracemalloc
+from collections import OrderedDict, deque
+from contextlib import contextmanager
+
+import numpy as np
+import pandas as pd
+
+PROFILE_MODES = {
+    'cprofile': "cProfile - أعلى الدوال زمناً",
+    'tracemalloc': "tracemalloc - ذروة الذاكرة وأكبر المخصصات",
+}
+
+
+def _nbytes(value):
+    """حجم تقريبي لنتيجة قسم: الإطارات والمصفوفات وما له nbytes، داخل الصفوف والقواميس"""
+    if isinstance(value, pd.DataFrame):
+        return int(value.memory_usage(index=True, deep=True).sum())
+    if isinstance(value, pd.Series):
+        return int(value.memory_usage(index=True, deep=True))
+    if isinstance(value, (tuple, list)):
+        return sum(_nbytes(v) for v in value)
+    if isinstance(value, dict):
+        return sum(_nbytes(v) for v in value.values())
+    nbytes = getattr(value, 'nbytes', 0)
+    return nbytes if isinstance(nbytes, (int, np.integer)) else 0
+
+
+class SectionCache:
+    """ذاكرة LRU مشتركة بين الجلسات: (القسم، مفتاح المدخلات) ← نتيجة الحساب
+
+    الحد بعدد المدخلات وبحجمها معاً: إطار مرشح لمليون صف نحو 50 MB، فالعدد وحده لا يكفي.
+    آخر نتيجة تبقى دائماً حتى لو تجاوزت الحد وحدها.
+    """
+
+    def __init__(self, max_entries=128, max_bytes=512 * 1024 ** 2):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.nbytes = 0
+        self._entries = OrderedDict()
+        self._sizes = {}
+        self._lock = threading.Lock()
+
+    def get(self, section, key, build):
+        """النتيجة ومعها هل أُعيد حسابها الآن (True) أم أُخذت من الذاكرة (False)"""
+        full_key = (section, key)
+        with self._lock:
+            if full_key in self._entries:
+                self._entries.move_to_end(full_key)
+                return self._entries[full_key], False
+        value = build()
+        size = _nbytes(value)
+        with self._lock:
+            if full_key in self._entries:
+                self.nbytes -= self._sizes[full_key]
+            self._entries[full_key] = value
+            self._entries.move_to_end(full_key)
+            self._sizes[full_key] = size
+            self.nbytes += size
+            while len(self._entries) > 1 and (len(self._entries) > self.max_entries or self.nbytes > self.max_bytes):
+                old, _ = self._entries.popitem(last=False)
+                self.nbytes -= self._sizes.pop(old)
+        return value, True
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._sizes.clear()
+            self.nbytes = 0
+
+
+class RunProfiler:
+    """تنميط تشغيل واحد: يبدأ مع التشغيل ويُلخص عند نهايته في جدول صغير قابل للتخزين"""
+
+    # tracemalloc عام للعملية كلها - جلسة واحدة فقط تتتبع الذاكرة في أي وقت
+    _tracing_lock = threading.Lock()
+
+    def __init__(self, mode, top=15):
+        self.mode = mode
+        self.top = top
+        self._profile = None
+        self._tracing = False
+
+    def start(self):
+        if self.mode == 'cprofile':
+            self._profile = cProfile.Profile()
+            self._profile.enable()
+        elif self.mode == 'tracemalloc' and not tracemalloc.is_tracing():
+            self._tracing = self._tracing_lock.acquire(blocking=False)
+            if self._tracing:
+                tracemalloc.start()
+        return self
+
+    def stop(self):
+        """ملخص التنميط: {'mode', 'rows', ...} أو None إن لم يبدأ"""
+        if self._profile is not None:
+            self._profile.disable()
+            return {'mode': self.mode, 'rows': self._cprofile_rows()}
+        if self._tracing:
+            try:
+                _, peak = tracemalloc.get_traced_memory()
+                stats = tracemalloc.take_snapshot().statistics('lineno')[:self.top]
+            finally:
+                tracemalloc.stop()
+                self._tracing_lock.release()
+            return {
+                'mode': self.mode,
+                'peak_mb': peak / 1024 ** 2,
+                'rows': [
+                    {'الموقع': f"{os.path.basename(s.traceback[0].filename)}:{s.traceback[0].lineno}",
+                     'الحجم KB': round(s.size / 1024, 1), 'العدد': s.count}
+                    for s in stats
+                ],
+            }
+        return None
+
+    def _cprofile_rows(self):
+        stats = pstats.Stats(self._profile).stats
+        top = sorted(stats.items(), key=lambda item: item[1][3], reverse=True)[:self.top]
+        return [
+            {'الدالة': f"{func} ({os.path.basename(filename)}:{line})", 'الاستدعاءات': calls,
+             'الذاتي (مللي ث)': round(own * 1000, 2), 'التراكمي (مللي ث)': round(cumulative * 1000, 2)}
+            for (filename, line, func), (_, calls, own, cumulative, _) in top
+        ]
+
+
+class SectionTracker:
+    """سجل آخر التشغيلات: أي الأقسام أُعيد حسابها وأيها أُخذ من الذاكرة، وزمن كل مقطع"""
+
+    FULL = 'كامل'
+    PARTIAL = 'جزئي'
+
+    def __init__(self, history=20, log_path=None):
+        self.runs = deque(maxlen=history)
+        self.total = 0
+        self.log_path = log_path
+        self._current = None
+        self._spans = []
+        self._profiler = None
+
+    def begin_run(self, kind=FULL, profile=None):
+        # تشغيل سابق لم يُغلق يُغلق أولاً فلا يبقى منمِّطه يعمل ولا تختلط مقاطعه بالتشغيل الجديد
+        if self._current is not None:
+            self.end_run()
+        self.total += 1
+        self._current = {'run': self.total, 'kind': kind, 'at': time.time(), 'computed': [], 'reused': [],
+                         'spans': {}, 'started': time.perf_counter()}
+        self._spans = []
+        self._profiler = RunProfiler(profile).start() if profile else None
+
+    @contextmanager
+    def run(self, kind=FULL, profile=None):
+        """تشغيل كامل تُغلقه end_run دائماً - حتى مع st.rerun أو st.stop أو استثناء داخل الصفحة"""
+        self.begin_run(kind, profile)
+        try:
+            yield self
+        finally:
+            self.end_run()
+
+    def end_run(self):
+        if self._current is None:
+            return
+        run = self._current
+        run['ms'] = (time.perf_counter() - run.pop('started')) * 1000
+        if self._profiler is not None:
+            run['profile'] = self._profiler.stop()
+            self._profiler = None
+        self.runs.append(run)
+        self._current = None
+        if self.log_path:
+            with open(self.log_path, 'a', encoding='utf-8') as out:
+                out.write(json.dumps(run, ensure_ascii=False) + '\n')
+
+    @contextmanager
+    def span(self, name):
+        """مقطع زمني مسمى داخل التشغيل - المقاطع المتداخلة تُسمى بمسارها والمتكررة تُجمع"""
+        self._spans.append(name)
+        path = ' › '.join(self._spans)
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            self._spans.pop()
+            if self._current is not None:
+                spans = self._current['spans']
+                spans[path] = spans.get(path, 0.0) + (time.perf_counter() - t0) * 1000
+
+    def begin_section(self, name):
+        """بداية قسم - إذا لم يكن هناك تشغيل كامل مفتوح فهذا تشغيل جزئي للقسم وحده"""
+        if self._current is not None:
+            return False
+        self.begin_run(f"{self.PARTIAL}: {name}")
+        return True
+
+    def record(self, name, computed):
+        if self._current is None:
+            self.begin_run(f"{self.PARTIAL}: {name}")
+        self._current['computed' if computed else 'reused'].append(name)
+
+    @property
+    def last(self):
+        return self.runs[-1] if self.runs else None
+
+    def to_jsonl(self):
+        """التشغيلات المحفوظة سطر JSON لكل تشغيل - للتحليل خارج اللوحة"""
+        return ''.join(json.dumps(run, ensure_ascii=False) + '\n' for run in self.runs)
@@ -0,0 +1,303 @@
+"""التقارير الخمسة: بناؤها من المكعب والمقاييس، وتوليدها دفعة واحدة لكل المحافظات
+
+دوال البناء لا تعتمد على Streamlit فيستخدمها تبويب التقارير في اللوحة والتوليد الليلي معاً.
+التوليد الليلي يوزع أزواج (المحافظة، التقرير) على مجمع عمليات: كل عملية تولّد الأسطول
+(أو تقرؤه من القاعدة) وتبني المكعب مرة واحدة عند بدئها، ثم تكتب لكل تقرير ملف Markdown
+وملفات CSV لجداوله وصفحة HTML بجداوله ومخططاته (وصور PNG إن وُجدت kaleido).
+
+التشغيل من جذر المستودع:
+    python -m fleet.reports --out reports --workers 4
+    python -m fleet.reports --out reports --db data/fleet.sqlite --fleet-size 1000000
+"""
+import argparse
+import functools
+import html
+import os
+import textwrap
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime
+
+import pandas as pd
+
+from fleet.alerts import evaluate_alerts
+from fleet.cube import FleetCube
+from fleet.generator import generate_fleet
+from fleet.kpis import compute_kpis
+from fleet.schema import GOVERNORATES
+
+# اسم التقرير ← اسم ملفاته
+REPORT_TYPES = {
+    "ملخص الأداء": 'summary',
+    "تقرير الإيرادات": 'revenue',
+    "تقرير الصيانة": 'maintenance',
+    "تقرير السلامة": 'safety',
+    "تقرير الكفاءة": 'efficiency',
+}
+ALL_GOVERNORATES = 'كل المحافظات'
+# التكلفة المتوقعة لزيارة صيانة واحدة بالجنيه
+MAINTENANCE_COST = 500
+MAINTENANCE_COLUMNS = ['معرف المولد', 'الموديل', 'المحافظة', 'ساعات العمل', 'الإيراد الشهري']
+
+
+def build_revenue_report(cube_view):
+    """جدول ومخطط الإيراد حسب المحافظة"""
+    import plotly.express as px
+    by_gov = cube_view.rollup('المحافظة')
+    revenue_by_gov = pd.DataFrame({
+        'الإجمالي': by_gov['revenue'],
+        'المتوسط': by_gov['revenue'] / by_gov['count'],
+        'العدد': by_gov['count']
+    }).round(2)
+
+    fig_revenue = px.bar(
+        x=revenue_by_gov.index,
+        y=revenue_by_gov['الإجمالي'],
+        labels={'x': 'المحافظة', 'y': 'الإيراد'},
+        color=revenue_by_gov['الإجمالي'],
+        color_continuous_scale='Greens'
+    )
+    fig_revenue.update_layout(
+        paper_bgcolor="rgba(0,0,0,0)",
+        plot_bgcolor="rgba(0,0,0,0)",
+        height=400
+    )
+    return revenue_by_gov, fig_revenue
+
+
+def build_safety_report(kpis):
+    """ملخص أنواع التنبيهات ومخططها"""
+    import plotly.express as px
+    alert_summary = pd.DataFrame({
+        'نوع التنبيه': ['وقود منخفض', 'حرارة مرتفعة', 'صيانة مجدولة', 'مراجعة شاملة'],
+        'العدد': [
+            kpis.low_fuel_count,
+            kpis.high_temp_count,
+            kpis.maintenance_count,
+            kpis.overhaul_count
+        ]
+    })
+
+    fig_alerts = px.pie(
+        values=alert_summary['العدد'],
+        names=alert_summary['نوع التنبيه'],
+        color_discrete_sequence=['#ff6b6b', '#ffa500', '#ffd700', '#ff9999']
+    )
+    fig_alerts.update_layout(
+        paper_bgcolor="rgba(0,0,0,0)",
+        plot_bgcolor="rgba(0,0,0,0)"
+    )
+    return alert_summary, fig_alerts
+
+
+def build_efficiency_report(cube_view):
+    """نسبة التشغيل ومتوسط الإيراد والساعات لكل موديل"""
+    by_model = cube_view.rollup('الموديل')
+    active = cube_view.slice(**{'الحالة': ['نشط']}).rollup('الموديل')['count'].reindex(by_model.index, fill_value=0)
+    return pd.DataFrame({
+        'نسبة التشغيل %': active / by_model['count'] * 100,
+        'متوسط الإيراد': by_model['revenue'] / by_model['count'],
+        'متوسط الساعات': by_model['hours'] / by_model['count']
+    }).round(2)
+
+
+def build_maintenance_report(df, alerts):
+    """المولدات المستحقة للصيانة"""
+    return df[alerts.masks['maintenance']][MAINTENANCE_COLUMNS]
+
+
+def top_site(cube_view):
+    """الموقع الأعلى إيراداً (None إن لم يبق أي مولد بعد التصفية)"""
+    by_site = cube_view.rollup('الموقع')['revenue']
+    return by_site.idxmax() if len(by_site) else None
+
+
+def performance_summary(kpis, site, when=None, critical=None):
+    """نص Markdown لملخص الأداء الشامل
+
+    critical عدد التنبيهات الحرجة من آلة حالات التنبيهات (نفس رقم رأس اللوحة). دونها (التقارير
+    الدفعية) يُعرض عدد المولدات المنبهة في القراءة الحالية باسمه لا كتنبيهات حرجة.
+    """
+    when = when or datetime.now()
+    alerts_line = (f"- التنبيهات الحرجة: **{critical}**" if critical is not None
+                   else f"- مولدات بتنبيه في القراءة الحالية: **{kpis.critical_alerts}**")
+    return textwrap.dedent(f"""
+    ### 📊 ملخص الأداء الشامل
+
+    **التاريخ**: {when.strftime('%d/%m/%Y - %H:%M')}
+
+    #### 🎯 المقاييس الرئيسية
+    - إجمالي المولدات المراقبة: **{kpis.count}**
+    - المولدات النشطة: **{kpis.active_count}** ({kpis.utilization:.1f}%)
+    - معطل/في الطريق: **{kpis.down_or_transit_count}**
+    - بحاجة صيانة: **{kpis.maintenance_count}**
+
+    #### 💰 الإيرادات
+    - إجمالي الإيراد الشهري: **{kpis.total_revenue:,.2f} جنيه**
+    - متوسط الإيراد لكل مولد: **{kpis.avg_revenue:,.2f} جنيه**
+    - أعلى موقع: **{site}**
+
+    #### ⚙️ الأداء التقني
+    - السعة الإجمالية: **{kpis.total_capacity:,.0f} kVA**
+    - متوسط ساعات العمل: **{kpis.avg_hours:.0f} ساعة**
+    - متوسط درجة الحرارة: **{kpis.avg_temp:.0f}°C**
+    - متوسط مستوى الوقود: **{kpis.avg_fuel:.0f}%**
+
+    #### 🚨 الحالات الحرجة
+    - مولدات بحرارة عالية: **{kpis.high_temp_count}**
+    - مولدات بوقود منخفض: **{kpis.low_fuel_count}**
+    {alerts_line}
+    """).strip()
+
+
+@dataclass
+class Report:
+    """تقرير جاهز للكتابة: نص Markdown وجداول ومخططات بأسمائها"""
+    title: str
+    markdown: str
+    tables: dict = field(default_factory=dict)
+    figures: dict = field(default_factory=dict)
+
+
+def _markdown_table(frame):
+    """جدول Markdown بسيط (دون الاعتماد على tabulate)"""
+    frame = frame.reset_index() if frame.index.name else frame
+    header = '| ' + ' | '.join(map(str, frame.columns)) + ' |'
+    rule = '|' + '---|' * len(frame.columns)
+    rows = ['| ' + ' | '.join(map(str, row)) + ' |' for row in frame.itertuples(index=False)]
+    return '\n'.join([header, rule, *rows])
+
+
+def build_report(report_type, df, cube_view, alerts, kpis, when=None):
+    """التقرير المطلوب كاملاً لإطار مرشح وشريحة المكعب الموافقة له"""
+    if report_type == "ملخص الأداء":
+        return Report(report_type, performance_summary(kpis, top_site(cube_view), when))
+    if report_type == "تقرير الإيرادات":
+        table, fig = build_revenue_report(cube_view)
+        return Report(report_type, "### 💰 تقرير الإيرادات التفصيلي", {'الإيراد': table}, {'الإيراد': fig})
+    if report_type == "تقرير الصيانة":
+        table = build_maintenance_report(df, alerts)
+        text = (f"### 🔧 تقرير الصيانة والعمليات\n\n"
+                f"إجمالي قيمة الصيانة المتوقعة: **{len(table) * MAINTENANCE_COST:,.0f} جنيه**")
+        return Report(report_type, text, {'الصيانة': table})
+    if report_type == "تقرير السلامة":
+        table, fig = build_safety_report(kpis)
+        return Report(report_type, "### 🚨 تقرير السلامة والتنبيهات", {'التنبيهات': table}, {'التنبيهات': fig})
+    if report_type == "تقرير الكفاءة":
+        return Report(report_type, "### ⚙️ تقرير الكفاءة والإنتاجية", {'الكفاءة': build_efficiency_report(cube_view)})
+    raise ValueError(f"نوع تقرير غير معروف: {report_type}")
+
+
+def _html_page(report, governorate, plotly_src):
+    """صفحة HTML مستقلة من اليمين لليسار - plotly.js ملف واحد مشترك بجوار كل التقارير"""
+    parts = [f"<h1>{html.escape(report.title)} - {html.escape(governorate)}</h1>",
+             f"<pre>{html.escape(report.markdown)}</pre>"]
+    parts += [f"<h2>{html.escape(name)}</h2>{table.to_html()}" for name, table in report.tables.items()]
+    parts += [fig.to_html(full_html=False, include_plotlyjs=False) for fig in report.figures.values()]
+    return (f'<!DOCTYPE html><html dir="rtl" lang="ar"><head><meta charset="utf-8">'
+            f'<title>{html.escape(report.title)}</title><script src="{plotly_src}"></script></head>'
+            f'<body style="font-family: Cairo, sans-serif">{"".join(parts)}</body></html>')
+
+
+def write_report(report, governorate, out_dir, formats=('md', 'csv', 'html')):
+    """ملفات التقرير في مجلد المحافظة - تعيد مسارات ما كُتب"""
+    folder = os.path.join(out_dir, governorate)
+    os.makedirs(folder, exist_ok=True)
+    stem = os.path.join(folder, REPORT_TYPES[report.title])
+    written = []
+    if 'md' in formats:
+        tables = [f"#### {name}\n\n{_markdown_table(table)}" for name, table in report.tables.items()]
+        with open(f"{stem}.md", 'w', encoding='utf-8') as f:
+            f.write('\n\n'.join([report.markdown, *tables]) + '\n')
+        written.append(f"{stem}.md")
+    if 'csv' in formats:
+        for name, table in report.tables.items():
+            table.to_csv(f"{stem}_{name}.csv", encoding='utf-8-sig')
+            written.append(f"{stem}_{name}.csv")
+    if 'html' in formats:
+        with open(f"{stem}.html", 'w', encoding='utf-8') as f:
+            f.write(_html_page(report, governorate, '../plotly.min.js'))
+        written.append(f"{stem}.html")
+    if 'png' in formats:
+        # الصور الثابتة تحتاج kaleido (اختياري)
+        for name, fig in report.figures.items():
+            fig.write_image(f"{stem}_{name}.png")
+            written.append(f"{stem}_{name}.png")
+    return written
+
+
+def available_formats():
+    """الصيغ المتاحة - PNG تحتاج kaleido"""
+    try:
+        import kaleido  # noqa: F401
+    except ImportError:
+        return ['md', 'csv', 'html']
+    return ['md', 'csv', 'html', 'png']
+
+
+# حالة كل عملية في المجمع: الأسطول ومكعبه يُبنيان مرة واحدة عند بدء العملية
+_worker = {}
+
+
+def _init_worker(n, seed, db_path, fuel_threshold, when):
+    if db_path:
+        from fleet.database import FleetDatabase
+        df = FleetDatabase(db_path).load()
+    else:
+        df = generate_fleet(n, seed)
+    _worker.update(df=df, cube=FleetCube.build(df), fuel_threshold=fuel_threshold, when=when)
+
+
+@functools.lru_cache(maxsize=None)
+def _governorate_state(governorate):
+    """الإطار والتنبيهات والمقاييس وشريحة المكعب لمحافظة (محفوظة لتقارير نفس المحافظة)"""
+    df, cube = _worker['df'], _worker['cube']
+    if governorate != ALL_GOVERNORATES:
+        df = df[(df['المحافظة'] == governorate).to_numpy()]
+        cube = cube.slice(**{'المحافظة': [governorate]})
+    alerts = evaluate_alerts(df, thresholds={'fuel_watch': _worker['fuel_threshold']})
+    return df, cube, alerts, compute_kpis(df, alerts)
+
+
+def _build_task(task):
+    governorate, report_type, out_dir, formats = task
+    t0 = time.perf_counter()
+    df, cube_view, alerts, kpis = _governorate_state(governorate)
+    report = build_report(report_type, df, cube_view, alerts, kpis, _worker['when'])
+    return write_report(report, governorate, out_dir, formats), time.perf_counter() - t0
+
+
+def generate_all(out_dir, workers=None, n=50, seed=42, db_path=None, fuel_threshold=20,
+                 governorates=None, formats=None):
+    """كل التقارير لكل المحافظات (ولكل الأسطول) على مجمع عمليات - تعيد (المسارات، الزمن بالثانية)"""
+    formats = formats or available_formats()
+    governorates = governorates or [ALL_GOVERNORATES, *GOVERNORATES]
+    os.makedirs(out_dir, exist_ok=True)
+    if 'html' in formats:
+        from plotly.offline import get_plotlyjs
+        with open(os.path.join(out_dir, 'plotly.min.js'), 'w', encoding='utf-8') as f:
+            f.write(get_plotlyjs())
+    tasks = [(gov, report_type, out_dir, formats) for gov in governorates for report_type in REPORT_TYPES]
+    t0 = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(n, seed, db_path, fuel_threshold, datetime.now())) as pool:
+        results = list(pool.map(_build_task, tasks))
+    paths = [path for written, _ in results for path in written]
+    return paths, time.perf_counter() - t0
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="توليد كل تقارير أسطول مولدات ديني لكل المحافظات")
+    parser.add_argument('--out', default='reports', help="مجلد الإخراج (يُنشأ مجلد بتاريخ اليوم داخله)")
+    parser.add_argument('--workers', type=int, default=os.cpu_count(), help="عدد العمليات")
+    parser.add_argument('--fleet-size', type=int, default=int(os.environ.get('FLEET_SIZE', 50)))
+    parser.add_argument('--seed', type=int, default=int(os.environ.get('FLEET_SEED', 42)))
+    parser.add_argument('--db', default=os.environ.get('FLEET_DB'), help="قاعدة SQLite بدل التوليد بالمحاكاة")
+    parser.add_argument('--fuel-threshold', type=int, default=20, help="حد الوقود الحرج (%%)")
+    parser.add_argument('--formats', nargs='+', choices=['md', 'csv', 'html', 'png'], default=None)
+    args = parser.parse_args()
+    out_dir = os.path.join(args.out, datetime.now().strftime('%Y-%m-%d'))
+    paths, elapsed = generate_all(out_dir, args.workers, args.fleet_size, args.seed, args.db,
+                                  args.fuel_threshold, formats=args.formats)
+    print(f"{len(paths)} ملف في {out_dir} خلال {elapsed:.1f} ث ({args.workers} عملية)")
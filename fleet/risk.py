@@ -0,0 +1,143 @@
+"""مؤشر خطر الأعطال: نموذج لوجستي على مصفوفة خصائص الأسطول كاملة
+
+الخصائص تُطبّع بمراكز ومقاييس ثابتة (لا تعتمد على البيانات) فيبقى تحديث صفوف بعينها
+أو تحديث أوزان النموذج ممكناً دون إعادة حساب الأسطول. الدرجات احتمال عطل بين 0 و1،
+وأعلى K مولد تُستخرج عبر argpartition ثم فرز الـK فقط.
+"""
+import threading
+
+import numpy as np
+
+# اسم الخاصية ← (وصفها، المركز، المقياس، الوزن المبدئي). الوزن السالب: القيمة الأقل أخطر
+RISK_FEATURES = {
+    'temp': ('الحرارة', 90.0, 10.0, 1.6),
+    'hours': ('ساعات العمل', 2500.0, 1500.0, 0.9),
+    'fuel': ('الوقود', 50.0, 25.0, -0.4),
+    'capacity': ('السعة', 110.0, 90.0, 0.3),
+    'temp_trend': ('اتجاه الحرارة', 0.0, 8.0, 0.8),
+}
+RISK_BIAS = -3.5
+# نبضات كل نصف من نافذة الاتجاه (متوسط آخر نافذة ناقص متوسط النافذة السابقة)
+TREND_WINDOW = 24
+HIGH_RISK = 0.5
+
+# عمود الإطار لكل خاصية مباشرة (الاتجاه من سجل القراءات)
+_COLUMNS = {'temp': 'الحرارة °C', 'hours': 'ساعات العمل', 'fuel': 'الوقود %', 'capacity': 'السعة'}
+
+
+def temperature_trend(telemetry, window=TREND_WINDOW):
+    """ارتفاع متوسط الحرارة لكل مولد بين آخر نافذتين في السجل (0 إن لم يكفِ السجل)"""
+    if telemetry.size < 2 * window:
+        return np.zeros(telemetry.n, dtype=np.float32)
+    block = telemetry.window('temp', 2 * window)
+    recent = block[window:].sum(axis=0, dtype=np.uint32)
+    previous = block[:window].sum(axis=0, dtype=np.uint32)
+    return ((recent.astype(np.float32) - previous) / window).astype(np.float32)
+
+
+def risk_features(df, telemetry=None, features=RISK_FEATURES):
+    """مصفوفة (مولد × خاصية) مطبّعة بنوع float32"""
+    X = np.empty((len(df), len(features)), dtype=np.float32)
+    for j, (name, (_, center, scale, _)) in enumerate(features.items()):
+        if name != 'temp_trend':
+            raw = df[_COLUMNS[name]].to_numpy()
+        elif telemetry is not None:
+            raw = temperature_trend(telemetry)
+        else:
+            raw = np.zeros(len(df), dtype=np.float32)
+        X[:, j] = (raw - center) / scale
+    return X
+
+
+def _sigmoid(z):
+    return 1.0 / (1.0 + np.exp(-z))
+
+
+class RiskModel:
+    """أوزان النموذج اللوجستي - تُحدّث تدريجياً بدفعات نتائج معروفة (عطل أو لا)"""
+
+    def __init__(self, features=RISK_FEATURES, bias=RISK_BIAS):
+        self.features = features
+        self.weights = np.array([w for *_, w in features.values()], dtype=np.float32)
+        self.bias = np.float32(bias)
+        self.updates = 0
+
+    def predict(self, X):
+        return _sigmoid(X @ self.weights + self.bias)
+
+    def partial_fit(self, X, outcomes, learning_rate=0.1, steps=10, l2=1e-3):
+        """خطوات انحدار تدرجي على خسارة اللوغاريتم لدفعة جديدة فقط - لا يعاد التدريب من الصفر"""
+        y = np.asarray(outcomes, dtype=np.float32)
+        for _ in range(steps):
+            error = self.predict(X) - y
+            self.weights -= learning_rate * (X.T @ error / len(y) + l2 * self.weights)
+            self.bias -= np.float32(learning_rate * error.mean())
+        self.updates += 1
+        return self
+
+    def contributions(self, X):
+        """مساهمة كل خاصية في الدرجة اللوجستية (للعامل الأبرز لكل مولد)"""
+        return X * self.weights
+
+
+class RiskScores:
+    """درجات الأسطول محفوظة - القراءات الحية وتحديث الأوزان يعيدان حساب ما تغير فقط"""
+
+    def __init__(self, df, telemetry=None, model=None):
+        self.model = model or RiskModel()
+        self.features = risk_features(df, telemetry, self.model.features)
+        self.scores = self.model.predict(self.features)
+        self._columns = list(self.model.features)
+        self.version = 0
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.scores)
+
+    def update(self, rows, values):
+        """قيم جديدة لمولدات محددة {'temp': ..., 'fuel': ..., 'hours': ...} ثم إعادة حساب درجاتها"""
+        with self._lock:
+            for name, new in values.items():
+                if name not in self.model.features:
+                    continue
+                _, center, scale, _ = self.model.features[name]
+                self.features[rows, self._columns.index(name)] = (np.asarray(new, dtype=np.float32) - center) / scale
+            self.scores[rows] = self.model.predict(self.features[rows])
+            self.version += 1
+
+    def apply_messages(self, messages, timestamp=None):
+        """مشترك في IngestPipeline.on_batch: آخر رسالة لكل مولد داخل الدفعة هي التي تُحتسب"""
+        _, first = np.unique(messages[::-1, 0], return_index=True)
+        latest = messages[len(messages) - 1 - first]
+        self.update(latest[:, 0], {'fuel': latest[:, 1], 'temp': latest[:, 2], 'hours': latest[:, 3]})
+
+    def refresh_trend(self, telemetry):
+        """إعادة حساب اتجاه الحرارة بعد نبضات جديدة في السجل"""
+        _, center, scale, _ = self.model.features['temp_trend']
+        trend = (temperature_trend(telemetry) - center) / scale
+        with self._lock:
+            self.features[:, self._columns.index('temp_trend')] = trend
+            self.scores = self.model.predict(self.features)
+            self.version += 1
+
+    def learn(self, rows, outcomes, **kwargs):
+        """تحديث الأوزان بنتائج مولدات معروفة ثم إعادة تقييم الأسطول (ضرب مصفوفة واحد)"""
+        with self._lock:
+            self.model.partial_fit(self.features[rows], outcomes, **kwargs)
+            self.scores = self.model.predict(self.features)
+            self.version += 1
+
+    def top_k(self, k, rows=None):
+        """(أرقام الصفوف، الدرجات) لأخطر k مولد مرتبة تنازلياً - ضمن صفوف محددة إن وُجدت"""
+        scores = self.scores if rows is None else self.scores[rows]
+        k = min(k, len(scores))
+        if k == 0:
+            return np.empty(0, dtype=np.intp), np.empty(0, dtype=np.float32)
+        top = np.argpartition(scores, len(scores) - k)[len(scores) - k:]
+        top = top[np.argsort(scores[top])[::-1]]
+        return (top if rows is None else np.asarray(rows)[top]), scores[top]
+
+    def top_factor(self, rows):
+        """وصف الخاصية الأكثر رفعاً للخطر لكل صف"""
+        labels = np.array([label for label, *_ in self.model.features.values()])
+        return labels[self.model.contributions(self.features[rows]).argmax(axis=1)]
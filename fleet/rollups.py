@@ -0,0 +1,179 @@
+"""تجميعات الإيراد ونسبة التشغيل اليومية والأسبوعية والشهرية - تُحدّث تدريجياً من سجل القراءات
+
+عداد ساعات العمل يزيد ساعة لكل نبضة يعمل فيها المولد، فساعات تشغيل أي مجموعة نبضات
+متتالية هي فرق العداد بين طرفيها. التجميع يقرأ النبضات الجديدة فقط منذ آخر مرة ويقسمها
+على حدود الأيام (حدود الأسابيع والشهور حدود أيام أيضاً): لكل يوم جديد طرح عدادين.
+الإيراد = ساعات التشغيل × (الإيراد الشهري ÷ 720 ساعة).
+
+لكل مولد تُحفظ ساعات الفترة الحالية والسابقة فقط لكل مستوى (uint16)، فحساب التغير
+للمولدات المرشحة ضرب نقطي واحد. الفترات المغلقة تُحفظ مجمّعة حسب الموقع (والمحافظة منه).
+الأسبوع يبدأ السبت، والأيام بتوقيت القاهرة (UTC+2 دون توقيت صيفي).
+"""
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+
+import numpy as np
+import pandas as pd
+
+HOURS_PER_MONTH = 30 * 24
+TZ_OFFSET = 2 * 3600
+# 1970-01-01 خميس، فأول سبت هو اليوم 2
+_FIRST_SATURDAY = 2
+GRAINS = {'day': 'يومي', 'week': 'أسبوعي', 'month': 'شهري'}
+
+
+def period_start(grain, day):
+    """أول يوم (أيام منذ 1970) في فترة المستوى التي تحوي اليوم"""
+    if grain == 'day':
+        return day
+    if grain == 'week':
+        return day - (day - _FIRST_SATURDAY) % 7
+    month = np.datetime64(int(day), 'D').astype('datetime64[M]')
+    return int(month.astype('datetime64[D]').astype(np.int64))
+
+
+@dataclass
+class _Grain:
+    """الفترة الحالية والسابقة لمستوى واحد، وسجل الفترات المغلقة حسب الموقع"""
+    current_start: int = None
+    current: np.ndarray = None
+    current_ticks: int = 0
+    previous_start: int = None
+    previous: np.ndarray = None
+    previous_ticks: int = 0
+    closed: OrderedDict = field(default_factory=OrderedDict)
+
+
+class RevenueRollups:
+    """تجميعات الفترات لكل مولد وموقع ومحافظة"""
+
+    def __init__(self, df, grains=tuple(GRAINS), keep=60):
+        self.n = len(df)
+        self.rate = df['الإيراد الشهري'].to_numpy(dtype=np.float64) / HOURS_PER_MONTH
+        self.site_codes = df['الموقع'].cat.codes.to_numpy()
+        self.sites = list(df['الموقع'].cat.categories)
+        self.site_gov = pd.Series(self.sites).str.split(' - ').str[0].to_numpy()
+        self.site_count = np.bincount(self.site_codes, minlength=len(self.sites))
+        self.keep = keep
+        self.grains = {grain: _Grain() for grain in grains}
+        self.last_time = None
+        self.last_hours = None
+        self.seen_version = None
+        self.version = 0
+        self._lock = threading.Lock()
+
+    @property
+    def nbytes(self):
+        arrays = [g.current for g in self.grains.values()] + [g.previous for g in self.grains.values()]
+        return sum(a.nbytes for a in arrays if a is not None) + (self.last_hours.nbytes if self.last_hours is not None else 0)
+
+    def ingest(self, history):
+        """قراءة النبضات الجديدة من السجل فقط - يعيد عددها (صفر دون أي مسح إن لم يتغير السجل)"""
+        if history.version == self.seen_version:
+            return 0
+        with self._lock:
+            times = history.times()
+            new = np.flatnonzero(times > self.last_time) if self.last_time is not None else np.arange(len(times))
+            if len(new) == 0:
+                self.seen_version = history.version
+                return 0
+            hours = history.window('hours', len(times) - new[0])
+            times = times[new[0]:]
+            if self.last_hours is None:
+                # أول نبضة مرجع العداد فقط
+                self.last_hours = hours[0].astype(np.int64)
+                self.last_time = int(times[0])
+                hours, times = hours[1:], times[1:]
+            days = (times + TZ_OFFSET) // 86400
+            # حدود الأيام داخل النبضات الجديدة: كل مقطع يوم واحد
+            bounds = np.flatnonzero(np.r_[True, days[1:] != days[:-1], True])
+            for start, end in zip(bounds[:-1], bounds[1:]):
+                running = np.clip(hours[end - 1].astype(np.int64) - self.last_hours, 0, end - start)
+                self._add(int(days[start]), running.astype(np.uint16), end - start)
+                self.last_hours = hours[end - 1].astype(np.int64)
+            if len(times):
+                self.last_time = int(times[-1])
+            self.seen_version = history.version
+            self.version += 1
+            return len(times)
+
+    def _add(self, day, running, ticks):
+        for grain, state in self.grains.items():
+            start = period_start(grain, day)
+            if state.current_start != start:
+                self._close(state)
+                state.current_start, state.current, state.current_ticks = start, np.zeros(self.n, np.uint16), 0
+            state.current += running
+            state.current_ticks += ticks
+
+    def _close(self, state):
+        """الفترة الحالية تصبح السابقة، وتُجمّع حسب الموقع في سجل الفترات المغلقة"""
+        if state.current is None:
+            return
+        state.closed[state.current_start] = self._by_site(state.current, state.current_ticks)
+        while len(state.closed) > self.keep:
+            state.closed.popitem(last=False)
+        state.previous_start, state.previous, state.previous_ticks = (
+            state.current_start, state.current, state.current_ticks)
+
+    def _by_site(self, hours, ticks):
+        """(الإيراد، ساعات التشغيل، ساعات الإتاحة) لكل موقع"""
+        revenue = np.bincount(self.site_codes, weights=hours * self.rate, minlength=len(self.sites))
+        running = np.bincount(self.site_codes, weights=hours, minlength=len(self.sites))
+        return revenue, running, self.site_count * ticks
+
+    def totals(self, grain, rows=None, period='current'):
+        """(الإيراد، ساعات التشغيل، عدد النبضات) لفترة للمولدات المحددة"""
+        state = self.grains[grain]
+        hours, ticks = ((state.current, state.current_ticks) if period == 'current'
+                        else (state.previous, state.previous_ticks))
+        if hours is None:
+            return 0.0, 0, 0
+        if rows is not None:
+            hours, rate = hours[rows], self.rate[rows]
+        else:
+            rate = self.rate
+        return float(hours @ rate), int(hours.sum(dtype=np.int64)), ticks
+
+    def change(self, grain, rows=None):
+        """تغير الإيراد ونسبة التشغيل بين الفترة الحالية والسابقة (None إن لم تكتمل فترة سابقة)
+
+        الفترة الحالية لم تنتهِ بعد، فالمقارنة بالمعدل لكل ساعة لا بالمجموع.
+        """
+        count = self.n if rows is None else len(rows)
+        revenue, running, ticks = self.totals(grain, rows)
+        prev_revenue, prev_running, prev_ticks = self.totals(grain, rows, 'previous')
+        if not ticks or not prev_ticks or not count or not prev_revenue:
+            return None
+        rate, prev_rate = revenue / ticks, prev_revenue / prev_ticks
+        utilization = running / (ticks * count) * 100
+        prev_utilization = prev_running / (prev_ticks * count) * 100
+        return {
+            'revenue_pct': (rate / prev_rate - 1) * 100,
+            'utilization': utilization,
+            'utilization_delta': utilization - prev_utilization,
+        }
+
+    def table(self, grain, governorates=None, level='المحافظة'):
+        """إطار (الفترة، المحافظة أو الموقع): الإيراد ونسبة التشغيل % - الفترات المغلقة ثم الحالية"""
+        state = self.grains[grain]
+        periods = list(state.closed.items())
+        if state.current is not None:
+            periods.append((state.current_start, self._by_site(state.current, state.current_ticks)))
+        labels = self.site_gov if level == 'المحافظة' else np.array(self.sites, dtype=object)
+        frames = []
+        for start, (revenue, running, available) in periods:
+            frame = pd.DataFrame({'الإيراد': revenue, 'running': running, 'available': available, level: labels})
+            frame = frame.groupby(level, sort=False).sum()
+            frame['الفترة'] = pd.Timestamp(np.datetime64(int(start), 'D'))
+            frames.append(frame)
+        if not frames:
+            return pd.DataFrame(columns=['الفترة', level, 'الإيراد', 'نسبة التشغيل %'])
+        result = pd.concat(frames).reset_index()
+        if governorates is not None:
+            govs = result[level] if level == 'المحافظة' else result[level].str.split(' - ').str[0]
+            result = result[govs.isin(governorates)]
+        result['نسبة التشغيل %'] = (result['running'] / result['available'].where(result['available'] > 0) * 100).round(1)
+        result['الإيراد'] = result['الإيراد'].round(2)
+        return result[['الفترة', level, 'الإيراد', 'نسبة التشغيل %']].reset_index(drop=True)
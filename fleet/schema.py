@@ -0,0 +1,70 @@
+"""مخطط أنواع إطار الأسطول: فئات للنصوص المتكررة وأنواع رقمية ضيقة"""
+import numpy as np
+import pandas as pd
+
+from fleet.alerts import alert_categories
+
+MODELS = ['DCA-18ESX', 'DCA-25USI', 'DCA-45USI', 'DCA-150ESK', 'DCA-400ESK']
+KVA_MAP = {'DCA-18ESX': 15, 'DCA-25USI': 20, 'DCA-45USI': 37, 'DCA-150ESK': 125, 'DCA-400ESK': 350}
+
+GOVERNORATES = {
+    'القاهرة': {'lat': 30.0444, 'lon': 31.2357},
+    'الجيزة': {'lat': 30.0131, 'lon': 31.2089},
+    'الإسكندرية': {'lat': 31.2001, 'lon': 29.9187},
+    'أسوان': {'lat': 24.0889, 'lon': 32.8998},
+    'البحر الأحمر': {'lat': 27.2579, 'lon': 33.8116},
+    'السويس': {'lat': 29.9668, 'lon': 32.5498},
+    'المنيا': {'lat': 28.1167, 'lon': 30.7500},
+    'قنا': {'lat': 26.1592, 'lon': 33.7795}
+}
+
+STATUSES = ['نشط', 'معطل', 'صيانة', 'في الطريق']
+
+SITES_PER_GOV = 4
+
+
+def site_labels():
+    """أسماء المواقع بترتيب (المحافظة، رقم الموقع)"""
+    return [f"{gov} - موقع {k}" for gov in GOVERNORATES for k in range(1, SITES_PER_GOV + 1)]
+
+
+# الإيراد يبقى float64 لأن float32 يفقد القروش عند قيم بمئات الآلاف
+FLEET_SCHEMA = {
+    'معرف المولد': 'str',
+    'الموديل': pd.CategoricalDtype(MODELS),
+    'السعة': np.int16,
+    'المحافظة': pd.CategoricalDtype(list(GOVERNORATES)),
+    'lat': np.float32,
+    'lon': np.float32,
+    'الحالة': pd.CategoricalDtype(STATUSES),
+    'الإيراد الشهري': np.float64,
+    'الوقود %': np.int16,
+    'الحرارة °C': np.int16,
+    'ساعات العمل': np.int32,
+    'التنبيه': pd.CategoricalDtype(alert_categories()),
+    'الموقع': pd.CategoricalDtype(site_labels()),
+}
+
+# الأنواع الافتراضية قبل المخطط (نصوص كائنات و int64/float64) للمقارنة فقط
+LEGACY_SCHEMA = {
+    col: (object if dtype == 'str' or isinstance(dtype, pd.CategoricalDtype)
+          else np.float64 if np.dtype(dtype).kind == 'f' else np.int64)
+    for col, dtype in FLEET_SCHEMA.items()
+}
+
+
+def categorical(codes, column):
+    """عمود فئوي مباشرة من الأكواد دون المرور بالنصوص"""
+    return pd.Categorical.from_codes(codes, dtype=FLEET_SCHEMA[column])
+
+
+def apply_schema(df):
+    """تحويل إطار قادم من مصدر خارجي (CSV مثلاً) إلى أنواع المخطط"""
+    return df.astype({col: dtype for col, dtype in FLEET_SCHEMA.items() if col in df.columns})
+
+
+def memory_report(df):
+    """استهلاك الذاكرة لكل عمود بالبايت: قبل المخطط وبعده"""
+    before = df.astype(LEGACY_SCHEMA).memory_usage(index=False, deep=True)
+    after = apply_schema(df).memory_usage(index=False, deep=True)
+    return pd.DataFrame({'قبل': before, 'بعد': after})
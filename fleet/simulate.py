@@ -0,0 +1,204 @@
+"""محاكي "ماذا لو" للأسطول: مونت كارلو لاستهلاك الوقود والحرارة وساعات العمل عبر N يوم
+
+كل السيناريوهات والمولدات تُحسب معاً كمصفوفات (سيناريو × مولد) يوماً بعد يوم بنوع float32،
+فلا يوجد أي حلقة بايثون على المولدات أو السيناريوهات. السيناريوهات تُقسم دفعات لكل منها
+بذرة مشتقة من البذرة الرئيسية (SeedSequence.spawn)، فالنتيجة واحدة مهما كان عدد العمليات،
+والدفعات توزع على مجمع عمليات عند طلب أكثر من عملية.
+
+النموذج (تقريبي مبني على أعمدة الأسطول: السعة والوقود والحرارة والساعات والحالة):
+- خزان الوقود بالتر = 2.5 × kVA، والاستهلاك بالتر/ساعة = kVA × (0.03 + 0.07 × الحمل)
+- المولدات النشطة فقط تعمل، عدد ساعات يومي حول متوسط السيناريو
+- عند نزول الوقود تحت حد إعادة التعبئة تُطلب سيارة وقود تصل في اليوم التالي باحتمال
+  الموثوقية، والمولد الذي ينفد وقوده يتوقف حتى التعبئة
+- الحرارة تقترب كل يوم من 60 + 45 × الحمل + شذوذ الطقس في السيناريو مع ضجيج
+"""
+import multiprocessing
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+TANK_LITERS_PER_KVA = 2.5
+IDLE_LPH_PER_KVA = 0.03
+LOAD_LPH_PER_KVA = 0.07
+OVERHEAT = 105
+OVERHAUL_HOURS = 4500
+PERCENTILES = (5, 50, 95)
+CHUNK_SCENARIOS = 100
+# أقصى (سيناريو × مولد) للوحة التفاعلية - 1000 سيناريو لعشرة آلاف مولد في ثوانٍ
+MAX_CELLS = 10_000_000
+# اسم المقياس اليومي ← وصفه
+DAILY_METRICS = {
+    'low_fuel': 'تحت حد التعبئة',
+    'dry': 'متوقف لنفاد الوقود',
+    'overheat': 'حرارة فوق 105',
+    'liters': 'استهلاك الوقود (لتر)',
+    'avg_temp': 'متوسط الحرارة',
+}
+
+
+@dataclass(frozen=True)
+class Scenario:
+    """معاملات المحاكاة - القيم المتوسطة، والسيناريوهات تتشتت حولها"""
+    days: int = 14
+    scenarios: int = 1000
+    load: float = 0.6
+    run_hours: float = 12.0
+    ambient: float = 0.0
+    delivery: float = 0.95
+    refuel_below: int = 20
+    seed: int = 0
+
+
+@dataclass
+class SimulationResult:
+    """نطاقات النسب المئوية لكل مقياس يومي واحتمالات كل مولد"""
+    bands: dict
+    p_dry: np.ndarray
+    p_overheat: np.ndarray
+    p_overhaul: np.ndarray
+    mean_hours: np.ndarray
+    seconds: float = 0.0
+
+    def band_frame(self, metric):
+        """إطار (اليوم × النسبة المئوية) لمقياس يومي"""
+        return pd.DataFrame(self.bands[metric].T, columns=[f"p{p}" for p in PERCENTILES],
+                            index=pd.RangeIndex(1, self.bands[metric].shape[1] + 1, name='اليوم'))
+
+
+def fleet_arrays(df):
+    """أعمدة الأسطول التي يحتاجها النموذج كمصفوفات float32 صغيرة (تُرسل للعمليات بدل الإطار)"""
+    return {
+        'kva': df['السعة'].to_numpy().astype(np.float32),
+        'fuel': df['الوقود %'].to_numpy().astype(np.float32),
+        'temp': df['الحرارة °C'].to_numpy().astype(np.float32),
+        'hours': df['ساعات العمل'].to_numpy().astype(np.float32),
+        'active': (df['الحالة'] == 'نشط').to_numpy(),
+    }
+
+
+def _noise(rng, shape, std):
+    """ضجيج منتظم بالانحراف المعياري المطلوب - أسرع بنحو 4 مرات من التوزيع الطبيعي بنوع float32"""
+    noise = rng.random(shape, dtype=np.float32)
+    noise -= np.float32(0.5)
+    noise *= np.float32(std * 12 ** 0.5)
+    return noise
+
+
+def _simulate_chunk(arrays, scenario, count, seed):
+    """دفعة من `count` سيناريو: (مقاييس يومية (مقياس × سيناريو × يوم)، عدادات لكل مولد)"""
+    rng = np.random.default_rng(seed)
+    f32 = np.float32
+    kva, active = arrays['kva'], arrays['active']
+    g = len(kva)
+    tank = kva * f32(TANK_LITERS_PER_KVA)
+    # معاملات كل سيناريو: الحمل والطقس وساعات التشغيل تتشتت حول المتوسط المختار
+    load_mean = np.clip(rng.normal(scenario.load, 0.08, (count, 1)), 0.1, 1.0).astype(f32)
+    ambient = rng.normal(scenario.ambient, 2.0, (count, 1)).astype(f32)
+    run_mean = np.clip(rng.normal(scenario.run_hours, 2.0, (count, 1)), 0, 24).astype(f32)
+
+    fuel = np.broadcast_to(arrays['fuel'], (count, g)).copy()
+    temp = np.broadcast_to(arrays['temp'], (count, g)).copy()
+    hours = np.broadcast_to(arrays['hours'], (count, g)).copy()
+    ordered = np.zeros((count, g), dtype=bool)
+    ever_dry = np.zeros((count, g), dtype=bool)
+    ever_hot = np.zeros((count, g), dtype=bool)
+    daily = np.empty((len(DAILY_METRICS), count, scenario.days), dtype=np.float64)
+
+    for day in range(scenario.days):
+        # التعبئة المطلوبة أمس تصل اليوم باحتمال الموثوقية
+        arrived = ordered & (rng.random((count, g), dtype=f32) < scenario.delivery)
+        np.copyto(fuel, f32(100), where=arrived)
+        ordered &= ~arrived
+
+        load = np.clip(load_mean + _noise(rng, (count, g), 0.15), 0.05, 1.0)
+        lph = kva * (f32(IDLE_LPH_PER_KVA) + f32(LOAD_LPH_PER_KVA) * load)
+        # ساعات ممكنة بالوقود المتبقي، والساعات الفعلية لا تتجاوزها
+        possible = fuel * tank / f32(100) / lph
+        running = np.minimum(np.clip(run_mean, 0, 24) * active, possible)
+        liters = running * lph
+        fuel -= liters / tank * f32(100)
+        np.maximum(fuel, 0, out=fuel)
+        hours += running
+
+        # المولد المتوقف يبرد نحو 60 + الطقس
+        target = f32(60) + ambient + f32(45) * load * (running > 0)
+        temp += f32(0.5) * (target - temp) + _noise(rng, (count, g), 2.0)
+
+        dry = active & (fuel <= 0.5)
+        hot = temp > OVERHEAT
+        low = fuel < scenario.refuel_below
+        ordered |= low
+        ever_dry |= dry
+        ever_hot |= hot
+
+        daily[0, :, day] = low.sum(axis=1)
+        daily[1, :, day] = dry.sum(axis=1)
+        daily[2, :, day] = hot.sum(axis=1)
+        daily[3, :, day] = liters.sum(axis=1, dtype=np.float64)
+        daily[4, :, day] = temp.mean(axis=1, dtype=np.float64)
+
+    per_generator = np.stack([
+        ever_dry.sum(axis=0), ever_hot.sum(axis=0), (hours >= OVERHAUL_HOURS).sum(axis=0),
+    ]).astype(np.int64)
+    return daily, per_generator, hours.sum(axis=0, dtype=np.float64)
+
+
+def _run_chunk(task):
+    return _simulate_chunk(*task)
+
+
+def scenario_limit(generators, requested):
+    """عدد السيناريوهات الممكن ضمن MAX_CELLS للمولدات المحددة (10 على الأقل)"""
+    return max(10, min(requested, MAX_CELLS // max(generators, 1)))
+
+
+def simulate(arrays, scenario, workers=1, pool=None, chunk=CHUNK_SCENARIOS):
+    """كل السيناريوهات على دفعات - عملية واحدة داخلياً أو مجمع عمليات (pool مشترك أو جديد)"""
+    t0 = time.perf_counter()
+    counts = [min(chunk, scenario.scenarios - start) for start in range(0, scenario.scenarios, chunk)]
+    seeds = np.random.SeedSequence(scenario.seed).spawn(len(counts))
+    tasks = [(arrays, scenario, count, seed) for count, seed in zip(counts, seeds)]
+    if pool is not None:
+        results = list(pool.map(_run_chunk, tasks))
+    elif workers > 1:
+        with ProcessPoolExecutor(max_workers=workers) as own_pool:
+            results = list(own_pool.map(_run_chunk, tasks))
+    else:
+        results = [_run_chunk(task) for task in tasks]
+
+    daily = np.concatenate([r[0] for r in results], axis=1)
+    per_generator = sum(r[1] for r in results)
+    hours = sum(r[2] for r in results)
+    n = scenario.scenarios
+    bands = {name: np.percentile(daily[i], PERCENTILES, axis=0) for i, name in enumerate(DAILY_METRICS)}
+    return SimulationResult(
+        bands=bands,
+        p_dry=per_generator[0] / n,
+        p_overheat=per_generator[1] / n,
+        p_overhaul=per_generator[2] / n,
+        mean_hours=hours / n,
+        seconds=time.perf_counter() - t0,
+    )
+
+
+def simulation_pool(workers):
+    """مجمع عمليات دائم للوحة (None لعملية واحدة)
+
+    العمليات تُنشأ بـ spawn لا fork: خادم Streamlit متعدد الخيوط، ونسخ عملية فيها خيوط
+    قد يرث أقفالاً محجوزة.
+    """
+    if workers <= 1:
+        return None
+    return ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('spawn'))
+
+
+def at_risk(df, result, top=20):
+    """المولدات الأعلى احتمالاً لنفاد الوقود أو ارتفاع الحرارة خلال فترة المحاكاة"""
+    table = df[['معرف المولد', 'المحافظة', 'الموقع', 'السعة', 'الوقود %', 'الحرارة °C']].copy()
+    table['احتمال نفاد الوقود %'] = (result.p_dry * 100).round(1)
+    table['احتمال حرارة فوق 105 %'] = (result.p_overheat * 100).round(1)
+    table['احتمال تجاوز ساعات الصيانة %'] = (result.p_overhaul * 100).round(1)
+    return table.sort_values(['احتمال نفاد الوقود %', 'احتمال حرارة فوق 105 %'], ascending=False).head(top)
@@ -0,0 +1,80 @@
+"""مخزن لقطات الأسطول المشترك على مستوى العملية: نسخ ثابتة للقراءة فقط تُستبدل ذرياً
+
+كل الجلسات تقرأ نفس الإطار بالمرجع (بلا نسخ ولا pickle)، والنسخة الجديدة تُبنى كاملة
+ثم تُنشر بإسناد مرجع واحد، فالجلسة التي بدأت تشغيلها على نسخة تكمله عليها حتى لو نُشرت
+نسخة أحدث أثناءه. النواتج المشتقة (المكعب، خلايا الخريطة...) تُحفظ داخل النسخة نفسها.
+الإطار المشترك لا يُعدّل في مكانه: Copy-on-Write في pandas ينسخ أي عمود تكتبه جلسة قبل الكتابة.
+"""
+import threading
+import time
+from dataclasses import dataclass, field
+
+
+@dataclass(frozen=True)
+class FleetVersion:
+    """نسخة منشورة: الإطار ورقم النسخة ووقت النشر ونواتجها المشتقة"""
+    version: int
+    frame: object
+    published_at: float
+    _derived: dict = field(default_factory=dict, repr=False, compare=False)
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False, compare=False)
+
+    def derived(self, name, build):
+        """ناتج مشتق من هذه النسخة يُبنى مرة واحدة لكل الجلسات"""
+        value = self._derived.get(name)
+        if value is None:
+            with self._lock:
+                value = self._derived.get(name)
+                if value is None:
+                    value = self._derived[name] = build(self.frame)
+        return value
+
+
+class FleetStore:
+    """النسخة الحالية للأسطول - القراءة مرجع واحد بلا قفل، والنشر تحت قفل الكتّاب فقط"""
+
+    def __init__(self, frame):
+        self.base = frame
+        self._current = FleetVersion(0, self.base, time.time())
+        self._publish_lock = threading.Lock()
+        self.published = 0
+
+    def current(self):
+        return self._current
+
+    def publish(self, frame, version):
+        """نشر إطار جديد إن كان أحدث من الحالي (النسخ الأقدم تُتجاهل)"""
+        with self._publish_lock:
+            if version <= self._current.version:
+                return self._current
+            self._current = FleetVersion(version, frame, time.time())
+            self.published += 1
+            return self._current
+
+    def sync(self, snapshot):
+        """مزامنة مع لقطة خط الاستقبال: تُبنى مرة واحدة مهما كان عدد الجلسات المنتظرة"""
+        current = self._current
+        if snapshot is None or snapshot.version <= current.version:
+            return current
+        with self._publish_lock:
+            current = self._current
+            if snapshot.version <= current.version:
+                return current
+            self._current = FleetVersion(snapshot.version, snapshot.apply(self.base), time.time())
+            self.published += 1
+            return self._current
+
+    def apply_tick(self, messages, timestamp, snapshot_at, on_batch=()):
+        """نبضة محلية بلا خط استقبال: اختيار رقم النسخة وتطبيق النبضة ونشرها تحت قفل واحد
+
+        snapshot_at(version) تعطي لقطة النبضة بالرقم المختار، وon_batch تستقبل (messages, timestamp)
+        كمشتركي خط الاستقبال - فجلستان تحدّثان معاً تنشران نسختين متتاليتين بدل أن تُسقط إحداهما الأخرى.
+        """
+        with self._publish_lock:
+            snapshot = snapshot_at(self._current.version + 1)
+            frame = snapshot.apply(self.base)
+            for callback in on_batch:
+                callback(messages, timestamp)
+            self._current = FleetVersion(snapshot.version, frame, time.time())
+            self.published += 1
+            return self._current
@@ -0,0 +1,64 @@
+"""جدول مقسم إلى صفحات على الخادم: ترتيب محفوظ لكل عمود ولا يُقتطع إلا صفوف الصفحة الظاهرة"""
+import threading
+
+import numpy as np
+
+PAGE_SIZES = [50, 100, 250, 500]
+
+
+def _argsort(column):
+    """ترتيب ثابت (stable) للصفوف حسب العمود - الأعمدة الرقمية مباشرة عبر NumPy"""
+    if column.dtype.kind in 'iu':
+        values = column.to_numpy()
+        if len(values) and int(values.max()) - int(values.min()) < 1 << 16:
+            # مدى ضيق (مثل ساعات العمل): إزاحة إلى uint16 فيستخدم NumPy فرز الجذر (radix)
+            values = (values - values.min()).astype(np.uint16)
+        return np.argsort(values, kind='stable')
+    if column.dtype.kind == 'f':
+        return np.argsort(column.to_numpy(), kind='stable')
+    return column.argsort(kind='stable').to_numpy()
+
+
+class TablePager:
+    """صفحات إطار واحد (مرشح) - ترتيب كل عمود يُحسب مرة واحدة ثم يُعاد استخدامه"""
+
+    def __init__(self, df):
+        self.df = df
+        self._orders = {}
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.df)
+
+    @property
+    def nbytes(self):
+        """الإطار وترتيبات الأعمدة المحفوظة"""
+        with self._lock:
+            orders = sum(order.nbytes for order in self._orders.values())
+        return int(self.df.memory_usage(index=True, deep=True).sum()) + orders
+
+    def order(self, sort_by, ascending=True):
+        """أرقام الصفوف مرتبة - التنازلي منظور معكوس للترتيب نفسه بلا نسخ"""
+        with self._lock:
+            order = self._orders.get(sort_by)
+        if order is None:
+            order = _argsort(self.df[sort_by])
+            with self._lock:
+                order = self._orders.setdefault(sort_by, order)
+        return order if ascending else order[::-1]
+
+    def page_count(self, page_size):
+        return max(1, -(-len(self.df) // page_size))
+
+    def page(self, sort_by, ascending, page, page_size, columns=None):
+        """صفوف الصفحة `page` (تبدأ من 1) بعد الفرز مع الأعمدة المطلوبة فقط"""
+        start = (page - 1) * page_size
+        rows = self.order(sort_by, ascending)[start:start + page_size]
+        # صفوف الصفحة أولاً ثم الأعمدة - اختيار الأعمدة قبلها ينسخها للإطار كاملاً
+        page = self.df.take(rows)
+        return page if columns is None else page[list(columns)]
+
+    def sorted(self, sort_by, ascending, columns=None):
+        """الإطار كاملاً بعد الفرز (للتصدير فقط)"""
+        frame = self.df if columns is None else self.df[list(columns)]
+        return frame.take(self.order(sort_by, ascending))
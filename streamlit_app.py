@@ -1,10 +1,35 @@
 import streamlit as st
 import pandas as pd
 import numpy as np
-import plotly.graph_objects as go
-import plotly.express as px
-from datetime import datetime, timedelta
-import io
+from datetime import datetime
+import functools
+import os
+
+from fleet.alert_states import AlertStates
+from fleet.alerts import evaluate_alerts
+from fleet.cube import FleetCube
+from fleet.database import open_fleet_database
+from fleet.dispatch import DEPOTS, GridIndex, nearest_depot, refuel_runs
+from fleet.export import EXPORT_FORMATS, ExportCache, available_formats
+from fleet.filters import FleetFilterIndex
+from fleet.geo import DEFAULT_ZOOM, ZOOM_LEVELS, GeoIndex
+from fleet.histograms import BinnedHistograms
+from fleet.kpis import compute_kpis
+from fleet.perf import PROFILE_MODES, SectionCache, SectionTracker
+from fleet.reports import (
+    MAINTENANCE_COST, REPORT_TYPES, build_efficiency_report, build_maintenance_report, build_revenue_report,
+    build_safety_report, performance_summary, top_site
+)
+from fleet.rollups import GRAINS, RevenueRollups
+from fleet.simulate import (
+    DAILY_METRICS, Scenario, at_risk, fleet_arrays, scenario_limit, simulate, simulation_pool
+)
+from fleet.risk import HIGH_RISK, TREND_WINDOW, RiskScores
+from fleet.store import FleetStore
+from fleet.table import PAGE_SIZES, TablePager
+from fleet.telemetry import DEFAULT_CAPACITY, backfill_history, simulate_tick
+from fleet.generator import generate_fleet
+from fleet.ingest import FleetSnapshot, IngestPipeline, make_source
 
 # تكوين الصفحة
 st.set_page_config(
@@ -15,335 +40,441 @@ st.set_page_config(
 )
 
 # ستايل CSS متقدم مع اللغة العربية
-st.markdown("""
-    <style>
-        @import url('https://fonts.googleapis.com/css2?family=Cairo:wght@300;400;700&display=swap');
-        
-        * {
-            font-family: 'Cairo', sans-serif;
-            direction: rtl;
-        }
-        
-        .stApp {
-            background-color: #0e1117;
-            color: #fafafa;
-        }
-        
-        /* بطاقات المقاييس */
-        div[data-testid="stMetric"] {
-            background: linear-gradient(135deg, #1a2a3a 0%, #1f2937 100%);
-            padding: 20px;
-            border-radius: 12px;
-            border-right: 5px solid #00a8e8;
-            box-shadow: 0 4px 15px rgba(0, 168, 232, 0.2);
-            text-align: right;
-        }
-        
-        div[data-testid="stMetricValue"] {
-            font-size: 32px;
-            font-weight: 700;
-            color: #00a8e8;
-        }
-        
-        div[data-testid="stMetricLabel"] {
-            font-size: 13px;
-            color: #9ca3af;
-            margin-top: 8px;
-        }
-        
-        /* شريط جانبي */
-        section[data-testid="stSidebar"] {
-            background-color: #111827;
-            border-left: 3px solid #00a8e8;
-        }
-        
-        /* العناوين */
-        h1, h2, h3 {
-            color: #00a8e8;
-            font-weight: 700;
-        }
-        
-        /* الأزرار */
-        .stButton > button {
-            width: 100%;
-            background: linear-gradient(135deg, #00a8e8 0%, #0087c9 100%);
-            color: white;
-            border: none;
-            border-radius: 8px;
-            padding: 10px;
-            font-weight: 600;
-            transition: all 0.3s ease;
-        }
-        
-        .stButton > button:hover {
-            box-shadow: 0 4px 12px rgba(0, 168, 232, 0.4);
-            transform: translateY(-2px);
-        }
-        
-        /* الجداول */
-        .stDataFrame {
-            direction: rtl;
-        }
-        
-        /* التبويبات */
-        .stTabs [data-baseweb="tab-list"] {
-            gap: 8px;
-        }
-        
-        .stTabs [data-baseweb="tab"] {
-            background-color: #1f2937;
-            border-radius: 8px;
-            padding: 12px 20px;
-            color: #9ca3af;
-            border: none;
-        }
-        
-        .stTabs [aria-selected="true"] {
-            background-color: #00a8e8;
-            color: white;
-        }
-    </style>
-    """, unsafe_allow_html=True)
+# الوضع الافتراضي: رابط قصير لملف ثابت يحفظه المتصفح، وSTATIC_ASSETS=0 يضمّن الملف كاملاً في الصفحة
+# (للتشغيل دون server.enableStaticServing)
+STATIC_ASSETS = os.environ.get('STATIC_ASSETS', '1') != '0'
+CSS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'static', 'dashboard.css')
+
+@st.cache_resource
+def load_css():
+    """محتوى ملف الستايل يُقرأ مرة واحدة للعملية"""
+    with open(CSS_PATH, encoding='utf-8') as f:
+        return f.read()
+
+if STATIC_ASSETS:
+    st.markdown('<link rel="stylesheet" href="app/static/dashboard.css">', unsafe_allow_html=True)
+else:
+    st.markdown(f"<style>{load_css()}</style>", unsafe_allow_html=True)
 
 # ========================
-# 1️⃣ توليد البيانات المحاكاة
+# ⏱️ الأقسام المستقلة وتتبع إعادة الحساب
 # ========================
-@st.cache_data
-def generate_fleet_data():
-    """توليد بيانات 50 مولد ديني واقعية عبر محافظات مصر"""
-    np.random.seed(42)
-    
-    models = ['DCA-18ESX', 'DCA-25USI', 'DCA-45USI', 'DCA-150ESK', 'DCA-400ESK']
-    governorates = {
-        'القاهرة': {'lat': 30.0444, 'lon': 31.2357},
-        'الجيزة': {'lat': 30.0131, 'lon': 31.2089},
-        'الإسكندرية': {'lat': 31.2001, 'lon': 29.9187},
-        'أسوان': {'lat': 24.0889, 'lon': 32.8998},
-        'البحر الأحمر': {'lat': 27.2579, 'lon': 33.8116},
-        'السويس': {'lat': 29.9668, 'lon': 32.5498},
-        'المنيا': {'lat': 28.1167, 'lon': 30.7500},
-        'قنا': {'lat': 26.1592, 'lon': 33.7795}
-    }
-    
-    statuses = ['نشط', 'معطل', 'صيانة', 'في الطريق']
-    data = []
-    
-    for i in range(50):
-        gov = np.random.choice(list(governorates.keys()))
-        base_lat = governorates[gov]['lat']
-        base_lon = governorates[gov]['lon']
-        
-        lat = base_lat + np.random.uniform(-0.1, 0.1)
-        lon = base_lon + np.random.uniform(-0.1, 0.1)
-        
-        model = np.random.choice(models)
-        kva_map = {'DCA-18ESX': 15, 'DCA-25USI': 20, 'DCA-45USI': 37, 'DCA-150ESK': 125, 'DCA-400ESK': 350}
-        kva = kva_map[model]
-        
-        revenue = np.random.randint(8000, 45000) * (kva/50)
-        status = np.random.choice(statuses, p=[0.65, 0.15, 0.15, 0.05])
-        fuel = np.random.randint(5, 100)
-        temp = np.random.randint(65, 115)
-        hours = np.random.randint(100, 5000)
-        
-        alert = "لا يوجد"
-        if fuel < 15:
-            alert = "⚠️ وقود منخفض"
-        elif temp > 105:
-            alert = "🔴 ارتفاع حرارة"
-        elif status == 'صيانة':
-            alert = "🔧 صيانة مجدولة"
-        elif hours > 4500:
-            alert = "🛠️ مراجعة شاملة"
-        
-        data.append({
-            'معرف المولد': f'DNY-{1000+i}',
-            'الموديل': model,
-            'السعة': kva,
-            'المحافظة': gov,
-            'lat': lat,
-            'lon': lon,
-            'الحالة': status,
-            'الإيراد الشهري': round(revenue, 2),
-            'الوقود %': fuel,
-            'الحرارة °C': temp,
-            'ساعات العمل': hours,
-            'التنبيه': alert,
-            'الموقع': f"{gov} - موقع {np.random.randint(1,5)}"
-        })
-    
-    return pd.DataFrame(data)
+@st.cache_resource
+def get_section_cache():
+    """نتائج الأقسام محفوظة حسب مدخلاتها الفعلية ومشتركة بين الجلسات"""
+    return SectionCache()
+
+# لوحة قياس الأداء مخفية وتظهر بإضافة ?admin=1 للرابط، وPERF_LOG يحفظ كل تشغيل في ملف JSONL محلي
+ADMIN_PANEL = st.query_params.get('admin') == '1'
+PERF_LOG = os.environ.get('PERF_LOG')
+
+section_cache = get_section_cache()
+if 'section_tracker' not in st.session_state:
+    st.session_state.section_tracker = SectionTracker(log_path=PERF_LOG)
+tracker = st.session_state.section_tracker
+
+def cached_section(name, key, build):
+    """نتيجة القسم من الذاكرة إن لم تتغير مدخلاته، وإلا يُعاد حسابها ويُسجل ذلك"""
+    with tracker.span(name):
+        value, computed = section_cache.get(name, key, build)
+    tracker.record(name, computed)
+    return value
+
+def show_chart(fig):
+    """عرض مخطط Plotly - تحويله إلى JSON جزء من زمن التشغيل فيُقاس كمقطع مستقل"""
+    with tracker.span('رسم المخططات'):
+        st.plotly_chart(fig, use_container_width=True)
 
-df = generate_fleet_data()
+def dashboard_fragment(name):
+    """قسم مستقل: تغيير عناصره الخاصة يعيد تشغيله وحده دون باقي الصفحة"""
+    def wrap(render):
+        @st.fragment
+        @functools.wraps(render)
+        def run(*args, **kwargs):
+            partial = tracker.begin_section(name)
+            try:
+                return render(*args, **kwargs)
+            finally:
+                if partial:
+                    tracker.end_run()
+        return run
+    return wrap
 
 # ========================
-# 2️⃣ الشريط الجانبي - التحكم المتقدم
+# 1️⃣ توليد البيانات المحاكاة
 # ========================
-st.sidebar.title("🎛️ لوحة التحكم")
-st.sidebar.markdown("### ⚙️ المرشحات والإعدادات")
-
-# المرشحات
-selected_govs = st.sidebar.multiselect(
-    "🗺️ اختر المحافظات:",
-    df['المحافظة'].unique(),
-    default=df['المحافظة'].unique()
-)
+# حجم الأسطول قابل للتغيير لاختبارات الحمل (مثال: FLEET_SIZE=1000000)
+FLEET_SIZE = int(os.environ.get('FLEET_SIZE', 50))
+FLEET_SEED = int(os.environ.get('FLEET_SEED', 42))
+# عدد النبضات المحفوظة لكل مولد (الافتراضي 30 يوماً بقراءة كل ساعة)
+TELEMETRY_CAPACITY = int(os.environ.get('TELEMETRY_CAPACITY', DEFAULT_CAPACITY))
+# مصدر القراءات الحية (اختياري): simulate:2000 أو tcp:127.0.0.1:9009 أو file:/tmp/telemetry.csv
+TELEMETRY_SOURCE = os.environ.get('TELEMETRY_SOURCE')
+# بناء التبويب المحدد فقط (LAZY_TABS=0 يعيد بناء التبويبات الستة في كل تشغيل)
+LAZY_TABS = os.environ.get('LAZY_TABS', '1') != '0'
+# ملف SQLite محلي للأسطول وسجل القراءات (اختياري): FLEET_DB=data/fleet.sqlite
+# أول تشغيل يعبئه من المحاكاة، وكل بدء بارد بعده يقرأ منه بدل إعادة التوليد
+FLEET_DB = os.environ.get('FLEET_DB')
+# عدد عمليات محاكاة "ماذا لو" (1 = داخل عملية الخادم دون مجمع)
+SIMULATION_WORKERS = int(os.environ.get('SIMULATION_WORKERS', os.cpu_count() or 1))
 
-selected_status = st.sidebar.multiselect(
-    "📊 حالة المولد:",
-    df['الحالة'].unique(),
-    default=df['الحالة'].unique()
-)
+@st.cache_resource
+def get_fleet_database(path=FLEET_DB, n=FLEET_SIZE, seed=FLEET_SEED, capacity=TELEMETRY_CAPACITY):
+    """قاعدة الأسطول الدائمة - تُعبأ بالتحميل المجمع مرة واحدة، ومن جديد إن تغير الحجم أو البذرة"""
+    return open_fleet_database(
+        path, lambda: generate_fleet(n, seed),
+        backfill=lambda frame: backfill_history(frame, capacity=capacity, seed=seed),
+        size=n, seed=seed
+    )
 
-capacity_range = st.sidebar.slider(
-    "⚡ نطاق السعة (kVA):",
-    int(df['السعة'].min()),
-    int(df['السعة'].max()),
-    (int(df['السعة'].min()), int(df['السعة'].max()))
-)
+@st.cache_resource
+def get_fleet_store(n=FLEET_SIZE, seed=FLEET_SEED):
+    """توليد بيانات مولدات ديني واقعية عبر محافظات مصر - نسخة واحدة مشتركة بين كل الجلسات"""
+    if FLEET_DB:
+        return FleetStore(get_fleet_database(FLEET_DB, n, seed, TELEMETRY_CAPACITY).load())
+    return FleetStore(generate_fleet(n, seed))
 
-fuel_threshold = st.sidebar.slider(
-    "⛽ حد الوقود الحرج (%):",
-    5, 50, 20
-)
+@st.cache_resource
+def get_filter_index(n=FLEET_SIZE, seed=FLEET_SEED):
+    """فهارس المرشحات تُبنى مرة واحدة لكل نسخة بيانات وتُشارك بين الجلسات"""
+    return FleetFilterIndex(get_fleet_store(n, seed).base)
 
-st.sidebar.markdown("---")
-st.sidebar.markdown("### 📋 إجراءات سريعة")
+@st.cache_resource
+def get_telemetry_history(n=FLEET_SIZE, seed=FLEET_SEED, capacity=TELEMETRY_CAPACITY):
+    """سجل القراءات التاريخية مشترك بين الجلسات بذاكرة ثابتة لكل مولد"""
+    base = get_fleet_store(n, seed).base
+    if FLEET_DB:
+        saved = get_fleet_database(FLEET_DB, n, seed, capacity).load_telemetry(len(base), capacity)
+        if saved is not None:
+            return saved
+    return backfill_history(base, capacity=capacity, seed=seed)
 
-col1, col2 = st.sidebar.columns(2)
-with col1:
-    if st.button("📥 تصدير بيانات"):
-        csv = df.to_csv(index=False, encoding='utf-8-sig')
-        st.download_button(
-            label="تحميل CSV",
-            data=csv,
-            file_name=f"أسطول_مولدات_{datetime.now().strftime('%Y%m%d')}.csv",
-            mime="text/csv"
-        )
+@st.cache_resource
+def get_binned_histograms(n=FLEET_SIZE, seed=FLEET_SEED):
+    """عدادات توزيعات الحرارة والوقود - تُحدّث من دفعات القراءات الحية دون إعادة بناء"""
+    return BinnedHistograms(get_fleet_store(n, seed).base)
 
-with col2:
-    if st.button("🔄 تحديث البيانات"):
-        st.rerun()
+@st.cache_resource
+def get_risk_scores(n=FLEET_SIZE, seed=FLEET_SEED, capacity=TELEMETRY_CAPACITY):
+    """درجات خطر الأعطال للأسطول - القراءات الحية تعيد حساب صفوفها فقط"""
+    return RiskScores(get_fleet_store(n, seed).base, get_telemetry_history(n, seed, capacity))
 
-# تطبيق المرشحات
-df_filtered = df[
-    (df['المحافظة'].isin(selected_govs)) &
-    (df['الحالة'].isin(selected_status)) &
-    (df['السعة'].between(capacity_range[0], capacity_range[1]))
-]
+@st.cache_resource
+def get_revenue_rollups(n=FLEET_SIZE, seed=FLEET_SEED, capacity=TELEMETRY_CAPACITY):
+    """تجميعات الإيراد والتشغيل لكل فترة - تُبنى من السجل مرة ثم تقرأ النبضات الجديدة فقط"""
+    rollups = RevenueRollups(get_fleet_store(n, seed).base)
+    rollups.ingest(get_telemetry_history(n, seed, capacity))
+    return rollups
 
-# ========================
-# 3️⃣ رأس لوحة التحكم - المقاييس الرئيسية
-# ========================
-st.title("⚡ لوحة تحكم الكاتمي | إدارة أسطول مولدات ديني")
-st.markdown(f"**📍 مراقبة حية**: تتبع **{len(df_filtered)}** مولد عبر جمهورية مصر العربية")
-
-# حسابات المقاييس المتقدمة
-total_revenue = df_filtered['الإيراد الشهري'].sum()
-active_count = len(df_filtered[df_filtered['الحالة'] == 'نشط'])
-utilization = (active_count / len(df_filtered) * 100) if len(df_filtered) > 0 else 0
-critical_alerts = len(df_filtered[df_filtered['التنبيه'] != 'لا يوجد'])
-avg_fuel = df_filtered['الوقود %'].mean()
-avg_temp = df_filtered['الحرارة °C'].mean()
-low_fuel_count = len(df_filtered[df_filtered['الوقود %'] < fuel_threshold])
-total_capacity = df_filtered['السعة'].sum()
-
-# عرض المقاييس في أربع صفوف
-st.markdown("### 📊 المقاييس الرئيسية")
-
-# الصف الأول
-col1, col2, col3, col4 = st.columns(4)
-
-with col1:
-    st.metric(
-        "💰 إجمالي الإيراد",
-        f"{total_revenue/1_000_000:.2f}M جنيه",
-        f"↗ {np.random.randint(3,12)}% هذا الشهر"
+@st.cache_resource
+def get_alert_states(n=FLEET_SIZE, seed=FLEET_SEED):
+    """حالات التنبيهات الحية (فتح/إقرار/حل) مشتركة بين الجلسات - تُحدّث من القراءات لا من اللقطة"""
+    return AlertStates(get_fleet_store(n, seed).base)
+
+@st.cache_resource
+def get_dispatch_index(n=FLEET_SIZE, seed=FLEET_SEED):
+    """فهرس مواقع المولدات للإرسال - الإحداثيات لا تتغير مع القراءات الحية فيُبنى مرة واحدة"""
+    base = get_fleet_store(n, seed).base
+    return GridIndex(base['lat'].to_numpy(), base['lon'].to_numpy())
+
+@st.cache_resource
+def get_ingest_pipeline(spec=TELEMETRY_SOURCE, n=FLEET_SIZE, seed=FLEET_SEED, capacity=TELEMETRY_CAPACITY):
+    """خط استقبال القراءات الحية - خيط خلفي واحد لكل عملية"""
+    # العدادات والدرجات تُنشأ قبل الخط وتشترك في دفعاته من النسخة 0 فلا تفوتها أي دفعة
+    histograms = get_binned_histograms(n, seed)
+    risk = get_risk_scores(n, seed, capacity)
+    alert_states = get_alert_states(n, seed)
+    return IngestPipeline(
+        get_fleet_store(n, seed).base, make_source(spec, n),
+        on_batch=[histograms.apply_messages, risk.apply_messages, alert_states.apply_messages]
+    ).start()
+
+@st.cache_resource
+def get_simulation_pool(workers=SIMULATION_WORKERS):
+    """مجمع عمليات المحاكاة يُنشأ مرة للعملية - تكلفة بدء العمليات لا تتكرر مع كل تشغيل"""
+    return simulation_pool(workers)
+
+@st.cache_resource
+def get_export_cache():
+    """ملفات التصدير المؤقتة مشتركة بين الجلسات"""
+    return ExportCache()
+
+def main():
+    """الصفحة كاملة لتشغيل واحد - تُستدعى داخل tracker.run فيُغلق التشغيل مهما كان خروجها"""
+    with tracker.span('البيانات'):
+        # المعاملات تُمرر صراحة لأن مفتاح الذاكرة المؤقتة يُبنى من المعاملات الممررة فقط لا من القيم الافتراضية
+        store = get_fleet_store(FLEET_SIZE, FLEET_SEED)
+        filter_index = get_filter_index(FLEET_SIZE, FLEET_SEED)
+        telemetry = get_telemetry_history(FLEET_SIZE, FLEET_SEED, TELEMETRY_CAPACITY)
+        export_cache = get_export_cache()
+        histograms = get_binned_histograms(FLEET_SIZE, FLEET_SEED)
+        risk = get_risk_scores(FLEET_SIZE, FLEET_SEED, TELEMETRY_CAPACITY)
+        alert_states = get_alert_states(FLEET_SIZE, FLEET_SEED)
+        rollups = get_revenue_rollups(FLEET_SIZE, FLEET_SEED, TELEMETRY_CAPACITY)
+        # النبضات الجديدة فقط (زر التحديث) - لا شيء يُقرأ إن لم يتغير السجل
+        rollups.ingest(telemetry)
+
+        # آخر لقطة متسقة من خط الاستقبال (قراءة مرجع فقط - لا انتظار)
+        pipeline = (get_ingest_pipeline(TELEMETRY_SOURCE, FLEET_SIZE, FLEET_SEED, TELEMETRY_CAPACITY)
+                    if TELEMETRY_SOURCE else None)
+        snapshot = pipeline.snapshot() if pipeline else None
+        # نسخة الأسطول لهذا التشغيل: مرجع ثابت حتى نهايته، وأول جلسة ترى لقطة أحدث تبني النسخة وتنشرها للجميع
+        fleet = store.sync(snapshot)
+        df = fleet.frame
+        data_version = fleet.version
+
+    # ========================
+    # 2️⃣ الشريط الجانبي - التحكم المتقدم
+    # ========================
+    st.sidebar.title("🎛️ لوحة التحكم")
+    st.sidebar.markdown("### ⚙️ المرشحات والإعدادات")
+
+    # المرشحات - القيم المتاحة تُقرأ من الفهرس بدل مسح الأعمدة في كل تشغيل
+    gov_options = filter_index.values('المحافظة')
+    status_options = filter_index.values('الحالة')
+    min_kva, max_kva = (int(v) for v in filter_index.value_bounds())
+
+    selected_govs = st.sidebar.multiselect(
+        "🗺️ اختر المحافظات:",
+        gov_options,
+        default=gov_options
     )
 
-with col2:
-    st.metric(
-        "⚙️ معدل التشغيل",
-        f"{utilization:.1f}%",
-        f"{active_count} مولد نشط",
-        delta_color="normal" if utilization > 70 else "inverse"
+    selected_status = st.sidebar.multiselect(
+        "📊 حالة المولد:",
+        status_options,
+        default=status_options
     )
 
-with col3:
-    st.metric(
-        "🚨 تنبيهات حرجة",
-        critical_alerts,
-        "بحاجة للانتباه" if critical_alerts > 0 else "الوضع مستقر ✅"
+    capacity_range = st.sidebar.slider(
+        "⚡ نطاق السعة (kVA):",
+        min_kva,
+        max_kva,
+        (min_kva, max_kva)
     )
 
-with col4:
-    st.metric(
-        "⚡ إجمالي السعة",
-        f"{total_capacity:.0f} kVA",
-        f"متوسط: {total_capacity/len(df_filtered):.0f} kVA"
+    fuel_threshold = st.sidebar.slider(
+        "⛽ حد الوقود الحرج (%):",
+        5, 50, 20
     )
 
-# الصف الثاني
-col5, col6, col7, col8 = st.columns(4)
+    st.sidebar.markdown("---")
+    st.sidebar.markdown("### 📋 إجراءات سريعة")
 
-with col5:
-    st.metric(
-        "⛽ متوسط الوقود",
-        f"{avg_fuel:.0f}%",
-        f"🔴 {low_fuel_count} مولد وقود منخفض"
+    # ملف التصدير يُبنى على دفعات عند النقر فقط ويُحفظ على القرص حسب نسخة البيانات
+    export_format = st.sidebar.selectbox(
+        "📄 صيغة التصدير:",
+        available_formats(),
+        format_func=lambda fmt: EXPORT_FORMATS[fmt][0]
     )
+    _, export_mime, export_ext = EXPORT_FORMATS[export_format]
 
-with col6:
-    st.metric(
-        "🌡️ متوسط الحرارة",
-        f"{avg_temp:.0f}°C",
-        "✅ طبيعي" if avg_temp < 100 else "⚠️ مرتفع"
+    col1, col2 = st.sidebar.columns(2)
+    with col1:
+        st.download_button(
+            label="📥 تصدير بيانات",
+            data=export_cache.opener(('الأسطول', FLEET_SIZE, FLEET_SEED, data_version), export_format, lambda frame=df: frame),
+            file_name=f"أسطول_مولدات_{datetime.now().strftime('%Y%m%d')}{export_ext}",
+            mime=export_mime
+        )
+
+    with col2:
+        if st.button("🔄 تحديث البيانات"):
+            # نبضة قراءات جديدة تُضاف إلى السجل الدائري قبل إعادة الرسم (وإلى القاعدة إن وُجدت)
+            tick_time = int(datetime.now().timestamp())
+            tick = simulate_tick(telemetry, np.random.default_rng(), active=(df['الحالة'] == 'نشط').to_numpy())
+            telemetry.record(tick_time, tick)
+            # النبضة نفسها تصل للإطار والعدادات والدرجات وحالات التنبيهات معاً فتتفق كل العروض في التشغيل التالي:
+            # عبر خط الاستقبال إن وُجد (بالترتيب مع دفعاته)، وإلا تُطبق وتُنشر نسخة جديدة تحت قفل المخزن
+            tick_messages = np.column_stack([np.arange(telemetry.n), tick['fuel'], tick['temp'], tick['hours']])
+            if pipeline:
+                published = store.sync(pipeline.submit(tick_messages))
+            else:
+                published = store.apply_tick(
+                    tick_messages, tick_time,
+                    lambda version: FleetSnapshot(version, tick['fuel'], tick['temp'], tick['hours'], tick_time, telemetry.n),
+                    on_batch=[consumer.apply_messages for consumer in (histograms, risk, alert_states)],
+                )
+            if FLEET_DB:
+                # القراءات وتنبيهاتها تُكتب في سجل المولدات أيضاً فيبدأ التشغيل البارد التالي منها
+                get_fleet_database(FLEET_DB, FLEET_SIZE, FLEET_SEED, TELEMETRY_CAPACITY).append_tick(
+                    tick_time, tick, published.frame['التنبيه'], keep=TELEMETRY_CAPACITY
+                )
+            # اتجاه الحرارة في مؤشر الخطر يُحسب من آخر نبضات السجل
+            risk.refresh_trend(telemetry)
+            st.rerun()
+
+    if pipeline:
+        st.sidebar.caption(f"📡 بث حي: النسخة {snapshot.version} - {snapshot.messages:,} قراءة")
+        if pipeline.stats['dropped'] or pipeline.stats['errors']:
+            st.sidebar.caption(f"⚠️ {pipeline.stats['dropped']:,} قراءة تالفة أو خارج المدى أُسقطت، {pipeline.stats['errors']} خطأ في المعالجة")
+
+    # مفتاح حالة المرشحات - كل قسم يُعاد حسابه فقط عند تغير هذا المفتاح أو مدخلاته الخاصة
+    # (حجم الأسطول والبذرة ضمنه لأن ذاكرة الأقسام مشتركة على مستوى العملية)
+    filter_key = (
+        tuple(sorted(selected_govs)),
+        tuple(sorted(selected_status)),
+        tuple(capacity_range),
+        FLEET_SIZE,
+        FLEET_SEED,
+        data_version
     )
 
-with col7:
-    st.metric(
-        "🔧 بحاجة صيانة",
-        len(df_filtered[df_filtered['الحالة'] == 'صيانة']),
-        "مجدولة"
+    def build_filter_state():
+        """الإطار المرشح وأقنعة التنبيهات والمقاييس"""
+        with tracker.span('التصفية'):
+            df_filtered = filter_index.filtered([selected_govs, selected_status], capacity_range, frame=df)
+        with tracker.span('التنبيهات'):
+            alerts = evaluate_alerts(df_filtered, thresholds={'fuel_watch': fuel_threshold})
+        with tracker.span('المؤشرات'):
+            kpis = compute_kpis(df_filtered, alerts)
+        return df_filtered, alerts, kpis
+
+    # تطبيق المرشحات - النتيجة محفوظة حسب قيم المرشحات فلا تُعاد عند تغيير عنصر آخر
+    df_filtered, alerts, kpis = cached_section('المرشحات', filter_key + (fuel_threshold,), build_filter_state)
+
+    # شريحة مكعب التجميع لنفس المرشحات - الرسوم والتقارير تُجاب منها دون groupby على الصفوف
+    cube_view = cached_section(
+        'المكعب', filter_key,
+        lambda: fleet.derived('المكعب', FleetCube.build).slice(
+            capacity_range, **{'المحافظة': selected_govs, 'الحالة': selected_status}
+        )
     )
 
-with col8:
-    st.metric(
-        "🚛 معطل أو في الطريق",
-        len(df_filtered[df_filtered['الحالة'].isin(['معطل', 'في الطريق'])]),
-        "يحتاج متابعة"
+    # ========================
+    # 3️⃣ رأس لوحة التحكم - المقاييس الرئيسية
+    # ========================
+    st.title("⚡ لوحة تحكم الكاتمي | إدارة أسطول مولدات ديني")
+    st.markdown(f"**📍 مراقبة حية**: تتبع **{kpis.count}** مولد عبر جمهورية مصر العربية")
+
+    # المقاييس المتقدمة - من تمريرة التجميع الواحدة المحفوظة لحالة المرشحات
+    total_revenue = kpis.total_revenue
+    active_count = kpis.active_count
+    utilization = kpis.utilization
+    # التنبيهات الحرجة من آلة الحالات: مولد يحوم حول الحد لا يفتح ويغلق تنبيهاً مع كل قراءة
+    with tracker.span('التنبيهات الحية'):
+        alert_states.tick()
+        alert_rows = df_filtered.index.to_numpy()
+        critical_alerts = int(np.count_nonzero(alert_states.critical(alerts, alert_rows)))
+        unacked_alerts = alert_states.unacknowledged(alert_rows)
+
+    # التغير الفعلي عن الشهر السابق من تجميعات الفترات (ضرب نقطي على المولدات المرشحة)
+    revenue_change = cached_section(
+        'التغير الشهري', filter_key + (rollups.version,),
+        lambda: rollups.change('month', None if len(df_filtered) == len(df) else alert_rows)
     )
+    avg_fuel = kpis.avg_fuel
+    avg_temp = kpis.avg_temp
+    low_fuel_count = kpis.low_fuel_count
+    total_capacity = kpis.total_capacity
 
-st.divider()
+    # عرض المقاييس في أربع صفوف
+    st.markdown("### 📊 المقاييس الرئيسية")
 
-# ========================
-# 4️⃣ التبويبات المتقدمة
-# ========================
-tab1, tab2, tab3, tab4, tab5 = st.tabs(
-    ["📍 الخريطة", "📈 التحليلات", "🤖 الذكاء الاصطناعي", "📋 الجدول", "📊 التقارير"]
-)
+    # الصف الأول
+    col1, col2, col3, col4 = st.columns(4)
 
-# ==================
-# التبويب الأول - الخريطة
-# ==================
-with tab1:
-    st.subheader("📍 توزيع المولدات على الخريطة")
-    
-    col_map1, col_map2 = st.columns([2, 3])
-    
-    with col_map1:
-        st.map(
-            df_filtered[['lat', 'lon']].rename(
-                columns={'lat': 'latitude', 'lon': 'longitude'}
-            ),
-            zoom=5,
-            use_container_width=True
+    with col1:
+        st.metric(
+            "💰 إجمالي الإيراد",
+            f"{total_revenue/1_000_000:.2f}M جنيه",
+            (f"{revenue_change['revenue_pct']:+.1f}% عن الشهر السابق" if revenue_change
+             else "لا توجد بيانات للشهر السابق")
         )
-        st.caption("🗺️ موقع جميع المولدات عبر الجمهورية - تحديث فوري من نظام GPS")
-    
-    with col_map2:
-        st.markdown("### 📊 توزيع حسب المحافظة")
-        gov_dist = df_filtered['المحافظة'].value_counts()
+
+    with col2:
+        st.metric(
+            "⚙️ معدل التشغيل",
+            f"{utilization:.1f}%",
+            f"{active_count} مولد نشط",
+            delta_color="normal" if utilization > 70 else "inverse"
+        )
+
+    with col3:
+        st.metric(
+            "🚨 تنبيهات حرجة",
+            critical_alerts,
+            (f"{unacked_alerts} بانتظار الإقرار" if unacked_alerts
+             else "بحاجة للانتباه" if critical_alerts > 0 else "الوضع مستقر ✅")
+        )
+
+    with col4:
+        st.metric(
+            "⚡ إجمالي السعة",
+            f"{total_capacity:.0f} kVA",
+            f"متوسط: {kpis.avg_capacity:.0f} kVA"
+        )
+
+    # الصف الثاني
+    col5, col6, col7, col8 = st.columns(4)
+
+    with col5:
+        st.metric(
+            "⛽ متوسط الوقود",
+            f"{avg_fuel:.0f}%",
+            f"🔴 {low_fuel_count} مولد وقود منخفض"
+        )
+
+    with col6:
+        st.metric(
+            "🌡️ متوسط الحرارة",
+            f"{avg_temp:.0f}°C",
+            "✅ طبيعي" if avg_temp < 100 else "⚠️ مرتفع"
+        )
+
+    with col7:
+        st.metric(
+            "🔧 بحاجة صيانة",
+            kpis.maintenance_count,
+            "مجدولة"
+        )
+
+    with col8:
+        st.metric(
+            "🚛 معطل أو في الطريق",
+            kpis.down_or_transit_count,
+            "يحتاج متابعة"
+        )
+
+    st.divider()
+
+    # ========================
+    # 4️⃣ التبويبات المتقدمة
+    # ========================
+    # في الوضع الكسول يتتبع Streamlit التبويب المحدد ويعيد التشغيل عند تغييره،
+    # فلا تُبنى مخططات وجداول التبويبات الأخرى ولا تُرسل للمتصفح
+    tab1, tab2, tab3, tab4, tab5, tab6 = st.tabs(
+        ["📍 الخريطة", "📈 التحليلات", "🤖 الذكاء الاصطناعي", "📋 الجدول", "📊 التقارير", "🧪 ماذا لو"],
+        key='active_tab' if LAZY_TABS else None,
+        on_change='rerun' if LAZY_TABS else 'ignore'
+    )
+
+    def tab_visible(tab):
+        """التبويب المحدد فقط في الوضع الكسول، وكل التبويبات في الوضع العادي (open = None)"""
+        return tab.open is not False
+
+    # ==================
+    # التبويب الأول - الخريطة
+    # ==================
+    def build_map_section(df_filtered, zoom, focus):
+        """طبقة الخريطة: خلايا مجمعة للأعداد الكبيرة ونقاط فردية للصغيرة"""
+        # خلايا الخريطة لكل محافظة محفوظة مع نسخة البيانات، ومستوى التكبير الافتراضي يُحسب مسبقاً
+        geo_index = fleet.derived('الخريطة', lambda frame: GeoIndex(frame).precompute([DEFAULT_ZOOM]))
+        # المرشح بالمحافظات فقط يُجاب من خلايا المحافظات المحفوظة دون المرور على الصفوف
+        governorates_only = (
+            set(selected_status) >= set(filter_index.values('الحالة'))
+            and tuple(capacity_range) == tuple(filter_index.value_bounds())
+        )
+        if governorates_only:
+            return geo_index.layer([focus] if focus else selected_govs, zoom)
+        frame = df_filtered[df_filtered['المحافظة'] == focus] if focus else df_filtered
+        return geo_index.layer(None, zoom, frame=frame)
+
+    def build_governorate_pie(cube_view):
+        """مخطط توزيع المحافظات"""
+        # plotly.express يُستورد عند بناء أول مخطط لا عند بدء العملية (graph_objects يستورده Streamlit نفسه)
+        import plotly.express as px
+        gov_dist = cube_view.rollup('المحافظة')['count']
         
         fig_pie = px.pie(
             values=gov_dist.values,
@@ -355,19 +486,55 @@ with tab1:
             plot_bgcolor="rgba(0,0,0,0)",
             font=dict(size=12, color='#fafafa', family='Arial')
         )
-        st.plotly_chart(fig_pie, use_container_width=True)
+        return fig_pie
 
-# ==================
-# التبويب الثاني - التحليلات
-# ==================
-with tab2:
-    st.subheader("📈 التحليلات المتقدمة والرؤى")
-    
-    col_a1, col_a2 = st.columns(2)
-    
-    with col_a1:
-        st.markdown("#### 💰 الإيراد حسب الموقع")
-        revenue_by_loc = df_filtered.groupby('الموقع')['الإيراد الشهري'].sum().sort_values(ascending=False).head(10)
+    with tab1:
+        if tab_visible(tab1):
+            st.subheader("📍 توزيع المولدات على الخريطة")
+            
+            col_map1, col_map2 = st.columns([2, 3])
+            
+            with col_map1:
+                col_zoom, col_focus = st.columns(2)
+                with col_zoom:
+                    map_zoom = st.select_slider("🔍 التكبير:", ZOOM_LEVELS, value=DEFAULT_ZOOM)
+                with col_focus:
+                    map_focus = st.selectbox("🎯 التركيز على:", [None] + list(selected_govs),
+                                             format_func=lambda g: "كل المحافظات المختارة" if g is None else g)
+                
+                map_layer, map_count, map_binned = cached_section(
+                    'الخريطة', filter_key + (map_zoom, map_focus),
+                    lambda: build_map_section(df_filtered, map_zoom, map_focus)
+                )
+                with tracker.span('رسم الخريطة'):
+                    st.map(
+                        map_layer,
+                        size='size',
+                        color='color',
+                        zoom=map_zoom,
+                        use_container_width=True
+                    )
+                if map_binned:
+                    st.caption(
+                        f"🗺️ {map_count:,} مولد مجمعة في {len(map_layer):,} خلية - "
+                        "الحجم حسب العدد واللون حسب التنبيه الغالب (الأزرق بلا تنبيهات)"
+                    )
+                else:
+                    st.caption("🗺️ موقع جميع المولدات عبر الجمهورية - تحديث فوري من نظام GPS")
+            
+            with col_map2:
+                st.markdown("### 📊 توزيع حسب المحافظة")
+                fig_pie = cached_section('توزيع المحافظات', filter_key, lambda: build_governorate_pie(cube_view))
+                show_chart(fig_pie)
+
+    # ==================
+    # التبويب الثاني - التحليلات
+    # ==================
+    def build_analytics_section(df_filtered, cube_view):
+        """مخططات الإيراد حسب الموقع والسعات حسب الموديل"""
+        import plotly.graph_objects as go
+        import plotly.express as px
+        revenue_by_loc = cube_view.rollup('الموقع')['revenue'].sort_values(ascending=False).head(10)
         
         fig_bar = go.Figure(data=[
             go.Bar(
@@ -387,11 +554,8 @@ with tab2:
             height=400,
             font=dict(color='#fafafa')
         )
-        st.plotly_chart(fig_bar, use_container_width=True)
-    
-    with col_a2:
-        st.markdown("#### ⚡ توزيع السعات")
-        capacity_dist = df_filtered.groupby('الموديل')['السعة'].count()
+        
+        capacity_dist = cube_view.rollup('الموديل')['count']
         
         fig_bar2 = px.bar(
             x=capacity_dist.index,
@@ -406,301 +570,527 @@ with tab2:
             height=400,
             font=dict(color='#fafafa')
         )
-        st.plotly_chart(fig_bar2, use_container_width=True)
-    
-    # صف ثاني من التحليلات
-    col_a3, col_a4 = st.columns(2)
-    
-    with col_a3:
-        st.markdown("#### 🌡️ توزيع درجات الحرارة")
-        
-        fig_hist = go.Figure(data=[
-            go.Histogram(
-                x=df_filtered['الحرارة °C'],
-                nbinsx=15,
-                marker=dict(color='#00a8e8')
+        
+        return fig_bar, fig_bar2
+
+    def build_period_charts(grain, governorates):
+        """الإيراد ونسبة التشغيل لكل فترة ومحافظة من التجميعات المحفوظة"""
+        import plotly.express as px
+        table = rollups.table(grain, governorates)
+        fig_revenue = px.bar(table, x='الفترة', y='الإيراد', color='المحافظة')
+        fig_utilization = px.line(table, x='الفترة', y='نسبة التشغيل %', color='المحافظة', markers=True)
+        for fig in (fig_revenue, fig_utilization):
+            fig.update_layout(
+                paper_bgcolor="rgba(0,0,0,0)",
+                plot_bgcolor="rgba(0,0,0,0)",
+                height=350,
+                font=dict(color='#fafafa')
             )
-        ])
-        fig_hist.update_layout(
-            paper_bgcolor="rgba(0,0,0,0)",
-            plot_bgcolor="rgba(0,0,0,0)",
-            height=400,
-            font=dict(color='#fafafa'),
-            xaxis_title='درجة الحرارة °C',
-            yaxis_title='العدد'
-        )
-        st.plotly_chart(fig_hist, use_container_width=True)
-    
-    with col_a4:
-        st.markdown("#### ⛽ توزيع مستويات الوقود")
-        
-        fig_hist2 = go.Figure(data=[
-            go.Histogram(
-                x=df_filtered['الوقود %'],
-                nbinsx=15,
-                marker=dict(color='#ffd700')
+        return fig_revenue, fig_utilization
+
+    def build_distribution_charts(histograms):
+        """مخططا الحرارة والوقود من العدادات المحسوبة مسبقاً - تُرسل أعداد الفئات فقط لا القيم الخام"""
+        import plotly.graph_objects as go
+        figures = []
+        for metric, color, title in [
+            ('temp', '#00a8e8', 'درجة الحرارة °C'),
+            ('fuel', '#ffd700', 'مستوى الوقود %')
+        ]:
+            starts, width, counts = histograms.binned(
+                metric, value_range=capacity_range, **{'المحافظة': selected_govs, 'الحالة': selected_status}
+            )
+            fig = go.Figure(data=[
+                go.Bar(
+                    x=starts + (width - 1) / 2,
+                    y=counts,
+                    width=width,
+                    marker=dict(color=color)
+                )
+            ])
+            fig.update_layout(
+                paper_bgcolor="rgba(0,0,0,0)",
+                plot_bgcolor="rgba(0,0,0,0)",
+                height=400,
+                font=dict(color='#fafafa'),
+                xaxis_title=title,
+                yaxis_title='العدد',
+                bargap=0
             )
+            figures.append(fig)
+        return figures
+
+    def build_trend_section(df_filtered):
+        """اتجاهات السجل التاريخي للمولدات المرشحة"""
+        import plotly.graph_objects as go
+        trend_rows = None if len(df_filtered) == len(df) else df_filtered.index.to_numpy()
+        trend_times, trend_fuel = telemetry.downsample('fuel', points=200, rows=trend_rows)
+        _, trend_temp = telemetry.downsample('temp', points=200, rows=trend_rows)
+        trend_x = pd.to_datetime(trend_times, unit='s')
+        
+        fig_trend = go.Figure(data=[
+            go.Scatter(x=trend_x, y=trend_fuel, name='متوسط الوقود %', line=dict(color='#ffd700')),
+            go.Scatter(x=trend_x, y=trend_temp, name='متوسط الحرارة °C', line=dict(color='#00a8e8'))
         ])
-        fig_hist2.update_layout(
+        fig_trend.update_layout(
             paper_bgcolor="rgba(0,0,0,0)",
             plot_bgcolor="rgba(0,0,0,0)",
-            height=400,
-            font=dict(color='#fafafa'),
-            xaxis_title='مستوى الوقود %',
-            yaxis_title='العدد'
+            height=350,
+            font=dict(color='#fafafa')
         )
-        st.plotly_chart(fig_hist2, use_container_width=True)
+        return fig_trend
 
-# ==================
-# التبويب الثالث - الذكاء الاصطناعي
-# ==================
-with tab3:
-    st.subheader("🤖 نظام الذكاء الاصطناعي للتنبؤ والصيانة الوقائية")
-    
-    col_ai1, col_ai2 = st.columns([1, 2])
-    
-    with col_ai1:
-        st.markdown("### 🎯 التنبيهات الذكية")
+    with tab2:
+        if tab_visible(tab2):
+            st.subheader("📈 التحليلات المتقدمة والرؤى")
+            fig_bar, fig_bar2 = cached_section(
+                'التحليلات', filter_key, lambda: build_analytics_section(df_filtered, cube_view)
+            )
+            # التوزيعات تتغير مع كل دفعة قراءات حية (نسخة العدادات) لا مع نسخة الإطار فقط
+            fig_hist, fig_hist2 = cached_section(
+                'التوزيعات', filter_key + (histograms.version,), lambda: build_distribution_charts(histograms)
+            )
         
-        alerts_high = df_filtered[df_filtered['الحرارة °C'] > 105]
-        alerts_fuel = df_filtered[df_filtered['الوقود %'] < fuel_threshold]
-        alerts_maintenance = df_filtered[df_filtered['الحالة'] == 'صيانة']
+            col_a1, col_a2 = st.columns(2)
         
-        with st.container():
-            st.metric("🔴 ارتفاع حرارة خطير", len(alerts_high))
-            st.metric("⚠️ وقود منخفض", len(alerts_fuel))
-            st.metric("🔧 يحتاج صيانة", len(alerts_maintenance))
-    
-    with col_ai2:
-        st.markdown("### 📋 التوصيات الذكية")
+            with col_a1:
+                st.markdown("#### 💰 الإيراد حسب الموقع")
+                show_chart(fig_bar)
+        
+            with col_a2:
+                st.markdown("#### ⚡ توزيع السعات")
+                show_chart(fig_bar2)
+        
+            # صف ثاني من التحليلات
+            col_a3, col_a4 = st.columns(2)
         
+            with col_a3:
+                st.markdown("#### 🌡️ توزيع درجات الحرارة")
+                show_chart(fig_hist)
+        
+            with col_a4:
+                st.markdown("#### ⛽ توزيع مستويات الوقود")
+                show_chart(fig_hist2)
+        
+            # اتجاهات السجل التاريخي - تتغير أيضاً مع كل نبضة جديدة في السجل
+            st.markdown("#### 📉 اتجاهات آخر 30 يوماً")
+            fig_trend = cached_section(
+                'الاتجاهات', filter_key + (telemetry.version,), lambda: build_trend_section(df_filtered)
+            )
+            show_chart(fig_trend)
+            
+            # الإيراد ونسبة التشغيل حسب الفترة - من التجميعات لا من مسح السجل
+            st.markdown("#### 📅 الإيراد ونسبة التشغيل حسب الفترة")
+            period_grain = st.selectbox("الفترة:", list(GRAINS), index=2, format_func=GRAINS.get)
+            fig_period_revenue, fig_period_utilization = cached_section(
+                'الفترات', (tuple(sorted(selected_govs)), period_grain, FLEET_SIZE, FLEET_SEED, rollups.version),
+                lambda: build_period_charts(period_grain, selected_govs)
+            )
+            col_p1, col_p2 = st.columns(2)
+            with col_p1:
+                show_chart(fig_period_revenue)
+            with col_p2:
+                show_chart(fig_period_utilization)
+            st.caption("حسب المحافظات المختارة لكل الحالات والسعات - الفترة الحالية حتى آخر نبضة")
+
+    # ==================
+    # التبويب الثالث - الذكاء الاصطناعي
+    # ==================
+    def build_recommendations(df_filtered, alerts, kpis):
+        """التوصيات الذكية حسب التنبيهات الحالية"""
         recommendations = []
         
-        if len(alerts_high) > 0:
+        if kpis.high_temp_count > 0:
+            # الفرع الأقرب لأكبر عدد من المولدات الساخنة (مسافة فعلية لا اسم المحافظة)
+            hot = df_filtered[alerts.masks['high_temp']]
+            depots, _ = nearest_depot(hot['lat'].to_numpy(), hot['lon'].to_numpy())
             recommendations.append(
-                f"🔴 **{len(alerts_high)} مولد** درجات حرارتهم مرتفعة جداً - يجب إرسال فريق صيانة فوري من فرع {alerts_high['المحافظة'].mode()[0] if len(alerts_high) > 0 else ''}"
+                f"🔴 **{kpis.high_temp_count} مولد** درجات حرارتهم مرتفعة جداً - يجب إرسال فريق صيانة فوري من {pd.Series(depots).mode()[0]}"
             )
         
-        if len(alerts_fuel) > 0:
+        if kpis.low_fuel_count > 0:
             recommendations.append(
-                f"⚠️ **{len(alerts_fuel)} مولد** احتياطي الوقود منخفض - جدول إعادة تزويد خلال 24 ساعة"
+                f"⚠️ **{kpis.low_fuel_count} مولد** احتياطي الوقود منخفض - جدول إعادة تزويد خلال 24 ساعة"
             )
         
-        if len(alerts_maintenance) > 0:
+        if kpis.maintenance_count > 0:
             recommendations.append(
-                f"🔧 **{len(alerts_maintenance)} مولد** مجدول للصيانة - قيمة محتملة: {alerts_maintenance['السعة'].sum() * 500:.0f} جنيه"
+                f"🔧 **{kpis.maintenance_count} مولد** مجدول للصيانة - قيمة محتملة: {kpis.maintenance_capacity * 500:.0f} جنيه"
             )
+        return recommendations
+
+    def build_risk_section(df_filtered, k):
+        """أخطر k مولد ضمن المرشحات مع احتمال العطل والعامل الأبرز، وعدد المولدات عالية الخطر"""
+        rows = df_filtered.index.to_numpy()
+        top_rows, top_scores = risk.top_k(k, rows)
+        table = df.take(top_rows)[['معرف المولد', 'المحافظة', 'الموقع', 'الحالة', 'الحرارة °C', 'الوقود %', 'ساعات العمل']]
+        table = table.assign(**{
+            'احتمال العطل %': np.round(top_scores.astype(np.float64) * 100, 1),
+            'العامل الأبرز': risk.top_factor(top_rows),
+        })
+        return table, int((risk.scores[rows] >= HIGH_RISK).sum())
+
+    def build_dispatch_section(df_filtered, alerts, depot, k):
+        """أقرب k مولد حرج للفرع المختار، وجولات الوقود للمولدات تحت حد الوقود"""
+        dispatch_index = get_dispatch_index(FLEET_SIZE, FLEET_SEED)
+        rows = df_filtered.index.to_numpy()
+        # الحرج: حرارة مرتفعة أو خطر عطل مرتفع - ضمن المرشحات فقط
+        critical = np.zeros(len(dispatch_index), dtype=bool)
+        critical[rows[alerts.masks['high_temp'] | (risk.scores[rows] >= HIGH_RISK)]] = True
+        near_rows, distances = dispatch_index.nearest(*DEPOTS[depot], k, mask=critical)
+        nearest_table = df.take(near_rows)[['معرف المولد', 'المحافظة', 'الموقع', 'الحرارة °C']].assign(**{
+            'احتمال العطل %': np.round(risk.scores[near_rows].astype(np.float64) * 100, 1),
+            'المسافة كم': np.round(distances, 1),
+        })
+        plan = refuel_runs(dispatch_index.lat, dispatch_index.lon, rows[alerts.masks['fuel_watch']])
+        return nearest_table, plan.runs
+
+    with tab3:
+        if tab_visible(tab3):
+            st.subheader("🤖 نظام الذكاء الاصطناعي للتنبؤ والصيانة الوقائية")
         
-        if not recommendations:
-            st.success("✅ **جميع المولدات في حالة جيدة!** - لا توصيات حالية")
-        else:
-            for i, rec in enumerate(recommendations, 1):
-                st.warning(rec)
-        
-        st.markdown("---")
-        st.markdown("### 📊 إحصائيات الأداء")
+            col_ai1, col_ai2 = st.columns([1, 2])
         
-        col_stats1, col_stats2 = st.columns(2)
+            with col_ai1:
+                st.markdown("### 🎯 التنبيهات الذكية")
+            
+                with st.container():
+                    st.metric("🔴 ارتفاع حرارة خطير", kpis.high_temp_count)
+                    st.metric("⚠️ وقود منخفض", kpis.low_fuel_count)
+                    st.metric("🔧 يحتاج صيانة", kpis.maintenance_count)
+                    risk_slot = st.empty()
+                
+                # حالات التنبيهات الحية للمولدات المرشحة، والإقرار يوقف تنبيهها دون إغلاقها
+                st.dataframe(pd.DataFrame(alert_states.counts(alert_rows)).T, use_container_width=True)
+                if st.button("✔️ إقرار التنبيهات المفتوحة", disabled=not unacked_alerts):
+                    alert_states.acknowledge(alert_rows)
+                    st.rerun()
         
-        with col_stats1:
-            st.markdown(f"""
-            **معدل الكفاءة**: {utilization:.1f}%
+            with col_ai2:
+                st.markdown("### 📋 التوصيات الذكية")
             
-            **متوسط الحرارة**: {avg_temp:.0f}°C
+                recommendations = cached_section(
+                    'التوصيات', filter_key + (fuel_threshold,), lambda: build_recommendations(df_filtered, alerts, kpis)
+                )
             
-            **متوسط الوقود**: {avg_fuel:.0f}%
-            """)
-        
-        with col_stats2:
-            st.markdown(f"""
-            **إجمالي الإيراد**: {total_revenue/1_000_000:.2f}M جنيه
+                if not recommendations:
+                    st.success("✅ **جميع المولدات في حالة جيدة!** - لا توصيات حالية")
+                else:
+                    for i, rec in enumerate(recommendations, 1):
+                        st.warning(rec)
             
-            **عمر المولدات**: {df_filtered['ساعات العمل'].mean():.0f} ساعة متوسط
+                st.markdown("---")
+                st.markdown("### 📊 إحصائيات الأداء")
             
-            **السعة الإجمالية**: {total_capacity:.0f} kVA
-            """)
-
-# ==================
-# التبويب الرابع - الجدول المتقدم
-# ==================
-with tab4:
-    st.subheader("📋 جدول البيانات الكامل مع التصفية والفرز")
-    
-    # خيارات العرض
-    col_opt1, col_opt2, col_opt3 = st.columns(3)
-    
-    with col_opt1:
-        sort_by = st.selectbox(
-            "فرز حسب:",
-            ['معرف المولد', 'الإيراد الشهري', 'الوقود %', 'الحرارة °C', 'ساعات العمل']
-        )
-    
-    with col_opt2:
-        sort_order = st.selectbox("ترتيب:", ["تنازلي", "تصاعدي"])
-    
-    with col_opt3:
-        show_cols = st.multiselect(
-            "الأعمدة المراد عرضها:",
-            df_filtered.columns.tolist(),
-            default=['معرف المولد', 'الموديل', 'المحافظة', 'الحالة', 'الإيراد الشهري', 'التنبيه']
-        )
-    
-    # فرز البيانات
-    ascending = sort_order == "تصاعدي"
-    df_sorted = df_filtered.sort_values(sort_by, ascending=ascending)
-    
-    # عرض الجدول مع التنسيق
-    st.dataframe(
-        df_sorted[show_cols].style.format({
-            'الإيراد الشهري': '{:.2f}',
-            'الوقود %': '{:.0f}%',
-            'الحرارة °C': '{:.0f}',
-            'السعة': '{:.0f}'
-        }),
-        use_container_width=True,
-        height=500
-    )
-    
-    # خيار التصدير
-    st.markdown("---")
-    csv_data = df_sorted[show_cols].to_csv(index=False, encoding='utf-8-sig')
-    st.download_button(
-        label="📥 تحميل الجدول كـ CSV",
-        data=csv_data,
-        file_name=f"تفاصيل_المولدات_{datetime.now().strftime('%Y%m%d_%H%M')}.csv",
-        mime="text/csv"
-    )
+                col_stats1, col_stats2 = st.columns(2)
+            
+                with col_stats1:
+                    st.markdown(f"""
+                **معدل الكفاءة**: {utilization:.1f}%
+            
+                **متوسط الحرارة**: {avg_temp:.0f}°C
+            
+                **متوسط الوقود**: {avg_fuel:.0f}%
+                """)
+            
+                with col_stats2:
+                    st.markdown(f"""
+                **إجمالي الإيراد**: {total_revenue/1_000_000:.2f}M جنيه
+            
+                **عمر المولدات**: {kpis.avg_hours:.0f} ساعة متوسط
+            
+                **السعة الإجمالية**: {total_capacity:.0f} kVA
+                """)
 
-# ==================
-# التبويب الخامس - التقارير
-# ==================
-with tab5:
-    st.subheader("📊 التقارير التفصيلية والإحصائيات")
-    
-    # اختيار نوع التقرير
-    report_type = st.selectbox(
-        "نوع التقرير:",
-        [
-            "ملخص الأداء",
-            "تقرير الإيرادات",
-            "تقرير الصيانة",
-            "تقرير السلامة",
-            "تقرير الكفاءة"
-        ]
-    )
-    
-    if report_type == "ملخص الأداء":
-        st.markdown(f"""
-        ### 📊 ملخص الأداء الشامل
-        
-        **التاريخ**: {datetime.now().strftime('%d/%m/%Y - %H:%M')}
-        
-        #### 🎯 المقاييس الرئيسية
-        - إجمالي المولدات المراقبة: **{len(df_filtered)}**
-        - المولدات النشطة: **{active_count}** ({utilization:.1f}%)
-        - معطل/في الطريق: **{len(df_filtered[df_filtered['الحالة'].isin(['معطل', 'في الطريق'])])}**
-        - بحاجة صيانة: **{len(df_filtered[df_filtered['الحالة'] == 'صيانة'])}**
-        
-        #### 💰 الإيرادات
-        - إجمالي الإيراد الشهري: **{total_revenue:,.2f} جنيه**
-        - متوسط الإيراد لكل مولد: **{total_revenue/len(df_filtered):,.2f} جنيه**
-        - أعلى موقع: **{df_filtered.groupby('الموقع')['الإيراد الشهري'].sum().idxmax()}**
-        
-        #### ⚙️ الأداء التقني
-        - السعة الإجمالية: **{total_capacity:,.0f} kVA**
-        - متوسط ساعات العمل: **{df_filtered['ساعات العمل'].mean():.0f} ساعة**
-        - متوسط درجة الحرارة: **{avg_temp:.0f}°C**
-        - متوسط مستوى الوقود: **{avg_fuel:.0f}%**
-        
-        #### 🚨 الحالات الحرجة
-        - مولدات بحرارة عالية: **{len(df_filtered[df_filtered['الحرارة °C'] > 105])}**
-        - مولدات بوقود منخفض: **{len(df_filtered[df_filtered['الوقود %'] < fuel_threshold])}**
-        - إجمالي التنبيهات النشطة: **{critical_alerts}**
-        """)
-    
-    elif report_type == "تقرير الإيرادات":
-        st.markdown("### 💰 تقرير الإيرادات التفصيلي")
+            st.markdown("---")
+            st.markdown("### 🧮 مؤشر خطر الأعطال")
+            st.caption(
+                f"نموذج لوجستي على الحرارة وساعات العمل والوقود والسعة واتجاه الحرارة في آخر {2 * TREND_WINDOW} نبضة - "
+                "يُحدّث مع كل دفعة قراءات حية"
+            )
+            risk_k = st.selectbox("عدد المولدات الأعلى خطراً:", [10, 25, 50, 100])
+            risk_table, high_risk_count = cached_section(
+                'مؤشر الخطر', filter_key + (risk.version, risk_k), lambda: build_risk_section(df_filtered, risk_k)
+            )
+            risk_slot.metric("🧮 خطر عطل مرتفع", high_risk_count)
+            st.dataframe(risk_table, use_container_width=True, hide_index=True)
+
+            st.markdown("---")
+            st.markdown("### 🚚 تخطيط الإرسال")
+            col_dispatch1, col_dispatch2 = st.columns(2)
+            with col_dispatch1:
+                dispatch_depot = st.selectbox("الفرع:", list(DEPOTS))
+            with col_dispatch2:
+                dispatch_k = st.selectbox("عدد المولدات الحرجة:", [5, 10, 25, 50], index=1)
+            nearest_table, refuel_plan = cached_section(
+                'الإرسال', filter_key + (fuel_threshold, risk.version, dispatch_depot, dispatch_k),
+                lambda: build_dispatch_section(df_filtered, alerts, dispatch_depot, dispatch_k)
+            )
+            col_dispatch3, col_dispatch4 = st.columns(2)
+            with col_dispatch3:
+                st.markdown(f"#### 🔧 أقرب المولدات الحرجة إلى {dispatch_depot}")
+                st.dataframe(nearest_table, use_container_width=True, hide_index=True)
+            with col_dispatch4:
+                st.markdown(f"#### ⛽ جولات الوقود (الوقود أقل من {fuel_threshold}%)")
+                st.caption(
+                    f"{refuel_plan['عدد المولدات'].sum():,} مولد في {len(refuel_plan):,} جولة - "
+                    "من أقرب فرع وبترتيب الزاوية حوله"
+                )
+                st.dataframe(refuel_plan, use_container_width=True, hide_index=True)
+
+    # ==================
+    # التبويب الرابع - الجدول المتقدم
+    # ==================
+    @dashboard_fragment('الجدول')
+    def render_table_tab(df_filtered, filter_key):
+        """تغيير الفرز أو الأعمدة يعيد تشغيل هذا التبويب وحده"""
+        st.subheader("📋 جدول البيانات الكامل مع التصفية والفرز")
+        
+        # خيارات العرض
+        col_opt1, col_opt2, col_opt3 = st.columns(3)
+        
+        with col_opt1:
+            sort_by = st.selectbox(
+                "فرز حسب:",
+                ['معرف المولد', 'الإيراد الشهري', 'الوقود %', 'الحرارة °C', 'ساعات العمل']
+            )
+        
+        with col_opt2:
+            sort_order = st.selectbox("ترتيب:", ["تنازلي", "تصاعدي"])
+        
+        with col_opt3:
+            show_cols = st.multiselect(
+                "الأعمدة المراد عرضها:",
+                df_filtered.columns.tolist(),
+                default=['معرف المولد', 'الموديل', 'المحافظة', 'الحالة', 'الإيراد الشهري', 'التنبيه']
+            )
+        
+        # الترتيب محفوظ لكل عمود داخل صفحات الإطار المرشح، ولا يُنسق ويُرسل إلا صفوف الصفحة الظاهرة
+        ascending = sort_order == "تصاعدي"
+        table_key = filter_key + (sort_by, ascending, tuple(show_cols))
+        pager = cached_section('الجدول', filter_key, lambda: TablePager(df_filtered))
         
-        revenue_by_gov = df_filtered.groupby('المحافظة')['الإيراد الشهري'].agg(['sum', 'mean', 'count']).round(2)
-        revenue_by_gov.columns = ['الإجمالي', 'المتوسط', 'العدد']
+        col_page1, col_page2, col_page3 = st.columns([1, 1, 2])
         
-        st.dataframe(revenue_by_gov, use_container_width=True)
+        with col_page1:
+            page_size = st.selectbox("صفوف في الصفحة:", PAGE_SIZES, index=1)
         
-        fig_revenue = px.bar(
-            x=revenue_by_gov.index,
-            y=revenue_by_gov['الإجمالي'],
-            labels={'x': 'المحافظة', 'y': 'الإيراد'},
-            color=revenue_by_gov['الإجمالي'],
-            color_continuous_scale='Greens'
+        with col_page2:
+            # تغير عدد الصفحات (مرشحات جديدة) يعيد العنصر إلى الصفحة الأولى
+            page = st.number_input("الصفحة:", min_value=1, max_value=pager.page_count(page_size), value=1)
+        
+        with col_page3:
+            first_row = (page - 1) * page_size
+            st.caption(
+                f"الصفوف {min(first_row + 1, len(pager)):,}–{min(first_row + page_size, len(pager)):,} "
+                f"من {len(pager):,} • {pager.page_count(page_size):,} صفحة"
+            )
+        
+        # عرض الصفحة مع التنسيق
+        with tracker.span('تنسيق الجدول'):
+            st.dataframe(
+                pager.page(sort_by, ascending, page, page_size, show_cols).style.format({
+                    'الإيراد الشهري': '{:.2f}',
+                    'الوقود %': '{:.0f}%',
+                    'الحرارة °C': '{:.0f}',
+                    'السعة': '{:.0f}'
+                }),
+                use_container_width=True,
+                height=500
+            )
+        
+        # خيار التصدير - الملف لا يُبنى إلا عند النقر ثم يُحفظ لنفس المرشحات وخيارات العرض
+        st.markdown("---")
+        col_exp1, col_exp2 = st.columns([1, 3])
+        
+        with col_exp1:
+            table_format = st.selectbox(
+                "الصيغة:",
+                available_formats(),
+                format_func=lambda fmt: EXPORT_FORMATS[fmt][0]
+            )
+        
+        with col_exp2:
+            _, table_mime, table_ext = EXPORT_FORMATS[table_format]
+            st.download_button(
+                label=f"📥 تحميل الجدول كـ {EXPORT_FORMATS[table_format][0]}",
+                data=export_cache.opener(table_key, table_format, lambda: pager.sorted(sort_by, ascending, show_cols)),
+                file_name=f"تفاصيل_المولدات_{datetime.now().strftime('%Y%m%d_%H%M')}{table_ext}",
+                mime=table_mime
+            )
+
+    with tab4:
+        if tab_visible(tab4):
+            render_table_tab(df_filtered, filter_key)
+
+    # ==================
+    # التبويب الخامس - التقارير
+    # ==================
+    @dashboard_fragment('التقارير')
+    def render_reports_tab(df_filtered, cube_view, alerts, kpis, filter_key, fuel_threshold):
+        """تبديل نوع التقرير يعيد تشغيل هذا التبويب وحده"""
+        st.subheader("📊 التقارير التفصيلية والإحصائيات")
+        
+        # اختيار نوع التقرير
+        report_type = st.selectbox(
+            "نوع التقرير:",
+            list(REPORT_TYPES)
         )
-        fig_revenue.update_layout(
+        report_key = filter_key + (fuel_threshold, report_type)
+        
+        if report_type == "ملخص الأداء":
+            site = cached_section('التقارير', report_key, lambda: top_site(cube_view))
+            st.markdown(performance_summary(kpis, site, critical=critical_alerts))
+        
+        elif report_type == "تقرير الإيرادات":
+            st.markdown("### 💰 تقرير الإيرادات التفصيلي")
+            
+            revenue_by_gov, fig_revenue = cached_section('التقارير', report_key, lambda: build_revenue_report(cube_view))
+            
+            st.dataframe(revenue_by_gov, use_container_width=True)
+            show_chart(fig_revenue)
+            
+            # التفصيل: المواقع والحالات من المكعب، والصفوف الخام فقط عند طلب خلية بعينها
+            st.markdown("#### 🔎 تفصيل محافظة")
+            col_drill1, col_drill2 = st.columns(2)
+            
+            with col_drill1:
+                drill_gov = st.selectbox("المحافظة:", revenue_by_gov.index.tolist())
+            
+            drill_view = cube_view.slice(**{'المحافظة': [drill_gov]})
+            by_site = drill_view.rollup('الموقع', 'الحالة')['count'].unstack(fill_value=0)
+            st.dataframe(by_site, use_container_width=True)
+            
+            with col_drill2:
+                drill_site = st.selectbox("الموقع:", by_site.index.tolist())
+            
+            if st.toggle(f"عرض مولدات {drill_site}"):
+                st.dataframe(
+                    cube_view.drill(df_filtered, **{'المحافظة': drill_gov, 'الموقع': drill_site}),
+                    use_container_width=True
+                )
+        
+        elif report_type == "تقرير الصيانة":
+            st.markdown("### 🔧 تقرير الصيانة والعمليات")
+            
+            maintenance_data = cached_section(
+                'التقارير', report_key, lambda: build_maintenance_report(df_filtered, alerts)
+            )
+            
+            if len(maintenance_data) > 0:
+                st.dataframe(maintenance_data, use_container_width=True)
+                st.metric("إجمالي قيمة الصيانة المتوقعة", f"{len(maintenance_data) * MAINTENANCE_COST:,.0f} جنيه")
+            else:
+                st.info("لا توجد مولدات بحاجة صيانة حالياً")
+        
+        elif report_type == "تقرير السلامة":
+            st.markdown("### 🚨 تقرير السلامة والتنبيهات")
+            
+            alert_summary, fig_alerts = cached_section('التقارير', report_key, lambda: build_safety_report(kpis))
+            
+            st.dataframe(alert_summary, use_container_width=True)
+            show_chart(fig_alerts)
+        
+        elif report_type == "تقرير الكفاءة":
+            st.markdown("### ⚙️ تقرير الكفاءة والإنتاجية")
+            
+            efficiency_by_model = cached_section('التقارير', report_key, lambda: build_efficiency_report(cube_view))
+            
+            st.dataframe(efficiency_by_model, use_container_width=True)
+
+    with tab5:
+        if tab_visible(tab5):
+            render_reports_tab(df_filtered, cube_view, alerts, kpis, filter_key, fuel_threshold)
+
+    # ==================
+    # التبويب السادس - محاكاة ماذا لو
+    # ==================
+    def build_band_chart(frame, title):
+        """نطاق p5-p95 مظلل حول الوسيط لمقياس يومي"""
+        import plotly.graph_objects as go
+        fig = go.Figure([
+            go.Scatter(x=frame.index, y=frame['p95'], line=dict(width=0), showlegend=False, hoverinfo='skip'),
+            go.Scatter(x=frame.index, y=frame['p5'], line=dict(width=0), fill='tonexty',
+                       fillcolor='rgba(0,168,232,0.25)', name='p5 - p95'),
+            go.Scatter(x=frame.index, y=frame['p50'], line=dict(color='#00a8e8', width=3), name='الوسيط'),
+        ])
+        fig.update_layout(
+            title=title,
+            xaxis_title='اليوم',
             paper_bgcolor="rgba(0,0,0,0)",
             plot_bgcolor="rgba(0,0,0,0)",
-            height=400
+            height=320,
+            font=dict(color='#fafafa')
         )
-        st.plotly_chart(fig_revenue, use_container_width=True)
-    
-    elif report_type == "تقرير الصيانة":
-        st.markdown("### 🔧 تقرير الصيانة والعمليات")
-        
-        maintenance_data = df_filtered[df_filtered['الحالة'] == 'صيانة'][
-            ['معرف المولد', 'الموديل', 'المحافظة', 'ساعات العمل', 'الإيراد الشهري']
-        ]
-        
-        if len(maintenance_data) > 0:
-            st.dataframe(maintenance_data, use_container_width=True)
-            st.metric("إجمالي قيمة الصيانة المتوقعة", f"{len(maintenance_data) * 500:,.0f} جنيه")
-        else:
-            st.info("لا توجد مولدات بحاجة صيانة حالياً")
-    
-    elif report_type == "تقرير السلامة":
-        st.markdown("### 🚨 تقرير السلامة والتنبيهات")
-        
-        alert_summary = pd.DataFrame({
-            'نوع التنبيه': ['وقود منخفض', 'حرارة مرتفعة', 'صيانة مجدولة', 'مراجعة شاملة'],
-            'العدد': [
-                len(df_filtered[df_filtered['الوقود %'] < fuel_threshold]),
-                len(df_filtered[df_filtered['الحرارة °C'] > 105]),
-                len(df_filtered[df_filtered['الحالة'] == 'صيانة']),
-                len(df_filtered[df_filtered['ساعات العمل'] > 4500])
-            ]
-        })
+        return fig
+
+    def build_simulation(df_filtered, scenario):
+        """تشغيل المحاكاة ومخططات النطاقات وجدول المولدات الأعلى خطراً"""
+        result = simulate(fleet_arrays(df_filtered), scenario, pool=get_simulation_pool(SIMULATION_WORKERS))
+        figures = {metric: build_band_chart(result.band_frame(metric), label) for metric, label in DAILY_METRICS.items()}
+        return result, figures, at_risk(df_filtered, result)
+
+    @dashboard_fragment('ماذا لو')
+    def render_whatif_tab(df_filtered, filter_key, fuel_threshold):
+        """المحاكاة تعمل بالقيم الافتراضية عند أول عرض، ثم عند إرسال النموذج أو تغير المرشحات - وتعيد تشغيل هذا التبويب وحده"""
+        st.subheader("🧪 محاكاة ماذا لو - الوقود والحرارة وساعات العمل")
         
-        st.dataframe(alert_summary, use_container_width=True)
+        with st.form('whatif'):
+            col_sim1, col_sim2, col_sim3 = st.columns(3)
+            with col_sim1:
+                days = st.slider("عدد الأيام:", 1, 60, 14)
+                scenarios = st.select_slider("عدد السيناريوهات:", [100, 250, 500, 1000, 2000], value=1000)
+            with col_sim2:
+                load = st.slider("متوسط الحمل %:", 10, 100, 60)
+                run_hours = st.slider("ساعات التشغيل اليومية:", 1, 24, 12)
+            with col_sim3:
+                ambient = st.slider("شذوذ الطقس °C:", -10, 15, 0)
+                delivery = st.slider("موثوقية توصيل الوقود %:", 50, 100, 95)
+            st.form_submit_button("▶️ تشغيل المحاكاة")
         
-        fig_alerts = px.pie(
-            values=alert_summary['العدد'],
-            names=alert_summary['نوع التنبيه'],
-            color_discrete_sequence=['#ff6b6b', '#ffa500', '#ffd700', '#ff9999']
-        )
-        fig_alerts.update_layout(
-            paper_bgcolor="rgba(0,0,0,0)",
-            plot_bgcolor="rgba(0,0,0,0)"
-        )
-        st.plotly_chart(fig_alerts, use_container_width=True)
-    
-    elif report_type == "تقرير الكفاءة":
-        st.markdown("### ⚙️ تقرير الكفاءة والإنتاجية")
+        # السيناريوهات تُقلَّص للأساطيل الكبيرة حتى يبقى زمن التشغيل تفاعلياً
+        count = scenario_limit(len(df_filtered), scenarios)
+        if count < scenarios:
+            st.caption(f"⚠️ {count:,} سيناريو فقط لـ {len(df_filtered):,} مولد (الحد {scenarios:,})")
+        scenario = Scenario(days=days, scenarios=count, load=load / 100, run_hours=run_hours,
+                            ambient=ambient, delivery=delivery / 100, refuel_below=fuel_threshold)
+        result, figures, risky = cached_section('ماذا لو', filter_key + (scenario,), lambda: build_simulation(df_filtered, scenario))
+        
+        final = {metric: result.bands[metric][:, -1] for metric in DAILY_METRICS}
+        col_res1, col_res2, col_res3, col_res4 = st.columns(4)
+        with col_res1:
+            st.metric("متوقف لنفاد الوقود (آخر يوم، الوسيط)", f"{final['dry'][1]:,.0f}",
+                      f"p95: {final['dry'][2]:,.0f}", delta_color="inverse")
+        with col_res2:
+            st.metric("حرارة فوق 105 (آخر يوم، الوسيط)", f"{final['overheat'][1]:,.0f}",
+                      f"p95: {final['overheat'][2]:,.0f}", delta_color="inverse")
+        with col_res3:
+            st.metric("الوقود المستهلك يومياً (لتر، الوسيط)", f"{result.bands['liters'][1].mean():,.0f}")
+        with col_res4:
+            st.metric("يتجاوز ساعات الصيانة (متوقع)", f"{result.p_overhaul.sum():,.0f}")
+        st.caption(f"{scenario.scenarios:,} سيناريو × {len(df_filtered):,} مولد × {days} يوم في {result.seconds:.2f} ث")
         
-        efficiency_by_model = df_filtered.groupby('الموديل').agg({
-            'الحالة': lambda x: (x == 'نشط').sum() / len(x) * 100,
-            'الإيراد الشهري': 'mean',
-            'ساعات العمل': 'mean'
-        }).round(2)
-        efficiency_by_model.columns = ['نسبة التشغيل %', 'متوسط الإيراد', 'متوسط الساعات']
+        col_band1, col_band2 = st.columns(2)
+        for i, metric in enumerate(DAILY_METRICS):
+            with (col_band1 if i % 2 == 0 else col_band2):
+                show_chart(figures[metric])
         
-        st.dataframe(efficiency_by_model, use_container_width=True)
+        st.markdown("### ⚠️ المولدات الأعلى خطراً في هذه السيناريوهات")
+        st.dataframe(risky, use_container_width=True, hide_index=True)
 
-st.divider()
+    with tab6:
+        if tab_visible(tab6):
+            render_whatif_tab(df_filtered, filter_key, fuel_threshold)
 
-# ========================
-# 5️⃣ التذييل والمعلومات
-# ========================
-col_footer1, col_footer2, col_footer3 = st.columns(3)
+    st.divider()
 
-with col_footer1:
-    st.markdown("### 📞 معلومات الاتصال")
-    st.markdown("""
+    # ========================
+    # 5️⃣ التذييل والمعلومات
+    # ========================
+    col_footer1, col_footer2, col_footer3 = st.columns(3)
+
+    with col_footer1:
+        st.markdown("### 📞 معلومات الاتصال")
+        st.markdown("""
     **الكاتمي - الوكيل الحصري لمولدات ديني**
     
     📞 (202) XXXX-XXXX
@@ -708,30 +1098,103 @@ with col_footer1:
     📧 info@elkatamy.com
     """)
 
-with col_footer2:
-    st.markdown("### 🔐 الحالة النظامية")
-    st.markdown(f"""
+    with col_footer2:
+        st.markdown("### 🔐 الحالة النظامية")
+        st.markdown(f"""
     ✅ آخر تحديث: {datetime.now().strftime('%H:%M:%S')}
     
-    ✅ جودة البيانات: {(1 - critical_alerts/len(df_filtered)*0.1)*100:.0f}%
+    ✅ جودة البيانات: {(1 - critical_alerts / (kpis.count or 1) * 0.1) * 100:.0f}%
     
     ✅ معدل التوفر: {utilization:.0f}%
     """)
 
-with col_footer3:
-    st.markdown("### 📊 إحصائيات النظام")
-    st.markdown(f"""
-    🔍 مولدات مراقبة: {len(df_filtered)}
+    with col_footer3:
+        st.markdown("### 📊 إحصائيات النظام")
+        st.markdown(f"""
+    🔍 مولدات مراقبة: {kpis.count}
     
     💾 حجم البيانات: {len(df)} سجل
     
     🔄 التحديثات: فوري
     """)
 
-st.markdown("---")
-st.markdown("""
+    st.markdown("---")
+    st.markdown("""
 <div style="text-align: center; color: #9ca3af; font-size: 11px; padding: 20px;">
     <p>© 2026 لوحة تحكم الكاتمي | نظام إدارة أسطول مولدات ديني | v3.0</p>
     <p>تم تطويره بواسطة Elkatamy BI Team | آخر تحديث: يناير 2026</p>
 </div>
 """, unsafe_allow_html=True)
+
+
+# التنميط المختار في لوحة المسؤول يُطبق على التشغيل التالي كاملاً
+with tracker.run(profile=st.session_state.get('profile_mode') if ADMIN_PANEL else None):
+    main()
+
+# ========================
+# ⏱️ عدّاد الأقسام المعاد حسابها
+# ========================
+with st.sidebar.expander("⏱️ الأقسام المعاد حسابها"):
+    last_run = tracker.last
+    st.caption(
+        f"التشغيل #{last_run['run']}: أُعيد حساب {len(last_run['computed'])} "
+        f"من {len(last_run['computed']) + len(last_run['reused'])} قسم في {last_run['ms']:.0f} مللي ث"
+    )
+    st.dataframe(
+        pd.DataFrame([
+            {
+                'التشغيل': run['run'],
+                'النوع': run['kind'],
+                'أُعيد حسابه': '، '.join(run['computed']) or '—',
+                'من الذاكرة': len(run['reused']),
+                'الزمن (مللي ث)': round(run['ms'], 1)
+            }
+            for run in reversed(tracker.runs)
+        ]),
+        use_container_width=True,
+        hide_index=True
+    )
+
+# ========================
+# 🛠️ لوحة قياس الأداء (للمسؤول فقط: ?admin=1)
+# ========================
+if ADMIN_PANEL:
+    with st.sidebar.expander("🛠️ مقاطع زمن التشغيل"):
+        st.selectbox(
+            "التنميط للتشغيل التالي:",
+            [None] + list(PROFILE_MODES),
+            format_func=lambda mode: 'بدون' if mode is None else PROFILE_MODES[mode],
+            key='profile_mode'
+        )
+        # مقطع متداخل يظهر بمساره (القسم › المقطع) وزمنه محسوب ضمن القسم أيضاً
+        st.dataframe(
+            pd.DataFrame([
+                {'التشغيل': run['run'], 'النوع': run['kind'], 'الكل': round(run['ms'], 1),
+                 **{name: round(ms, 1) for name, ms in run['spans'].items()}}
+                for run in reversed(tracker.runs)
+            ]),
+            use_container_width=True,
+            hide_index=True
+        )
+        profiled = next((run for run in reversed(tracker.runs) if run.get('profile')), None)
+        if profiled:
+            profile = profiled['profile']
+            caption = f"تنميط التشغيل #{profiled['run']} ({profile['mode']})"
+            if 'peak_mb' in profile:
+                caption += f" - ذروة الذاكرة {profile['peak_mb']:.1f} MB"
+            st.caption(caption)
+            st.dataframe(pd.DataFrame(profile['rows']), use_container_width=True, hide_index=True)
+        export_stats = get_export_cache().stats
+        st.caption(
+            f"ملفات التصدير: {export_stats['builds']} بناء في {export_stats['build_ms']:,.0f} مللي ث، "
+            f"{export_stats['hits']} من الذاكرة"
+        )
+        st.caption(f"ذاكرة الأقسام: {section_cache.nbytes / 1024 ** 2:,.1f} MB")
+        st.download_button(
+            label="📥 تصدير المقاطع (JSONL)",
+            data=tracker.to_jsonl,
+            file_name=f"مقاطع_الأداء_{datetime.now().strftime('%Y%m%d_%H%M%S')}.jsonl",
+            mime="application/x-ndjson"
+        )
+        if PERF_LOG:
+            st.caption(f"كل تشغيل يُضاف أيضاً إلى {PERF_LOG}")